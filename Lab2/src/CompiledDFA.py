@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class CompiledDFA:
+    # A DFA as a dense transition matrix: one row per state plus a dead state, one column per symbol plus a
+    # column for characters outside the alphabet. Symbols must be single characters
+    def __init__(self, states, alphabet, initial_state, final_state, transitions):
+        # Symbols in a fixed order; their position is their column
+        self.symbols = sorted(symbol for symbol in set(alphabet) if symbol != "")
+        for symbol in self.symbols:
+            if len(symbol) != 1:
+                raise ValueError(f"Only single-character symbols can be compiled, got {symbol!r}")
+        # Column of each symbol, by character
+        self.columns = {symbol: column for column, symbol in enumerate(self.symbols)}
+        # Column for any other character, which always leads to the dead state
+        self.other = len(self.symbols)
+
+        # Row of each state; states that only appear in transitions are numbered too
+        self.rows = {}
+        for state in states:
+            self.rows.setdefault(state, len(self.rows))
+        self.rows.setdefault(initial_state, len(self.rows))
+        for transition in transitions:
+            self.rows.setdefault(transition["state"], len(self.rows))
+            self.rows.setdefault(transition["to"], len(self.rows))
+        # The dead state is the last row, with every transition into itself
+        self.dead = len(self.rows)
+
+        self.table = np.full((self.dead + 1, self.other + 1), self.dead, dtype=np.int32)
+        for transition in transitions:
+            if transition["symbol"] not in self.columns:
+                raise ValueError(f"Transition on {transition['symbol']!r}, which is not in the alphabet")
+            row = self.rows[transition["state"]]
+            column = self.columns[transition["symbol"]]
+            if self.table[row, column] != self.dead and self.table[row, column] != self.rows[transition["to"]]:
+                raise ValueError(f"State {transition['state']!r} has more than one transition on "
+                                 f"{transition['symbol']!r}; convert the automaton to a DFA first")
+            self.table[row, column] = self.rows[transition["to"]]
+
+        self.initial = self.rows[initial_state]
+        # Whether each row accepts; the dead state never does
+        self.accepting = np.zeros(self.dead + 1, dtype=bool)
+        for state in final_state:
+            if state in self.rows:
+                self.accepting[self.rows[state]] = True
+
+        # Column of every character code up to the largest symbol and at least of every byte, for translating
+        # whole strings at once
+        self.lookup = np.full(max([ord(symbol) for symbol in self.symbols] + [255]) + 2, self.other, dtype=np.intp)
+        for symbol, column in self.columns.items():
+            self.lookup[ord(symbol)] = column
+        # The same for one-byte characters as a bytes.translate table, when the columns fit in a byte
+        self.byte_columns = bytes(self.lookup[:256].tolist()) if self.other < 256 else None
+
+        # The table flattened, indexed by row * width + column and holding the target's row * width, so that a
+        # step is adding the column and one gather
+        self.width = self.other + 1
+        self.index_type = np.int32 if self.table.size < 2 ** 31 else np.int64
+        self.flat = (self.table * self.width).ravel().astype(self.index_type)
+
+        # The same table as nested lists, which are faster to index from Python for single strings
+        self._table_rows = self.table.tolist()
+        self._accepting = self.accepting.tolist()
+
+    # Check whether the DFA accepts a single string
+    def accepts(self, string):
+        state = self.initial
+        table_rows = self._table_rows
+        columns = self.columns
+        other = self.other
+        for character in string:
+            state = table_rows[state][columns.get(character, other)]
+        return self._accepting[state]
+
+    # Check whether the DFA accepts each of the strings; returns a NumPy array of booleans in their order.
+    # All strings advance together, one character per step, each step being one gather from the table over
+    # the strings that are still longer than the step
+    def match_many(self, strings):
+        strings = list(strings)
+        if not strings:
+            return np.zeros(0, dtype=bool)
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        # Every character of every string, as columns of the table; strings of one-byte characters are
+        # translated a byte at a time
+        text = "".join(strings)
+        index_type = self.index_type
+        data = None
+        if self.byte_columns is not None:
+            try:
+                data = text.encode("latin-1")
+            except UnicodeEncodeError:
+                pass
+        if data is not None:
+            characters = np.frombuffer(data.translate(self.byte_columns), dtype=np.uint8).astype(index_type)
+        else:
+            codes = np.minimum(np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32), len(self.lookup) - 1)
+            characters = self.lookup[codes].astype(index_type)
+
+        # Longest strings first, so that the strings still running at each step are a prefix of the order; the
+        # sort keys are made small so that NumPy can use a radix sort
+        longest = int(lengths.max())
+        keys = longest - lengths
+        order = np.argsort(keys.astype(np.uint16) if longest < 2 ** 16 else keys, kind="stable")
+        starts = (np.cumsum(lengths) - lengths)[order].astype(np.int64)
+        # Number of strings longer than each step
+        running = np.searchsorted(keys[order], np.arange(longest, 0, -1), side="left")
+
+        # Each string's state as its row * width, in the sorted order
+        states = np.full(len(strings), self.initial * self.width, dtype=index_type)
+        positions = np.empty(len(strings), dtype=np.int64)
+        columns = np.empty(len(strings), dtype=index_type)
+        for step, count in enumerate(running.tolist()):
+            # Buffers are reused, so each step allocates nothing
+            position = positions[:count]
+            column = columns[:count]
+            state = states[:count]
+            np.add(starts[:count], step, out=position)
+            np.take(characters, position, out=column)
+            column += state
+            np.take(self.flat, column, out=state)
+
+        result = np.empty(len(strings), dtype=bool)
+        result[order] = self.accepting[states // self.width]
+        return result
@@ -1,4 +1,8 @@
+import time
+
 from Lab2.src.Grammar import Grammar
+from Lab2.src.LazyDFA import LazyDFA
+from Lab2.src.TransitionTable import TransitionTable
 from graphviz import Digraph
 
 
@@ -15,20 +19,28 @@ class FiniteAutomaton:
         self.final_state = final_state
         # List of transitions between states (e.g., state to state on input symbol)
         self.transitions = transitions
+        # Statistics of the conversion that produced this automaton, set by convert_to_dfa
+        self.conversion_stats = None
+        # The CompiledDFA built by compile(), kept so that later calls reuse it
+        self.__compiled = None
+
+    # Index the transitions: states and symbols interned to ints, with adjacency sets and epsilon closures
+    def transition_table(self):
+        return TransitionTable(self.states, self.alphabet, self.initial_state, self.final_state, self.transitions)
 
     # Check if the automaton is deterministic
     def is_deterministic(self):
         is_deterministic = True
         # Keep track of seen state-symbol pairs
-        seen = []
+        seen = set()
         for transition in self.transitions:
             # Key is a pair of state and symbol
-            key = [transition["state"], transition["symbol"]]
-            if key in seen:
-                # If the pair is seen again, it means it's non-deterministic
+            key = (transition["state"], transition["symbol"])
+            # If the pair is seen again, or the transition is an epsilon transition, it's non-deterministic
+            if key in seen or transition["symbol"] == TransitionTable.EPSILON:
                 is_deterministic = False
                 break
-            seen.append(key)
+            seen.add(key)
         return is_deterministic
 
     # Generate the productions for a context-free grammar from the automaton's transitions
@@ -93,85 +105,113 @@ class FiniteAutomaton:
         if self.is_deterministic():
             return self
 
-        # Get the epsilon closure for a set of states
-        def epsilon_closure(states):
-            closure = set(states)
-            stack = list(states)
-
-            while stack:
-                state = stack.pop()
-                for transition in self.transitions:
-                    if transition["state"] == state and transition["symbol"] == "":
-                        if transition["to"] not in closure:
-                            closure.add(transition["to"])
-                            stack.append(transition["to"])
-            return closure
-
-        # Get the next states for a given set of states and input symbol
-        def move(states, symbol):
-            result = set()
-            for state in states:
-                for transition in self.transitions:
-                    if transition["state"] == state and transition["symbol"] == symbol:
-                        result.add(transition["to"])
-            return result
-
-        # Start with the epsilon closure of the initial state
-        initial_dfa_state = frozenset(epsilon_closure({self.initial_state}))
-
-        # Initialize DFA states and transitions
-        dfa_states = [initial_dfa_state]
-        dfa_transitions = []
-        unprocessed_states = [initial_dfa_state]
+        start = time.perf_counter()
+        # States and symbols as ints, with the epsilon closure of every state computed once
+        table = self.transition_table()
 
-        # Map of DFA states (which are sets of NDFA states) to state names
-        state_mapping = {initial_dfa_state: "q0"}
+        # Input symbols in the order of the alphabet, skipping epsilon transitions
+        symbols = [symbol for symbol in self.alphabet if symbol != TransitionTable.EPSILON]
 
-        # Process all unprocessed DFA states
-        while unprocessed_states:
-            current_state_set = unprocessed_states.pop(0)
+        # Build the DFA states as bitmasks of NDFA states, in the order they are found
+        subsets, edges = table.subset_construction([table.symbol_ids[symbol] for symbol in symbols])
 
-            # For each input symbol
-            for symbol in self.alphabet:
-                if symbol == "":  # Skip epsilon transitions in the DFA
-                    continue
+        # Name the DFA states q0, q1, ... in that order
+        dfa_state_names = [f"q{index}" for index in range(len(subsets))]
+        dfa_transitions = [{
+            "state": dfa_state_names[source],
+            "symbol": table.symbol_names[symbol],
+            "to": dfa_state_names[target]
+        } for source, symbol, target in edges]
 
-                # Get the next state set
-                next_states = move(current_state_set, symbol)
-                next_state_closure = frozenset(epsilon_closure(next_states))
-
-                # If this is a new state, add it to the list of states to process
-                if next_state_closure and next_state_closure not in dfa_states:
-                    dfa_states.append(next_state_closure)
-                    unprocessed_states.append(next_state_closure)
-                    state_mapping[next_state_closure] = f"q{len(state_mapping)}"
-
-                # Add the transition if the next state set is not empty
-                if next_state_closure:
-                    dfa_transitions.append({
-                        "state": state_mapping[current_state_set],
-                        "symbol": symbol,
-                        "to": state_mapping[next_state_closure]
-                    })
-
-        # Determine the final states of the DFA
-        dfa_final_states = []
-        for dfa_state_set in dfa_states:
-            # If any NDFA state in this set is a final state, the DFA state is final
-            if any(state in self.final_state for state in dfa_state_set):
-                dfa_final_states.append(state_mapping[dfa_state_set])
-
-        # Create list of state names for the DFA
-        dfa_state_names = list(state_mapping.values())
+        # A DFA state is final if any NDFA state in it is final
+        final_mask = sum(1 << state for state in table.finals)
+        dfa_final_states = [name for name, subset in zip(dfa_state_names, subsets) if subset & final_mask]
 
         # Create the new DFA
         dfa = FiniteAutomaton(
             states=dfa_state_names,
-            alphabet=[symbol for symbol in self.alphabet if symbol != ""],  # Remove epsilon
+            alphabet=symbols,
             initial_state="q0",
             final_state=dfa_final_states,
             transitions=dfa_transitions
         )
+        dfa.conversion_stats = {
+            "nfa_states": len(table.state_names),
+            "dfa_states": len(subsets),
+            "dfa_transitions": len(edges),
+            "seconds": time.perf_counter() - start,
+        }
 
         return dfa
 
+    # Minimize the automaton, converting it to a DFA first if needed
+    def minimize(self):
+        dfa = self.convert_to_dfa()
+        table = dfa.transition_table()
+        symbols = [symbol for symbol in dfa.alphabet if symbol != TransitionTable.EPSILON]
+
+        # Drop unreachable states and dead states, which cannot reach a final state
+        live = table.live_states()
+        # Merge equivalent states with Hopcroft's partition refinement
+        classes = table.equivalence_classes(live)
+        class_of = {}
+        for class_id, members in enumerate(classes):
+            for state in members:
+                class_of[state] = class_id
+
+        # Name the classes q0, q1, ... in breadth-first order from the initial state, following the alphabet
+        names = {}
+        order = []
+        dfa_transitions = []
+        if table.initial in class_of:
+            names[class_of[table.initial]] = "q0"
+            order.append(class_of[table.initial])
+        for class_id in order:
+            # All states of a class move the same way, so any of them will do
+            targets = table.targets[classes[class_id][0]]
+            for symbol in symbols:
+                target_set = targets.get(table.symbol_ids[symbol])
+                if not target_set:
+                    continue
+                target = class_of.get(next(iter(target_set)))
+                # Transitions into dead states are left out
+                if target is None:
+                    continue
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    order.append(target)
+                dfa_transitions.append({"state": names[class_id], "symbol": symbol, "to": names[target]})
+
+        # An automaton for the empty language keeps only its initial state
+        if not order:
+            return FiniteAutomaton(["q0"], symbols, "q0", [], [])
+
+        return FiniteAutomaton(
+            states=[names[class_id] for class_id in order],
+            alphabet=symbols,
+            initial_state="q0",
+            final_state=[names[class_id] for class_id in order if classes[class_id][0] in table.finals],
+            transitions=dfa_transitions
+        )
+
+    # Compile the automaton into a dense transition matrix for fast matching, converting it to a DFA first if
+    # needed. The result is built once and reused by later calls, so the automaton should not be changed after
+    def compile(self):
+        if self.__compiled is None:
+            # Imported here so that the rest of the class does not need NumPy
+            from Lab2.src.CompiledDFA import CompiledDFA
+
+            dfa = self.convert_to_dfa()
+            self.__compiled = CompiledDFA(dfa.states, dfa.alphabet, dfa.initial_state, dfa.final_state,
+                                          dfa.transitions)
+        return self.__compiled
+
+    # Check whether the automaton accepts a string, with the DFA compiled on the first call
+    def accepts(self, string):
+        return self.compile().accepts(string)
+
+    # Build a matcher that determinizes the automaton lazily, only for the subsets of states that the input
+    # reaches, with at most max_bytes of cached transitions; for automata whose full DFA is too large
+    def lazy_dfa(self, max_bytes=1 << 20):
+        return LazyDFA(self.states, self.alphabet, self.initial_state, self.final_state, self.transitions,
+                       max_bytes=max_bytes)
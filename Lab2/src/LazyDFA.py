@@ -0,0 +1,160 @@
+import sys
+from collections import OrderedDict
+
+from Lab2.src.TransitionTable import TransitionTable, bits
+
+# Estimated bytes of one cache entry besides its two subset bitmasks: the (subset, symbol) key tuple, the small
+# symbol int and the ordered dict's slot and linked-list node
+ENTRY_BYTES = sys.getsizeof((0, 0)) + 120
+
+
+class LazyDFA:
+    # Matches strings against an NFA by determinizing it on the fly: the subset of NFA states reached by each
+    # step is computed when the input first needs it, and (subset, symbol) -> subset transitions are memoized in
+    # an LRU cache of at most max_bytes. Subsets are integer bitmasks of state ids, as in subset_construction.
+    # When the cache thrashes (a window of steps, across strings, that mostly miss while entries are being
+    # evicted), the rest of the string and the next window of steps are matched by plain NFA simulation
+    def __init__(self, states, alphabet, initial_state, final_state, transitions, max_bytes=1 << 20, window=1024,
+                 max_miss_ratio=0.5):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.table = TransitionTable(states, alphabet, initial_state, final_state, transitions)
+        self.max_bytes = max_bytes
+        # Steps per thrash check and the share of them that may miss before falling back
+        self.window = window
+        self.max_miss_ratio = max_miss_ratio
+
+        # The epsilon closure of every state as a bitmask
+        closure_masks = [sum(1 << state for state in closure) for closure in self.table.closures]
+        # For each symbol id, the closure of each state's targets on it as a bitmask, or 0
+        self.symbol_moves = [[0] * len(self.table.state_names) for _ in self.table.symbol_names]
+        for state, targets in enumerate(self.table.targets):
+            for symbol, target_set in targets.items():
+                mask = 0
+                for target in target_set:
+                    mask |= closure_masks[target]
+                self.symbol_moves[symbol][state] = mask
+        self.initial = closure_masks[self.table.initial]
+        self.final_mask = sum(1 << state for state in self.table.finals)
+
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
+        # Steps left to match by simulation after the cache thrashed
+        self.__bypass = 0
+        self.reset_stats()
+        self.__start_window()
+
+    # Zero the cache statistics, leaving the cache itself as it is
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Strings that were finished by NFA simulation, and the steps taken that way
+        self.fallbacks = 0
+        self.fallback_steps = 0
+
+    # Cache statistics as a dict, for sizing max_bytes
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "fallbacks": self.fallbacks,
+            "fallback_steps": self.fallback_steps,
+            "entries": len(self.cache),
+            "bytes": self.cache_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    # Start a new window of steps for the thrash check
+    def __start_window(self):
+        self.__window_steps = 0
+        self.__window_misses = 0
+        self.__window_evictions = self.evictions
+
+    # Drop every cached transition
+    def clear(self):
+        self.cache.clear()
+        self.cache_bytes = 0
+
+    # Get the subset reached from a subset on a symbol id, without the cache
+    def step(self, subset, symbol):
+        moves = self.symbol_moves[symbol]
+        target = 0
+        for state in bits(subset):
+            target |= moves[state]
+        return target
+
+    # Check whether the automaton accepts a string, or any iterable of symbols
+    def accepts(self, string):
+        symbols = iter(string)
+        if self.__bypass > 0:
+            # Still falling back after recent thrashing
+            return self.__simulate(self.initial, symbols)
+        symbol_ids = self.table.symbol_ids
+        cache = self.cache
+        subset = self.initial
+        for character in symbols:
+            symbol = symbol_ids.get(character)
+            if symbol is None:
+                # A symbol outside the alphabet leads nowhere
+                return False
+            key = (subset, symbol)
+            target = cache.get(key)
+            if target is not None:
+                cache.move_to_end(key)
+                self.hits += 1
+            else:
+                target = self.step(subset, symbol)
+                self.misses += 1
+                self.__window_misses += 1
+                self.__store(key, target)
+            subset = target
+            if not subset:
+                return False
+
+            self.__window_steps += 1
+            if self.__window_steps == self.window:
+                # Thrashing: most steps missed and the misses pushed out other entries
+                thrashing = (self.__window_misses > self.max_miss_ratio * self.window
+                             and self.evictions > self.__window_evictions)
+                self.__start_window()
+                if thrashing:
+                    # Simulate for the rest of this string and the next window of steps, then try the cache again
+                    self.__bypass = self.window
+                    return self.__simulate(subset, symbols)
+        return bool(subset & self.final_mask)
+
+    # Check each of the strings; returns a list of booleans in their order
+    def match_many(self, strings):
+        return [self.accepts(string) for string in strings]
+
+    # Cache a transition, evicting the least recently used ones to stay within max_bytes
+    def __store(self, key, target):
+        size = ENTRY_BYTES + sys.getsizeof(key[0]) + sys.getsizeof(target)
+        if size > self.max_bytes:
+            return
+        self.cache[key] = target
+        self.cache_bytes += size
+        while self.cache_bytes > self.max_bytes:
+            (subset, _), evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= ENTRY_BYTES + sys.getsizeof(subset) + sys.getsizeof(evicted)
+            self.evictions += 1
+
+    # Finish matching the rest of a string by NFA simulation from a subset, bypassing the cache
+    def __simulate(self, subset, symbols):
+        self.fallbacks += 1
+        symbol_ids = self.table.symbol_ids
+        for character in symbols:
+            symbol = symbol_ids.get(character)
+            if symbol is None:
+                return False
+            subset = self.step(subset, symbol)
+            self.fallback_steps += 1
+            self.__bypass -= 1
+            if not subset:
+                return False
+        return bool(subset & self.final_mask)
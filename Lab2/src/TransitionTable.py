@@ -0,0 +1,244 @@
+import re
+from collections import deque
+
+# Finds the non-zero bytes of a bitmask, so that the members of a wide bitmask are found without testing every bit
+NONZERO_BYTE = re.compile(rb"[^\x00]")
+# The set bits of every byte value
+BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+# Get the positions of the set bits of an integer bitmask, lowest first
+def bits(mask):
+    if mask.bit_length() <= 64:
+        # Small enough to clear the lowest set bit one at a time
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+        return
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for match in NONZERO_BYTE.finditer(data):
+        position = match.start()
+        base = position * 8
+        for bit in BYTE_BITS[data[position]]:
+            yield base + bit
+
+
+class TransitionTable:
+    # The empty symbol marks an epsilon transition, as in the dict-list format of FiniteAutomaton
+    EPSILON = ""
+
+    # Index the transitions of an automaton; states and symbols are interned to ints in order of appearance
+    def __init__(self, states, alphabet, initial_state, final_state, transitions):
+        # State names by id and ids by name
+        self.state_names = []
+        self.state_ids = {}
+        # Symbol names by id and ids by name; epsilon is not a symbol
+        self.symbol_names = []
+        self.symbol_ids = {}
+
+        for state in states:
+            self.state_id(state)
+        # States that only appear in transitions are interned too, before the adjacency lists are made
+        for transition in transitions:
+            self.state_id(transition["state"])
+            self.state_id(transition["to"])
+        self.initial = self.state_id(initial_state)
+        self.finals = {self.state_id(state) for state in final_state}
+        for symbol in alphabet:
+            if symbol != self.EPSILON:
+                self.symbol_id(symbol)
+
+        # Adjacency: for each state id, a dict of symbol id -> set of target state ids
+        self.targets = [{} for _ in self.state_names]
+        # For each state id, the set of states reachable by one epsilon transition
+        self.epsilon = [set() for _ in self.state_names]
+        for transition in transitions:
+            state = self.state_ids[transition["state"]]
+            target = self.state_ids[transition["to"]]
+            if transition["symbol"] == self.EPSILON:
+                self.epsilon[state].add(target)
+            else:
+                symbol = self.symbol_id(transition["symbol"])
+                self.targets[state].setdefault(symbol, set()).add(target)
+
+        # For each state id, its epsilon closure as a frozenset of state ids
+        self.closures = self.__epsilon_closures()
+
+    # Return the id of a state, interning it if it is new
+    def state_id(self, state):
+        state_id = self.state_ids.get(state)
+        if state_id is None:
+            state_id = self.state_ids[state] = len(self.state_names)
+            self.state_names.append(state)
+        return state_id
+
+    # Return the id of a symbol, interning it if it is new; symbols missing from the alphabet are added too
+    def symbol_id(self, symbol):
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.symbol_ids[symbol] = len(self.symbol_names)
+            self.symbol_names.append(symbol)
+        return symbol_id
+
+    # Compute the epsilon closure of every state once
+    def __epsilon_closures(self):
+        # A state without epsilon transitions is its own closure
+        closures = [frozenset((state,)) for state in range(len(self.state_names))]
+        for state, targets in enumerate(self.epsilon):
+            if not targets:
+                continue
+            # Depth-first search along epsilon transitions
+            closure = {state}
+            stack = [state]
+            while stack:
+                for target in self.epsilon[stack.pop()]:
+                    if target not in closure:
+                        closure.add(target)
+                        stack.append(target)
+            closures[state] = frozenset(closure)
+        return closures
+
+    # Determinize: build the reachable subsets of states with each subset as an integer bitmask of state ids
+    # (bit i set for state i). Subsets are numbered in the order they are found, starting with the closure of
+    # the initial state, and looked up in a dict by their bitmask. Returns the list of subset bitmasks and
+    # the DFA edges as (subset index, symbol id, subset index), following symbols in the given order
+    def subset_construction(self, symbols):
+        # The epsilon closure of every state as a bitmask
+        closure_masks = [sum(1 << state for state in closure) for closure in self.closures]
+        # For each state, (symbol id, bitmask of the closure of its targets) pairs
+        state_moves = []
+        for targets in self.targets:
+            moves = []
+            for symbol, target_set in targets.items():
+                mask = 0
+                for target in target_set:
+                    mask |= closure_masks[target]
+                moves.append((symbol, mask))
+            state_moves.append(moves)
+
+        initial = closure_masks[self.initial]
+        subsets = [initial]
+        index = {initial: 0}
+        edges = []
+        worklist = deque([initial])
+        while worklist:
+            subset = worklist.popleft()
+            source = index[subset]
+            # Union the targets of every member on every symbol in one pass over the members
+            reached = {}
+            for state in bits(subset):
+                for symbol, mask in state_moves[state]:
+                    reached[symbol] = reached.get(symbol, 0) | mask
+            for symbol in symbols:
+                target = reached.get(symbol)
+                if not target:
+                    continue
+                target_index = index.get(target)
+                if target_index is None:
+                    target_index = index[target] = len(subsets)
+                    subsets.append(target)
+                    worklist.append(target)
+                edges.append((source, symbol, target_index))
+        return subsets, edges
+
+    # Get the ids of the live states of a DFA: reachable from the initial state and able to reach a final state
+    def live_states(self):
+        # Forward search from the initial state
+        reachable = {self.initial}
+        stack = [self.initial]
+        while stack:
+            for target_set in self.targets[stack.pop()].values():
+                for target in target_set:
+                    if target not in reachable:
+                        reachable.add(target)
+                        stack.append(target)
+
+        # Backward search from the final states over the reversed transitions
+        predecessors = [[] for _ in self.state_names]
+        for state in reachable:
+            for target_set in self.targets[state].values():
+                for target in target_set:
+                    predecessors[target].append(state)
+        live = self.finals & reachable
+        stack = list(live)
+        while stack:
+            for state in predecessors[stack.pop()]:
+                if state not in live:
+                    live.add(state)
+                    stack.append(state)
+        return live
+
+    # Split the given states of a DFA into classes of equivalent states with Hopcroft's partition refinement, in
+    # O(n * k * log n) for n states and k symbols. Missing transitions go to an implicit dead state, so the
+    # states should be live (see live_states) for the classes to be those of the minimal DFA. Returns a list
+    # of classes, each a list of state ids
+    def equivalence_classes(self, states):
+        states = sorted(states)
+        symbols = range(len(self.symbol_names))
+        # Number the states 0..n-1 and add the dead state as n, so that every state has every transition; states
+        # outside the given ones count as dead too
+        dead = len(states)
+        position_of = [dead] * len(self.state_names)
+        for position, state in enumerate(states):
+            position_of[state] = position
+        # For each symbol, the predecessors of every state on it
+        inverse = []
+        for symbol in symbols:
+            predecessors = [[] for _ in range(dead + 1)]
+            for position, state in enumerate(states):
+                target_set = self.targets[state].get(symbol)
+                if target_set:
+                    # A single target in a DFA
+                    for target in target_set:
+                        predecessors[position_of[target]].append(position)
+                else:
+                    predecessors[dead].append(position)
+            predecessors[dead].append(dead)
+            inverse.append(predecessors)
+
+        # Start from final and non-final states; the dead state is non-final
+        finals = [position for position, state in enumerate(states) if state in self.finals]
+        others = [position for position, state in enumerate(states) if state not in self.finals] + [dead]
+        blocks = [set(block) for block in (finals, others) if block]
+        block_of = [0] * (dead + 1)
+        for block_id, block in enumerate(blocks):
+            for position in block:
+                block_of[position] = block_id
+
+        # Blocks still to be used as splitters; starting with the smaller of the two is enough
+        waiting = {min(range(len(blocks)), key=lambda block_id: len(blocks[block_id]))}
+        while waiting:
+            splitter = list(blocks[waiting.pop()])
+            for symbol in symbols:
+                # The states that move into the splitter on this symbol, grouped by their block
+                touched = {}
+                predecessors = inverse[symbol]
+                for target in splitter:
+                    for source in predecessors[target]:
+                        block_id = block_of[source]
+                        group = touched.get(block_id)
+                        if group is None:
+                            touched[block_id] = [source]
+                        else:
+                            group.append(source)
+
+                for block_id, sources in touched.items():
+                    block = blocks[block_id]
+                    if len(sources) == len(block):
+                        continue
+                    # Split the block into the states that move into the splitter and the rest
+                    new_id = len(blocks)
+                    new_block = set(sources)
+                    block -= new_block
+                    blocks.append(new_block)
+                    for source in sources:
+                        block_of[source] = new_id
+                    # Both halves must be used if the block was waiting, otherwise the smaller one is enough
+                    if block_id in waiting or len(new_block) <= len(block):
+                        waiting.add(new_id)
+                    else:
+                        waiting.add(block_id)
+
+        # Drop the dead state's class and translate positions back to state ids
+        return [[states[position] for position in sorted(block)] for block in blocks if dead not in block]
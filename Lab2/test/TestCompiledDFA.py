@@ -0,0 +1,88 @@
+import random
+import unittest
+from unittest import mock
+from Lab2.src.FiniteAutomaton import FiniteAutomaton
+
+try:
+    import numpy
+    from Lab2.src.CompiledDFA import CompiledDFA
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestCompiledDFA(unittest.TestCase):
+
+    def setUp(self):
+        # Words over {a, b} that end in "ab"
+        self.transitions = [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q0", "symbol": "b", "to": "q0"},
+            {"state": "q1", "symbol": "a", "to": "q1"},
+            {"state": "q1", "symbol": "b", "to": "q2"},
+            {"state": "q2", "symbol": "a", "to": "q1"},
+            {"state": "q2", "symbol": "b", "to": "q0"},
+        ]
+        self.fa = FiniteAutomaton(["q0", "q1", "q2"], ["a", "b"], "q0", ["q2"], self.transitions)
+        self.compiled = self.fa.compile()
+
+    def test_table(self):
+        self.assertEqual(self.compiled.table.shape, (4, 3))
+        # The dead state and characters outside the alphabet lead to the dead state
+        self.assertEqual(self.compiled.table[3].tolist(), [3, 3, 3])
+        self.assertEqual(self.compiled.table[:, 2].tolist(), [3, 3, 3, 3])
+        self.assertEqual(self.compiled.accepting.tolist(), [False, False, True, False])
+
+    def test_accepts(self):
+        self.assertTrue(self.compiled.accepts("ab"))
+        self.assertTrue(self.compiled.accepts("bbaab"))
+        self.assertFalse(self.compiled.accepts(""))
+        self.assertFalse(self.compiled.accepts("aba"))
+        self.assertFalse(self.compiled.accepts("acab"))
+        self.assertTrue(self.fa.accepts("aab"))
+
+    def test_automaton_compiles_once(self):
+        fa = FiniteAutomaton(["q0", "q1", "q2"], ["a", "b"], "q0", ["q2"], self.transitions)
+        with mock.patch.object(FiniteAutomaton, "convert_to_dfa", autospec=True,
+                               side_effect=FiniteAutomaton.convert_to_dfa) as convert_to_dfa:
+            results = [fa.accepts(word) for word in ["ab", "ba", "aab", "", "bab"]]
+
+        self.assertEqual(results, [True, False, True, False, True])
+        self.assertEqual(convert_to_dfa.call_count, 1)
+        self.assertIs(fa.compile(), fa.compile())
+
+    def test_match_many_matches_accepts(self):
+        rng = random.Random(5)
+        strings = ["".join(rng.choice("ab") for _ in range(rng.randint(0, 12))) for _ in range(5000)]
+        strings += ["", "ab", "abc", "xab", "éab", "aāb", "abā", "\U0001F600ab"]
+
+        self.assertEqual(self.compiled.match_many(strings).tolist(), [self.compiled.accepts(s) for s in strings])
+        self.assertEqual(self.compiled.match_many([]).tolist(), [])
+
+    def test_match_many_with_many_symbols(self):
+        # More than 256 symbols, so strings cannot be translated a byte at a time
+        symbols = [chr(0x400 + i) for i in range(300)]
+        transitions = [{"state": "q0", "symbol": symbol, "to": "q1"} for symbol in symbols]
+        compiled = CompiledDFA(["q0", "q1"], symbols, "q0", ["q1"], transitions)
+
+        self.assertEqual(compiled.match_many([symbols[0], symbols[299], "a", symbols[1] * 2]).tolist(),
+                         [True, True, False, False])
+
+    def test_nondeterministic_automata_are_converted(self):
+        transitions = [
+            {"state": "p0", "symbol": "a", "to": "p0"},
+            {"state": "p0", "symbol": "b", "to": "p0"},
+            {"state": "p0", "symbol": "a", "to": "p1"},
+            {"state": "p1", "symbol": "b", "to": "p2"},
+        ]
+        compiled = FiniteAutomaton(["p0", "p1", "p2"], ["a", "b"], "p0", {"p2"}, transitions).compile()
+
+        self.assertEqual(compiled.match_many(["ab", "bab", "aba", "b"]).tolist(), [True, True, False, False])
+        with self.assertRaises(ValueError):
+            CompiledDFA(["p0", "p1", "p2"], ["a", "b"], "p0", {"p2"}, transitions)
+        with self.assertRaises(ValueError):
+            CompiledDFA(["p0"], ["ab"], "p0", [], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
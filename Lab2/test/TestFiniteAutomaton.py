@@ -1,7 +1,64 @@
+import itertools
+import random
 import unittest
 from Lab2.src.FiniteAutomaton import FiniteAutomaton
 
 
+# The subset construction written plainly with sets, as a reference for convert_to_dfa
+def reference_dfa(fa):
+    def closure(states):
+        closure = set(states)
+        stack = list(states)
+        while stack:
+            state = stack.pop()
+            for transition in fa.transitions:
+                if transition["state"] == state and transition["symbol"] == "" and transition["to"] not in closure:
+                    closure.add(transition["to"])
+                    stack.append(transition["to"])
+        return frozenset(closure)
+
+    initial = closure({fa.initial_state})
+    names = {initial: "q0"}
+    queue = [initial]
+    transitions = []
+    for subset in queue:
+        for symbol in fa.alphabet:
+            if symbol == "":
+                continue
+            target = closure({transition["to"] for transition in fa.transitions
+                              if transition["state"] in subset and transition["symbol"] == symbol})
+            if target:
+                if target not in names:
+                    names[target] = f"q{len(names)}"
+                    queue.append(target)
+                transitions.append({"state": names[subset], "symbol": symbol, "to": names[target]})
+    finals = [names[subset] for subset in queue if subset & set(fa.final_state)]
+    return list(names.values()), finals, transitions
+
+
+# Check whether a DFA in the dict-list format accepts a word, starting from its initial state or the given one
+def dfa_accepts(dfa, word, state=None):
+    moves = {(transition["state"], transition["symbol"]): transition["to"] for transition in dfa.transitions}
+    state = dfa.initial_state if state is None else state
+    for symbol in word:
+        state = moves.get((state, symbol))
+        if state is None:
+            return False
+    return state in dfa.final_state
+
+
+# An NFA for (a|b)*a(a|b){n-1}, the words whose n-th symbol from the end is a; its DFA has 2^n states
+def nth_from_end(n):
+    transitions = [
+        {"state": "p0", "symbol": "a", "to": "p0"},
+        {"state": "p0", "symbol": "b", "to": "p0"},
+        {"state": "p0", "symbol": "a", "to": "p1"},
+    ]
+    for i in range(1, n):
+        transitions += [{"state": f"p{i}", "symbol": symbol, "to": f"p{i + 1}"} for symbol in "ab"]
+    return FiniteAutomaton([f"p{i}" for i in range(n + 1)], ["a", "b"], "p0", {f"p{n}"}, transitions)
+
+
 class TestFiniteAutomaton(unittest.TestCase):
 
     def setUp(self):
@@ -32,6 +89,139 @@ class TestFiniteAutomaton(unittest.TestCase):
                                            transitions_deterministic)
         self.assertTrue(fa_deterministic.is_deterministic())
 
+        # Epsilon transitions make an automaton non-deterministic
+        transitions_epsilon = [{"state": "q0", "symbol": "", "to": "q1"}]
+        fa_epsilon = FiniteAutomaton(self.states, self.alphabet, self.initial_state, self.final_state,
+                                     transitions_epsilon)
+        self.assertFalse(fa_epsilon.is_deterministic())
+
+    def test_convert_to_dfa(self):
+        # Alphabet as a list so that the DFA states are named in a fixed order
+        fa = FiniteAutomaton(self.states, ["a", "b"], self.initial_state, self.final_state, self.transitions)
+        dfa = fa.convert_to_dfa()
+
+        self.assertTrue(dfa.is_deterministic())
+        self.assertEqual(dfa.states, ["q0", "q1", "q2", "q3", "q4", "q5"])
+        self.assertEqual(dfa.final_state, ["q3", "q5"])
+        self.assertEqual(dfa.transitions, [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q1", "symbol": "b", "to": "q2"},
+            {"state": "q2", "symbol": "a", "to": "q3"},
+            {"state": "q2", "symbol": "b", "to": "q4"},
+            {"state": "q4", "symbol": "a", "to": "q5"},
+            {"state": "q4", "symbol": "b", "to": "q4"},
+            {"state": "q5", "symbol": "b", "to": "q2"},
+        ])
+
+    def test_convert_to_dfa_follows_epsilon_transitions(self):
+        transitions = [
+            {"state": "q0", "symbol": "", "to": "q1"},
+            {"state": "q1", "symbol": "a", "to": "q2"},
+            {"state": "q2", "symbol": "", "to": "q0"},
+        ]
+        fa = FiniteAutomaton(["q0", "q1", "q2"], ["a", ""], "q0", {"q2"}, transitions)
+        dfa = fa.convert_to_dfa()
+
+        self.assertEqual(dfa.alphabet, ["a"])
+        self.assertEqual(dfa.transitions, [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q1", "symbol": "a", "to": "q1"},
+        ])
+        self.assertEqual(dfa.final_state, ["q1"])
+
+    def test_convert_to_dfa_matches_reference(self):
+        rng = random.Random(7)
+        # Some with 80 states, so that subsets also need more than one machine word
+        for size in [2, 3, 5, 8] * 10 + [80] * 2:
+            states = [f"s{i}" for i in range(size)]
+            alphabet = ["a", "b", "c", ""]
+            transitions = [{"state": rng.choice(states), "symbol": rng.choice(alphabet), "to": rng.choice(states)}
+                           for _ in range(size * 2)]
+            transitions.append({"state": "s0", "symbol": "a", "to": "s0"})
+            transitions.append({"state": "s0", "symbol": "a", "to": states[-1]})
+            fa = FiniteAutomaton(states, alphabet, "s0", set(rng.sample(states, 1 + size // 4)), transitions)
+
+            dfa = fa.convert_to_dfa()
+            self.assertEqual((dfa.states, dfa.final_state, dfa.transitions), reference_dfa(fa))
+
+    def test_conversion_stats(self):
+        dfa = nth_from_end(12).convert_to_dfa()
+
+        self.assertEqual(len(dfa.states), 2 ** 12)
+        self.assertEqual(dfa.conversion_stats["nfa_states"], 13)
+        self.assertEqual(dfa.conversion_stats["dfa_states"], 2 ** 12)
+        self.assertEqual(dfa.conversion_stats["dfa_transitions"], 2 ** 13)
+        self.assertGreaterEqual(dfa.conversion_stats["seconds"], 0)
+        self.assertIsNone(self.fa.conversion_stats)
+
+    def test_minimize(self):
+        # (a|b)*abb, whose subset construction has 5 states and whose minimal DFA has 4
+        transitions = [
+            {"state": "0", "symbol": "a", "to": "0"},
+            {"state": "0", "symbol": "b", "to": "0"},
+            {"state": "0", "symbol": "a", "to": "1"},
+            {"state": "1", "symbol": "b", "to": "2"},
+            {"state": "2", "symbol": "b", "to": "3"},
+        ]
+        fa = FiniteAutomaton(["0", "1", "2", "3"], ["a", "b"], "0", {"3"}, transitions)
+        dfa = fa.convert_to_dfa()
+        minimal = fa.minimize()
+
+        self.assertEqual(len(dfa.states), 4)
+        self.assertEqual(len(minimal.states), 4)
+        self.assertTrue(minimal.is_deterministic())
+        for length in range(7):
+            for word in itertools.product("ab", repeat=length):
+                self.assertEqual(dfa_accepts(minimal, word), "".join(word).endswith("abb"))
+
+    def test_minimize_merges_equivalent_states(self):
+        # q1 and q2 are equivalent, q3 is unreachable and q4 is dead
+        transitions = [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q0", "symbol": "b", "to": "q2"},
+            {"state": "q1", "symbol": "a", "to": "q5"},
+            {"state": "q2", "symbol": "a", "to": "q5"},
+            {"state": "q1", "symbol": "b", "to": "q4"},
+            {"state": "q3", "symbol": "a", "to": "q5"},
+            {"state": "q4", "symbol": "a", "to": "q4"},
+        ]
+        fa = FiniteAutomaton(["q0", "q1", "q2", "q3", "q4", "q5"], ["a", "b"], "q0", {"q5"}, transitions)
+        minimal = fa.minimize()
+
+        self.assertEqual(minimal.states, ["q0", "q1", "q2"])
+        self.assertEqual(minimal.final_state, ["q2"])
+        self.assertEqual(minimal.transitions, [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q0", "symbol": "b", "to": "q1"},
+            {"state": "q1", "symbol": "a", "to": "q2"},
+        ])
+
+    def test_minimize_empty_language(self):
+        transitions = [{"state": "q0", "symbol": "a", "to": "q1"}]
+        minimal = FiniteAutomaton(["q0", "q1", "q2"], ["a"], "q0", {"q2"}, transitions).minimize()
+
+        self.assertEqual((minimal.states, minimal.final_state, minimal.transitions), (["q0"], [], []))
+
+    def test_minimize_random_dfas(self):
+        rng = random.Random(3)
+        for size in [1, 2, 4, 8, 16] * 6:
+            states = [f"s{i}" for i in range(size)]
+            transitions = [{"state": state, "symbol": symbol, "to": rng.choice(states)}
+                           for state in states for symbol in "ab" if rng.random() < 0.9]
+            dfa = FiniteAutomaton(states, ["a", "b"], "s0", set(rng.sample(states, 1 + size // 3)), transitions)
+            minimal = dfa.minimize()
+
+            self.assertLessEqual(len(minimal.states), size)
+            # Minimizing again changes nothing
+            self.assertEqual(len(minimal.minimize().states), len(minimal.states))
+            words = [word for length in range(size + 1) for word in itertools.product("ab", repeat=length)]
+            for word in words[:63]:
+                self.assertEqual(dfa_accepts(minimal, word), dfa_accepts(dfa, word))
+            # Every two states of a minimal DFA accept different words; words up to the number of states decide it
+            if size <= 8:
+                accepted = {tuple(dfa_accepts(minimal, word, state) for word in words) for state in minimal.states}
+                self.assertEqual(len(accepted), len(minimal.states))
+
     def test_convert_to_grammar(self):
         grammar = self.fa.convert_to_grammar()
 
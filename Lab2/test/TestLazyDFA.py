@@ -0,0 +1,83 @@
+import itertools
+import random
+import unittest
+from Lab2.src.FiniteAutomaton import FiniteAutomaton
+from Lab2.src.LazyDFA import LazyDFA
+from Lab2.test.TestFiniteAutomaton import nth_from_end
+
+
+class TestLazyDFA(unittest.TestCase):
+
+    def test_accepts(self):
+        lazy = nth_from_end(3).lazy_dfa()
+
+        for length in range(8):
+            for word in itertools.product("ab", repeat=length):
+                self.assertEqual(lazy.accepts(word), length >= 3 and word[-3] == "a")
+        self.assertFalse(lazy.accepts("abca"))
+        # Only the 2^3 reachable subsets were built, each once per symbol
+        self.assertEqual(lazy.stats["misses"], 16)
+        self.assertEqual(lazy.stats["evictions"], 0)
+
+    def test_epsilon_transitions(self):
+        transitions = [
+            {"state": "q0", "symbol": "", "to": "q1"},
+            {"state": "q1", "symbol": "a", "to": "q2"},
+            {"state": "q2", "symbol": "", "to": "q0"},
+        ]
+        lazy = LazyDFA(["q0", "q1", "q2"], ["a", ""], "q0", {"q2"}, transitions)
+
+        self.assertEqual(lazy.match_many(["", "a", "aaa", "ab"]), [False, True, True, False])
+
+    def test_matches_convert_to_dfa(self):
+        rng = random.Random(11)
+        for size in [2, 3, 5, 8, 40] * 4:
+            states = [f"s{i}" for i in range(size)]
+            alphabet = ["a", "b", ""]
+            transitions = [{"state": rng.choice(states), "symbol": rng.choice(alphabet), "to": rng.choice(states)}
+                           for _ in range(size * 3)]
+            fa = FiniteAutomaton(states, alphabet, "s0", set(rng.sample(states, 1 + size // 4)), transitions)
+            compiled = fa.compile()
+            # A tiny cache, so that entries are evicted as well
+            lazy = fa.lazy_dfa(max_bytes=2000)
+
+            words = ["".join(rng.choice("ab") for _ in range(rng.randint(0, 20))) for _ in range(200)]
+            self.assertEqual(lazy.match_many(words), compiled.match_many(words).tolist())
+
+    def test_cache_stays_within_max_bytes(self):
+        lazy = nth_from_end(16).lazy_dfa(max_bytes=20000)
+        rng = random.Random(2)
+        for _ in range(50):
+            word = "".join(rng.choice("ab") for _ in range(200))
+            self.assertEqual(lazy.accepts(word), word[-16] == "a")
+            self.assertLessEqual(lazy.stats["bytes"], 20000)
+
+        stats = lazy.stats
+        self.assertGreater(stats["evictions"], 0)
+        self.assertEqual(stats["hits"] + stats["misses"] + stats["fallback_steps"], 50 * 200)
+
+    def test_falls_back_when_the_cache_thrashes(self):
+        fa = nth_from_end(18)
+        # Random input over 2^18 subsets misses almost every time in a cache of a few dozen entries
+        lazy = LazyDFA(fa.states, fa.alphabet, fa.initial_state, fa.final_state, fa.transitions, max_bytes=4000,
+                       window=100)
+        rng = random.Random(4)
+        word = "".join(rng.choice("ab") for _ in range(5000))
+
+        self.assertEqual(lazy.accepts(word), word[-18] == "a")
+        self.assertEqual(lazy.stats["fallbacks"], 1)
+        self.assertGreater(lazy.stats["fallback_steps"], 4000)
+
+        # A string that stays in a few subsets hits the cache and never falls back
+        lazy.reset_stats()
+        self.assertFalse(lazy.accepts("b" * 5000))
+        self.assertEqual(lazy.stats["fallbacks"], 0)
+        self.assertGreater(lazy.stats["hit_ratio"], 0.99)
+
+    def test_max_bytes_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            nth_from_end(2).lazy_dfa(max_bytes=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
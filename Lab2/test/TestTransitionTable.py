@@ -0,0 +1,49 @@
+import unittest
+from Lab2.src.TransitionTable import TransitionTable
+
+
+class TestTransitionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.transitions = [
+            {"state": "q0", "symbol": "a", "to": "q1"},
+            {"state": "q0", "symbol": "a", "to": "q2"},
+            {"state": "q1", "symbol": "", "to": "q2"},
+            {"state": "q2", "symbol": "", "to": "q3"},
+            {"state": "q3", "symbol": "b", "to": "q4"},
+            {"state": "q4", "symbol": "c", "to": "q5"},
+        ]
+        self.table = TransitionTable(["q0", "q1", "q2", "q3", "q4"], ["a", "b", ""], "q0", {"q4"}, self.transitions)
+
+    def test_states_and_symbols_are_interned(self):
+        # States in the order given, then those only found in transitions; epsilon is not a symbol
+        self.assertEqual(self.table.state_names, ["q0", "q1", "q2", "q3", "q4", "q5"])
+        self.assertEqual(self.table.symbol_names, ["a", "b", "c"])
+        self.assertEqual(self.table.initial, 0)
+        self.assertEqual(self.table.finals, {4})
+
+    def test_adjacency(self):
+        a = self.table.symbol_ids["a"]
+        b = self.table.symbol_ids["b"]
+
+        self.assertEqual(self.table.targets[0], {a: {1, 2}})
+        self.assertEqual(self.table.targets[3], {b: {4}})
+        self.assertEqual(self.table.epsilon[1], {2})
+
+    def test_epsilon_closures(self):
+        self.assertEqual(self.table.closures[1], {1, 2, 3})
+        self.assertEqual(self.table.closures[0], {0})
+        self.assertEqual(self.table.closures[4], {4})
+
+    def test_epsilon_cycles(self):
+        transitions = [
+            {"state": "x", "symbol": "", "to": "y"},
+            {"state": "y", "symbol": "", "to": "x"},
+        ]
+        table = TransitionTable(["x", "y"], [], "x", [], transitions)
+
+        self.assertEqual(table.closures, [{0, 1}, {0, 1}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,17 @@
 import re
-from Token import Token
+import sys
+from Lab3.src.Token import Token
 
 
 class Lexer:
+    # Number of characters a match must stay clear of the end of a chunk before it can be trusted;
+    # no pattern looks more than a few characters past the end of its match
+    LOOKAHEAD = 16
+    # An opening quote whose string has not been closed yet by the end of the buffer
+    OPEN_STRING = re.compile(r'"[^"]*\Z')
+    # A pattern that is only a list of alternative words, such as (min|hr)
+    WORD_LIST = re.compile(r'\(?([A-Za-z]+(?:\|[A-Za-z]+)*)\)?')
+
     def __init__(self):
         self.tokens = []
         self.token_patterns = {
@@ -20,29 +29,91 @@ class Lexer:
             'RBRACE': r'}',
             'WHITESPACE': r'[ \t\n]+'
         }
+        # Keywords and units are not matched by their own patterns: every word is scanned once as an ID
+        # and classified through this table, keyed by the lower-cased word like re.IGNORECASE would
+        self.word_types = {}
+        for token_type, pattern in self.token_patterns.items():
+            word_list = self.WORD_LIST.fullmatch(pattern)
+            if word_list:
+                for word in word_list.group(1).split('|'):
+                    self.word_types.setdefault(word.lower(), token_type)
+        # Classified keywords and units by their exact spelling, holding one interned value per spelling
+        self.words = {}
+
+        # The remaining patterns as one alternation of named groups, tried in the order of the dictionary
+        self.master_pattern = re.compile(
+            '|'.join(f'(?P<{token_type}>{pattern})' for token_type, pattern in self.token_patterns.items()
+                     if not self.WORD_LIST.fullmatch(pattern)),
+            re.IGNORECASE)
+
+    def classify_word(self, word):
+        # Return the token for a word scanned as an ID, sharing one interned value per spelling
+        token = self.words.get(word)
+        if token is None:
+            word = sys.intern(word)
+            token = Token(self.word_types.get(word.lower(), 'ID'), word)
+            if token.token_type != 'ID':
+                self.words[word] = token
+        return token
 
     def tokenize(self, text):
-        self.tokens = []
+        self.tokens = list(self._scan(text, 0, final=True))
+        self.tokens.append(Token('EOF', ''))
+        return self.tokens
+
+    def iter_tokens(self, source, chunk_size=65536):
+        # Lazily tokenize a string, a text file object or an iterable of string chunks, keeping only
+        # the unfinished tail of the input in memory
+        buffer = ''
+        offset = 0
+
+        for chunk in self._iter_chunks(source, chunk_size):
+            buffer += chunk
+            position = yield from self._scan(buffer, offset, final=False)
+            buffer = buffer[position:]
+            offset += position
+
+        yield from self._scan(buffer, offset, final=True)
+        yield Token('EOF', '')
+
+    @staticmethod
+    def _iter_chunks(source, chunk_size):
+        if isinstance(source, str):
+            yield source
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from source
+
+    def _scan(self, text, offset, final):
+        # Yield the tokens of text and return the position where scanning stopped. Unless this is the
+        # last piece of input, stop at a token that may still continue in the next chunk
         position = 0
-        while position < len(text):
-            match_found = False
+        length = len(text)
+        limit = length if final else length - self.LOOKAHEAD
 
-            for token_type, pattern in self.token_patterns.items():
-                regex = re.compile(f'^{pattern}', re.IGNORECASE)
-                match = regex.match(text[position:])
+        while position < length:
+            match = self.master_pattern.match(text, position)
 
-                if match:
-                    value = match.group(0)
+            if match is None:
+                if not final and (position >= limit or self.OPEN_STRING.match(text, position)):
+                    return position
+                raise ValueError(f"Unrecognized token at position {offset + position}: "
+                                 f"'{text[position:position + 10]}'")
 
-                    if token_type != 'WHITESPACE':
-                        self.tokens.append(Token(token_type, value))
+            if match.end() > limit:
+                return position
 
-                    position += len(value)
-                    match_found = True
-                    break
+            token_type = match.lastgroup
+            if token_type == 'ID':
+                yield self.classify_word(match.group())
+            elif token_type != 'WHITESPACE':
+                yield Token(token_type, match.group())
 
-            if not match_found:
-                raise ValueError(f"Unrecognized token at position {position}: '{text[position:position + 10]}'")
+            position = match.end()
 
-        self.tokens.append(Token('EOF', ''))
-        return self.tokens
\ No newline at end of file
+        return position
@@ -0,0 +1,57 @@
+import unittest
+
+from Lab3.src.Lexer import Lexer
+
+
+class TestLexer(unittest.TestCase):
+
+    def setUp(self):
+        self.lexer = Lexer()
+
+    def token_pairs(self, text):
+        return [(token.token_type, token.value) for token in self.lexer.tokenize(text)]
+
+    def test_keywords_share_one_token_type(self):
+        # Unlike Lab6, every keyword is a KEYWORD token that keeps its spelling
+        self.assertEqual(self.token_pairs('RECIPE title Ingredient STEP yield Time TEMP'), [
+            ('KEYWORD', 'RECIPE'), ('KEYWORD', 'title'), ('KEYWORD', 'Ingredient'), ('KEYWORD', 'STEP'),
+            ('KEYWORD', 'yield'), ('KEYWORD', 'Time'), ('KEYWORD', 'TEMP'), ('EOF', '')])
+
+    def test_units_by_kind(self):
+        self.assertEqual(self.token_pairs('g ML tsp Tbsp cup min HR c F'), [
+            ('UNIT', 'g'), ('UNIT', 'ML'), ('UNIT', 'tsp'), ('UNIT', 'Tbsp'), ('UNIT', 'cup'),
+            ('TIME_UNIT', 'min'), ('TIME_UNIT', 'HR'), ('TEMP_UNIT', 'c'), ('TEMP_UNIT', 'F'), ('EOF', '')])
+
+    def test_words_are_classified_as_a_whole(self):
+        # Keywords and units are only recognized as complete words. Before the word table, 'recipes' lexed as
+        # KEYWORD + ID 's', 'g2' as UNIT + NUMBER '2' and 'gram' as UNIT + ID 'ram'
+        self.assertEqual(self.token_pairs('recipes g2 gram hours'), [
+            ('ID', 'recipes'), ('ID', 'g2'), ('ID', 'gram'), ('ID', 'hours'), ('EOF', '')])
+
+    def test_repeated_words_share_one_string(self):
+        tokens = self.lexer.tokenize('tsp tsp INGREDIENT INGREDIENT flour flour')
+
+        self.assertIs(tokens[0].value, tokens[1].value)
+        self.assertIs(tokens[2].value, tokens[3].value)
+        # Only keywords and units are kept in the word table
+        self.assertEqual(set(self.lexer.words), {'tsp', 'INGREDIENT'})
+
+    def test_words_split_across_chunks(self):
+        chunks = ['INGRED', 'IENT: 2 tb', 'sp "salt"; TE', 'MP: 180 C']
+        expected = self.token_pairs(''.join(chunks))
+
+        self.assertEqual([(token.token_type, token.value) for token in self.lexer.iter_tokens(chunks)], expected)
+        self.assertEqual(expected[:4], [('KEYWORD', 'INGREDIENT'), ('COLON', ':'), ('NUMBER', '2'), ('UNIT', 'tbsp')])
+
+    def test_error_position(self):
+        with self.assertRaisesRegex(ValueError, "position 9: '@ }'"):
+            self.lexer.tokenize('RECIPE { @ }')
+
+    def test_iter_tokens_reports_absolute_position(self):
+        chunks = ['RECIPE { TITLE', ': "x"; @ }']
+        with self.assertRaisesRegex(ValueError, 'position 21'):
+            list(self.lexer.iter_tokens(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 class ASTNode:
+    # Nodes keep their fields in slots: a parsed corpus holds millions of them and a __dict__ per
+    # node would dominate its memory
+    __slots__ = ()
+    # Attributes holding child nodes (or lists of them), in output order; ASTVisitor walks them
+    _fields = ()
 
     def __str__(self, level=0):
-        indent = "  " * level
-        return f"{indent}{self.__class__.__name__}\n"
+        # The text is produced by write_tree, which imports the node classes itself
+        from Lab6.src.write_tree import tree_text
+        return tree_text(self, level)
 
     def visualize(self):
         print(self.__str__())
\ No newline at end of file
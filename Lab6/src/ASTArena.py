@@ -0,0 +1,361 @@
+import struct
+import sys
+from array import array
+
+from Lab6.src.BinaryNode import BinaryNode
+from Lab6.src.IdentifierNode import IdentifierNode
+from Lab6.src.IngredientNode import IngredientNode
+from Lab6.src.NumberNode import NumberNode
+from Lab6.src.RecipeNode import RecipeNode
+from Lab6.src.StepNode import StepNode
+from Lab6.src.StringNode import StringNode
+from Lab6.src.TemperatureNode import TemperatureNode
+from Lab6.src.TimeNode import TimeNode
+from Lab6.src.TitleNode import TitleNode
+from Lab6.src.UnitNode import UnitNode
+from Lab6.src.YieldNode import YieldNode
+
+# Node classes in the order of their kind codes; the code is the row value of the kinds column
+NODE_CLASSES = (RecipeNode, TitleNode, YieldNode, TimeNode, IngredientNode, StepNode, TemperatureNode,
+                NumberNode, StringNode, UnitNode, IdentifierNode, BinaryNode)
+KINDS = {node_class: kind for kind, node_class in enumerate(NODE_CLASSES)}
+
+# Child fields of the inner nodes, in the order their rows are stored in the children column. A recipe
+# also stores its ingredients and then its steps after these, with aux holding the ingredient count
+CHILD_FIELDS = {
+    RecipeNode: ('title', 'yield_node', 'time_node', 'temperature'),
+    TitleNode: ('title',),
+    YieldNode: ('servings',),
+    TimeNode: ('duration', 'unit'),
+    IngredientNode: ('quantity', 'unit', 'name'),
+    StepNode: ('instruction',),
+    TemperatureNode: ('value', 'unit'),
+    BinaryNode: ('left', 'right'),
+}
+# Leaf nodes keep their value in aux, as an index into the numbers or the strings column
+LEAF_FIELDS = {NumberNode: 'value', StringNode: 'value', UnitNode: 'value', IdentifierNode: 'name'}
+LEAF_KINDS = frozenset(KINDS[node_class] for node_class in LEAF_FIELDS)
+
+# Marks a missing optional child, such as an ingredient without a unit
+NO_NODE = -1
+
+# Serialized arenas start with the magic, the format version and the lengths of the columns; the
+# columns follow as little-endian arrays and the strings as UTF-8 with an array of their byte lengths
+MAGIC = b'RAST'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHH7I')
+
+
+class ASTArena:
+    # Recipe trees flattened into typed columns. Every node is a row of kinds, child_start, child_count
+    # and aux; the children of a row are the contiguous range children[child_start:child_start + child_count]
+    # of row numbers. Numbers and strings are stored once per distinct value
+    def __init__(self):
+        self.kinds = array('B')
+        self.child_start = array('I')
+        self.child_count = array('I')
+        self.aux = array('I')
+        self.children = array('i')
+        self.numbers = array('d')
+        self.strings = []
+        self.roots = array('I')
+        # Value -> index maps used to store each value once; rebuilt on demand after release_indexes
+        self._number_index = None
+        self._string_index = None
+
+    @classmethod
+    def from_recipes(cls, recipes):
+        # Build an arena from any iterable of RecipeNodes, e.g. Parser.parse_many, so that the object
+        # trees only exist one recipe at a time
+        arena = cls()
+        arena.extend(recipes)
+        arena.release_indexes()
+        return arena
+
+    def append(self, node):
+        row = self._add(node)
+        self.roots.append(row)
+        return row
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.append(node)
+
+    def _add(self, node):
+        # Rows are numbered in pre-order: the children of a node take the rows after it, each followed by
+        # its own subtree, and their row numbers are stored as one contiguous range once the last of them is
+        # done. Unfinished nodes are kept on an explicit stack, so trees of any depth can be added
+        if node is None:
+            return NO_NODE
+        root, child_nodes = self._add_row(node)
+        if child_nodes is None:
+            return root
+
+        # (row, iterator over the child nodes still to add, rows of the children added so far)
+        stack = [(root, iter(child_nodes), [])]
+        while stack:
+            row, pending, child_rows = stack[-1]
+            for child in pending:
+                if child is None:
+                    child_rows.append(NO_NODE)
+                    continue
+                child_row, child_nodes = self._add_row(child)
+                child_rows.append(child_row)
+                if child_nodes is not None:
+                    stack.append((child_row, iter(child_nodes), []))
+                    break
+            else:
+                stack.pop()
+                self.child_start[row] = len(self.children)
+                self.child_count[row] = len(child_rows)
+                self.children.extend(child_rows)
+        return root
+
+    def _add_row(self, node):
+        # Append the row of a node and return its row number with its child nodes, or None for a leaf
+        node_class = type(node)
+        row = len(self.kinds)
+        self.kinds.append(KINDS[node_class])
+        self.child_start.append(0)
+        self.child_count.append(0)
+
+        if node_class in LEAF_FIELDS:
+            value = getattr(node, LEAF_FIELDS[node_class])
+            self.aux.append(self._number(value) if node_class is NumberNode else self._string(value))
+            return row, None
+
+        child_nodes = [getattr(node, field) for field in CHILD_FIELDS[node_class]]
+        if node_class is RecipeNode:
+            child_nodes += node.ingredients + node.steps
+            self.aux.append(len(node.ingredients))
+        else:
+            self.aux.append(0)
+        return row, child_nodes
+
+    def _number(self, value):
+        if self._number_index is None:
+            self._number_index = {number: index for index, number in enumerate(self.numbers)}
+        index = self._number_index.get(value)
+        if index is None:
+            index = self._number_index[value] = len(self.numbers)
+            self.numbers.append(value)
+        return index
+
+    def _string(self, value):
+        if self._string_index is None:
+            self._string_index = {string: index for index, string in enumerate(self.strings)}
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def release_indexes(self):
+        # Drop the deduplication maps, which take about as much memory as the columns themselves
+        self._number_index = None
+        self._string_index = None
+
+    def __len__(self):
+        return len(self.roots)
+
+    def __getitem__(self, index):
+        return self.node(self.roots[index])
+
+    def __iter__(self):
+        for row in self.roots:
+            yield self.node(row)
+
+    def node(self, row):
+        # A view of the row that behaves like the node class it was built from
+        if row == NO_NODE:
+            return None
+        return VIEW_CLASSES[self.kinds[row]](self, row)
+
+    def child(self, row, position):
+        return self.node(self.children[self.child_start[row] + position])
+
+    def build(self, row):
+        # Materialize the row and its subtree as regular node objects, keeping the unfinished nodes on an
+        # explicit stack like _add
+        if row == NO_NODE:
+            return None
+        kinds = self.kinds
+        if kinds[row] in LEAF_KINDS:
+            return self._build_leaf(row)
+
+        child_start = self.child_start
+        child_count = self.child_count
+        children = self.children
+        # (row, iterator over the child rows still to build, the children built so far)
+        stack = [(row, iter(children[child_start[row]:child_start[row] + child_count[row]]), [])]
+        while stack:
+            row, pending, child_nodes = stack[-1]
+            for child in pending:
+                if child == NO_NODE:
+                    child_nodes.append(None)
+                elif kinds[child] in LEAF_KINDS:
+                    child_nodes.append(self._build_leaf(child))
+                else:
+                    start = child_start[child]
+                    stack.append((child, iter(children[start:start + child_count[child]]), []))
+                    break
+            else:
+                stack.pop()
+                node = self._build_inner(row, child_nodes)
+                if stack:
+                    stack[-1][2].append(node)
+        return node
+
+    def _build_leaf(self, row):
+        node_class = NODE_CLASSES[self.kinds[row]]
+        aux = self.aux[row]
+        return node_class(self.numbers[aux] if node_class is NumberNode else self.strings[aux])
+
+    def _build_inner(self, row, child_nodes):
+        node_class = NODE_CLASSES[self.kinds[row]]
+        if node_class is RecipeNode:
+            node = RecipeNode()
+            node.title, node.yield_node, node.time_node, node.temperature = child_nodes[:4]
+            ingredients_end = 4 + self.aux[row]
+            node.ingredients = child_nodes[4:ingredients_end]
+            node.steps = child_nodes[ingredients_end:]
+            return node
+        return node_class(*child_nodes)
+
+    def build_all(self):
+        # Materialize every recipe. Children always take higher rows than their parent, so walking the
+        # rows backwards builds each node after its children, without recursion
+        nodes = [None] * len(self.kinds)
+        kinds = self.kinds.tolist()
+        child_start = self.child_start.tolist()
+        child_count = self.child_count.tolist()
+        aux = self.aux.tolist()
+        children = self.children.tolist()
+        numbers = self.numbers
+        strings = self.strings
+        leaves = {KINDS[node_class]: node_class for node_class in LEAF_FIELDS}
+        recipe_kind = KINDS[RecipeNode]
+        fixed = len(CHILD_FIELDS[RecipeNode])
+
+        for row in range(len(nodes) - 1, -1, -1):
+            kind = kinds[row]
+            node_class = leaves.get(kind)
+            if node_class is not None:
+                value = numbers[aux[row]] if node_class is NumberNode else strings[aux[row]]
+                nodes[row] = node_class(value)
+                continue
+
+            start = child_start[row]
+            child_nodes = [nodes[child] if child != NO_NODE else None
+                           for child in children[start:start + child_count[row]]]
+            if kind == recipe_kind:
+                node = RecipeNode()
+                node.title, node.yield_node, node.time_node, node.temperature = child_nodes[:fixed]
+                ingredients_end = fixed + aux[row]
+                node.ingredients = child_nodes[fixed:ingredients_end]
+                node.steps = child_nodes[ingredients_end:]
+                nodes[row] = node
+            else:
+                nodes[row] = NODE_CLASSES[kind](*child_nodes)
+
+        return [nodes[row] for row in self.roots]
+
+    def to_bytes(self):
+        encoded = [string.encode('utf-8') for string in self.strings]
+        lengths = array('I', map(len, encoded))
+        columns = (self.kinds, self.child_start, self.child_count, self.aux, self.children, self.numbers,
+                   self.roots, lengths)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self.kinds), len(self.children), len(self.numbers),
+                             len(self.strings), len(self.roots), self.aux.itemsize, self.numbers.itemsize)
+        return b''.join([header, *map(_little_endian, columns), *encoded])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Truncated AST arena data")
+        (magic, version, _, rows, children, numbers, strings, roots, index_size,
+         number_size) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported AST arena data (format {version})")
+
+        arena = cls()
+        if (arena.aux.itemsize, arena.numbers.itemsize) != (index_size, number_size):
+            raise ValueError("AST arena data was written with different column sizes")
+
+        position = HEADER.size
+        lengths = array('I')
+        for column, count in ((arena.kinds, rows), (arena.child_start, rows), (arena.child_count, rows),
+                              (arena.aux, rows), (arena.children, children), (arena.numbers, numbers),
+                              (arena.roots, roots), (lengths, strings)):
+            end = position + count * column.itemsize
+            column.frombytes(data[position:end])
+            position = end
+            if sys.byteorder == 'big':
+                column.byteswap()
+
+        for length in lengths:
+            arena.strings.append(data[position:position + length].decode('utf-8'))
+            position += length
+        if position != len(data):
+            raise ValueError("Truncated AST arena data")
+        return arena
+
+    def nbytes(self):
+        # Size of the typed columns; the distinct strings are not included
+        columns = (self.kinds, self.child_start, self.child_count, self.aux, self.children, self.numbers,
+                   self.roots)
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+def _little_endian(column):
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _child_property(position):
+    return property(lambda view: view.arena.child(view.row, position))
+
+
+def _leaf_property(is_number):
+    if is_number:
+        return property(lambda view: view.arena.numbers[view.arena.aux[view.row]])
+    return property(lambda view: view.arena.strings[view.arena.aux[view.row]])
+
+
+def _recipe_list_property(ingredients):
+    def rows(view):
+        arena = view.arena
+        start = arena.child_start[view.row] + len(CHILD_FIELDS[RecipeNode])
+        end = arena.child_start[view.row] + arena.child_count[view.row]
+        split = start + arena.aux[view.row]
+        return arena.children[start:split] if ingredients else arena.children[split:end]
+
+    return property(lambda view: [view.arena.node(row) for row in rows(view)])
+
+
+def _view_class(node_class):
+    # A subclass of the node class whose fields are read from the arena, so isinstance checks,
+    # __str__ and the visualizer work on views unchanged. It keeps the class name, which __str__ prints
+    namespace = {'__slots__': ('arena', 'row')}
+    if node_class in LEAF_FIELDS:
+        namespace[LEAF_FIELDS[node_class]] = _leaf_property(node_class is NumberNode)
+    else:
+        for position, field in enumerate(CHILD_FIELDS[node_class]):
+            namespace[field] = _child_property(position)
+    if node_class is RecipeNode:
+        namespace['ingredients'] = _recipe_list_property(True)
+        namespace['steps'] = _recipe_list_property(False)
+
+    view_class = type(node_class.__name__, (node_class,), namespace)
+    view_class.__init__ = _init_view
+    return view_class
+
+
+def _init_view(view, arena, row):
+    view.arena = arena
+    view.row = row
+
+
+VIEW_CLASSES = tuple(_view_class(node_class) for node_class in NODE_CLASSES)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import tempfile
+import time
+
+from Lab6.src.ASTArena import ASTArena, FORMAT_VERSION
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+
+SUFFIX = '.ast'
+
+
+class ASTCache:
+    # On-disk cache of parsed recipes in front of Lexer.tokenize and Parser.parse. Entries are serialized
+    # ASTArenas named after a hash of the source and of everything that decides how it is parsed; the
+    # least recently used entries are deleted once the directory grows past max_bytes
+    def __init__(self, directory, max_bytes=256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lexer = Lexer()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+        # Entries found on disk, as path -> (last use, size); the last use is the file's mtime
+        self._entries = {}
+        for name in os.listdir(directory):
+            if name.endswith(SUFFIX):
+                stat = os.stat(os.path.join(directory, name))
+                self._entries[os.path.join(directory, name)] = (stat.st_mtime_ns, stat.st_size)
+        self._size = sum(size for _, size in self._entries.values())
+        self._clock = max((used for used, _ in self._entries.values()), default=0)
+
+        # Any change to the tokens, the grammar or the storage format gives new keys, so stale entries
+        # are never read and simply age out
+        grammar = repr([(str(token_type), pattern) for token_type, pattern in self.lexer.token_patterns])
+        self._salt = f'{Parser.GRAMMAR_VERSION}:{FORMAT_VERSION}:{grammar}\n'.encode('utf-8')
+
+    def key(self, source, kind):
+        digest = hashlib.sha256(self._salt)
+        digest.update(kind.encode('ascii'))
+        digest.update(source.encode('utf-8') if isinstance(source, str) else source)
+        return digest.hexdigest()
+
+    def parse(self, source):
+        # Same result as Parser(Lexer().tokenize(source)).parse()
+        arena = self._load(source, 'recipe')
+        if arena is None:
+            recipe = Parser(self.lexer.tokenize(source)).parse()
+            arena = ASTArena()
+            arena.append(recipe)
+            self._store(source, 'recipe', arena)
+            return recipe
+        return arena.build(arena.roots[0])
+
+    def parse_file(self, path):
+        # Every recipe of a file, as Parser.parse_many would return them
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        arena = self._load(data, 'file')
+        if arena is None:
+            recipes = list(Parser.parse_many(self.lexer.iter_tokens(data.decode('utf-8'))))
+            arena = ASTArena.from_recipes(recipes)
+            self._store(data, 'file', arena)
+            return recipes
+        return arena.build_all()
+
+    def _path(self, source, kind):
+        return os.path.join(self.directory, self.key(source, kind) + SUFFIX)
+
+    def _load(self, source, kind):
+        path = self._path(source, kind)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            arena = ASTArena.from_bytes(data)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except ValueError:
+            # A damaged or foreign file; parse again and let _store replace it
+            self.misses += 1
+            return None
+
+        if path not in self._entries:
+            # Written by another cache instance sharing the directory
+            self._size += len(data)
+        self._entries[path] = (self._touch(path), len(data))
+        self.hits += 1
+        return arena
+
+    def _touch(self, path):
+        # Mark the entry as used now. File timestamps can be too coarse to order quick successive uses,
+        # so the stamps are kept strictly increasing
+        self._clock = max(time.time_ns(), self._clock + 1)
+        os.utime(path, ns=(self._clock, self._clock))
+        return self._clock
+
+    def _store(self, source, kind, arena):
+        path = self._path(source, kind)
+        data = arena.to_bytes()
+
+        # Write to a temporary file and rename it, so that readers never see a partial entry
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+        self._size -= self._entries.get(path, (0, 0))[1]
+        self._entries[path] = (self._touch(path), len(data))
+        self._size += len(data)
+        self._evict(keep=path)
+
+    def _evict(self, keep):
+        if self._size <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(self._entries.items(), key=lambda entry: entry[1][0]):
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            del self._entries[path]
+            self._size -= size
+            if self._size <= self.max_bytes:
+                return
+
+    def clear(self):
+        for path in list(self._entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._entries.clear()
+        self._size = 0
@@ -0,0 +1,79 @@
+def iter_child_nodes(node):
+    # The child nodes of a node in the order of its _fields, skipping missing optional children
+    for field in node._fields:
+        value = getattr(node, field)
+        if value is None:
+            continue
+        if isinstance(value, list):
+            for item in value:
+                if item is not None:
+                    yield item
+        else:
+            yield value
+
+
+class Dispatcher:
+    # The handler lookup shared by passes over the AST: handler(node_class) is the visit_<ClassName> method
+    # of the class or of its closest base class that has one. It is looked up once per node class and cached
+    # on the pass's class, so dispatch is one dict lookup. Passes that drive their own loop and give their
+    # handlers their own signature, such as the tree writer and the DOT exporter, derive from this alone
+    _handlers = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every pass class gets its own cache
+        cls._handlers = {}
+
+    @classmethod
+    def handler(cls, node_class):
+        # The visit_ function for instances of node_class, or None when the pass has none
+        try:
+            return cls._handlers[node_class]
+        except KeyError:
+            pass
+
+        handler = None
+        for base in node_class.__mro__:
+            handler = getattr(cls, 'visit_' + base.__name__, None)
+            if handler is not None:
+                break
+        cls._handlers[node_class] = handler
+        return handler
+
+
+class ASTVisitor(Dispatcher):
+    # Base class for passes over the AST, in the manner of ast.NodeVisitor: visit(node) calls the
+    # visit_<ClassName> method of the node's class or of its closest base class that has one, found through
+    # the Dispatcher cache. Handlers take the node alone.
+    #
+    # visit() is recursive: a handler descends by calling visit() or generic_visit() itself, and prunes by
+    # not doing so. walk() uses an explicit stack instead: a handler returns the children to visit next,
+    # or None to prune, and nodes without a handler have all their children visited
+
+    def visit(self, node):
+        handler = self._handlers.get(node.__class__) or self.handler(node.__class__)
+        if handler is None:
+            return self.generic_visit(node)
+        return handler(self, node)
+
+    def generic_visit(self, node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+    def walk(self, node):
+        # Visit node and its subtree in pre-order without recursion
+        stack = [node]
+        handlers = self._handlers
+        while stack:
+            node = stack.pop()
+            node_class = node.__class__
+            handler = handlers.get(node_class) or self.handler(node_class)
+            if handler is None:
+                children = list(iter_child_nodes(node))
+            else:
+                children = handler(self, node)
+                if children is None:
+                    continue
+                children = list(children)
+            children.reverse()
+            stack.extend(children)
@@ -1,21 +1,13 @@
-import graphviz
+from Lab6.src.ASTVisitor import ASTVisitor
 
-from Lab6.src.IdentifierNode import IdentifierNode
-from Lab6.src.IngredientNode import IngredientNode
-from Lab6.src.NumberNode import NumberNode
-from Lab6.src.RecipeNode import RecipeNode
-from Lab6.src.StepNode import StepNode
-from Lab6.src.StringNode import StringNode
-from Lab6.src.TemperatureNode import TemperatureNode
-from Lab6.src.TimeNode import TimeNode
-from Lab6.src.TitleNode import TitleNode
-from Lab6.src.UnitNode import UnitNode
-from Lab6.src.YieldNode import YieldNode
 
-
-class ASTVisualizer:
+class ASTVisualizer(ASTVisitor):
 
     def __init__(self):
+        # Imported here so that importing the module does not need graphviz; DotExporter writes the same
+        # graph without it
+        import graphviz
+
         self.dot = graphviz.Digraph(comment='Recipe AST')
         self.node_count = 0
 
@@ -30,100 +22,126 @@ class ASTVisualizer:
     def _add_node(self, node, parent_id=None):
         if node is None:
             return None
+        return self.visit(node)
+
+    # Each visit_ method adds its node and subtree to the graph and returns the node's id
 
+    def visit_RecipeNode(self, node):
         node_id = self.get_node_id()
+        self.dot.node(node_id, 'RECIPE')
 
-        if isinstance(node, RecipeNode):
-            self.dot.node(node_id, 'RECIPE')
-
-            if node.title:
-                title_id = self._add_node(node.title, node_id)
-                self.dot.edge(node_id, title_id, label='title')
-
-            if node.yield_node:
-                yield_id = self._add_node(node.yield_node, node_id)
-                self.dot.edge(node_id, yield_id, label='yield')
-
-            if node.time_node:
-                time_id = self._add_node(node.time_node, node_id)
-                self.dot.edge(node_id, time_id, label='time')
-
-            if node.ingredients:
-                ingredients_id = self.get_node_id()
-                self.dot.node(ingredients_id, 'INGREDIENTS_LIST')
-                self.dot.edge(node_id, ingredients_id, label='ingredients')
-
-                for ingredient in node.ingredients:
-                    ing_id = self._add_node(ingredient, ingredients_id)
-                    self.dot.edge(ingredients_id, ing_id)
-
-            if node.steps:
-                steps_id = self.get_node_id()
-                self.dot.node(steps_id, 'STEPS_LIST')
-                self.dot.edge(node_id, steps_id, label='steps')
-
-                for step in node.steps:
-                    step_id = self._add_node(step, steps_id)
-                    self.dot.edge(steps_id, step_id)
-
-            if node.temperature:
-                temp_id = self._add_node(node.temperature, node_id)
-                self.dot.edge(node_id, temp_id, label='temperature')
-
-        elif isinstance(node, TitleNode):
-            self.dot.node(node_id, 'TITLE')
-            title_value_id = self._add_node(node.title, node_id)
-            self.dot.edge(node_id, title_value_id, label='value')
-
-        elif isinstance(node, YieldNode):
-            self.dot.node(node_id, 'YIELD')
-            servings_id = self._add_node(node.servings, node_id)
-            self.dot.edge(node_id, servings_id, label='servings')
-
-        elif isinstance(node, TimeNode):
-            self.dot.node(node_id, 'TIME')
-            duration_id = self._add_node(node.duration, node_id)
-            self.dot.edge(node_id, duration_id, label='duration')
-            unit_id = self._add_node(node.unit, node_id)
-            self.dot.edge(node_id, unit_id, label='unit')
+        if node.title:
+            title_id = self.visit(node.title)
+            self.dot.edge(node_id, title_id, label='title')
+
+        if node.yield_node:
+            yield_id = self.visit(node.yield_node)
+            self.dot.edge(node_id, yield_id, label='yield')
+
+        if node.time_node:
+            time_id = self.visit(node.time_node)
+            self.dot.edge(node_id, time_id, label='time')
+
+        if node.ingredients:
+            ingredients_id = self.get_node_id()
+            self.dot.node(ingredients_id, 'INGREDIENTS_LIST')
+            self.dot.edge(node_id, ingredients_id, label='ingredients')
+
+            for ingredient in node.ingredients:
+                ing_id = self.visit(ingredient)
+                self.dot.edge(ingredients_id, ing_id)
+
+        if node.steps:
+            steps_id = self.get_node_id()
+            self.dot.node(steps_id, 'STEPS_LIST')
+            self.dot.edge(node_id, steps_id, label='steps')
 
-        elif isinstance(node, IngredientNode):
-            self.dot.node(node_id, 'INGREDIENT')
-            quantity_id = self._add_node(node.quantity, node_id)
-            self.dot.edge(node_id, quantity_id, label='quantity')
+            for step in node.steps:
+                step_id = self.visit(step)
+                self.dot.edge(steps_id, step_id)
 
-            if node.unit:
-                unit_id = self._add_node(node.unit, node_id)
-                self.dot.edge(node_id, unit_id, label='unit')
+        if node.temperature:
+            temp_id = self.visit(node.temperature)
+            self.dot.edge(node_id, temp_id, label='temperature')
 
-            name_id = self._add_node(node.name, node_id)
-            self.dot.edge(node_id, name_id, label='name')
+        return node_id
 
-        elif isinstance(node, StepNode):
-            self.dot.node(node_id, 'STEP')
-            instruction_id = self._add_node(node.instruction, node_id)
-            self.dot.edge(node_id, instruction_id, label='instruction')
+    def visit_TitleNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'TITLE')
+        title_value_id = self.visit(node.title)
+        self.dot.edge(node_id, title_value_id, label='value')
+        return node_id
+
+    def visit_YieldNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'YIELD')
+        servings_id = self.visit(node.servings)
+        self.dot.edge(node_id, servings_id, label='servings')
+        return node_id
+
+    def visit_TimeNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'TIME')
+        duration_id = self.visit(node.duration)
+        self.dot.edge(node_id, duration_id, label='duration')
+        unit_id = self.visit(node.unit)
+        self.dot.edge(node_id, unit_id, label='unit')
+        return node_id
 
-        elif isinstance(node, TemperatureNode):
-            self.dot.node(node_id, 'TEMPERATURE')
-            value_id = self._add_node(node.value, node_id)
-            self.dot.edge(node_id, value_id, label='value')
-            unit_id = self._add_node(node.unit, node_id)
+    def visit_IngredientNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'INGREDIENT')
+        quantity_id = self.visit(node.quantity)
+        self.dot.edge(node_id, quantity_id, label='quantity')
+
+        if node.unit:
+            unit_id = self.visit(node.unit)
             self.dot.edge(node_id, unit_id, label='unit')
 
-        elif isinstance(node, NumberNode):
-            self.dot.node(node_id, f'NUMBER: {node.value}')
+        name_id = self.visit(node.name)
+        self.dot.edge(node_id, name_id, label='name')
+        return node_id
 
-        elif isinstance(node, StringNode):
-            display_value = node.value
-            if len(display_value) > 20:
-                display_value = display_value[:17] + "..."
-            self.dot.node(node_id, f'STRING: "{display_value}"')
+    def visit_StepNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'STEP')
+        instruction_id = self.visit(node.instruction)
+        self.dot.edge(node_id, instruction_id, label='instruction')
+        return node_id
 
-        elif isinstance(node, UnitNode):
-            self.dot.node(node_id, f'UNIT: {node.value}')
+    def visit_TemperatureNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, 'TEMPERATURE')
+        value_id = self.visit(node.value)
+        self.dot.edge(node_id, value_id, label='value')
+        unit_id = self.visit(node.unit)
+        self.dot.edge(node_id, unit_id, label='unit')
+        return node_id
 
-        elif isinstance(node, IdentifierNode):
-            self.dot.node(node_id, f'ID: {node.name}')
+    def visit_NumberNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, f'NUMBER: {node.value}')
+        return node_id
 
+    def visit_StringNode(self, node):
+        node_id = self.get_node_id()
+        display_value = node.value
+        if len(display_value) > 20:
+            display_value = display_value[:17] + "..."
+        self.dot.node(node_id, f'STRING: "{display_value}"')
+        return node_id
+
+    def visit_UnitNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, f'UNIT: {node.value}')
         return node_id
+
+    def visit_IdentifierNode(self, node):
+        node_id = self.get_node_id()
+        self.dot.node(node_id, f'ID: {node.name}')
+        return node_id
+
+    def generic_visit(self, node):
+        # Nodes the graph has no shape for only take an id, as before
+        return self.get_node_id()
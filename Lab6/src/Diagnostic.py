@@ -0,0 +1,10 @@
+class Diagnostic:
+    __slots__ = ('message', 'position')
+
+    def __init__(self, message, position):
+        self.message = message
+        # Index of the offending token in the parsed token sequence
+        self.position = position
+
+    def __repr__(self):
+        return f"Diagnostic({self.position}, '{self.message}')"
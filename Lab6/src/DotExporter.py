@@ -0,0 +1,167 @@
+import os
+
+from Lab6.src.AST import ASTNode
+from Lab6.src.ASTVisitor import Dispatcher
+
+# Lines are collected and written in one call once this many are pending
+BUFFER_LINES = 4096
+
+
+class ListNode:
+    # The INGREDIENTS_LIST and STEPS_LIST nodes of the graph, which have no AST node of their own
+    __slots__ = ('label', 'items', 'noun')
+
+    def __init__(self, label, items, noun):
+        self.label = label
+        self.items = items
+        self.noun = noun
+
+
+def escape(label):
+    return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class DotExporter(Dispatcher):
+    # Writes the same graph as ASTVisualizer as DOT text straight to a file, walking the trees with an
+    # explicit stack. Lists longer than collapse_threshold show their first collapse_threshold items and
+    # a summary node, and at most max_nodes nodes are written
+    def __init__(self, collapse_threshold=None, max_nodes=None):
+        self.collapse_threshold = collapse_threshold
+        self.max_nodes = max_nodes
+        self.node_count = 0
+        self.truncated = False
+
+    # Each visit_ method returns the label of a node and its (edge label, child) pairs in output order
+
+    def visit_RecipeNode(self, node):
+        children = []
+        if node.title:
+            children.append(('title', node.title))
+        if node.yield_node:
+            children.append(('yield', node.yield_node))
+        if node.time_node:
+            children.append(('time', node.time_node))
+        if node.ingredients:
+            children.append(('ingredients', ListNode('INGREDIENTS_LIST', node.ingredients, 'ingredients')))
+        if node.steps:
+            children.append(('steps', ListNode('STEPS_LIST', node.steps, 'steps')))
+        if node.temperature:
+            children.append(('temperature', node.temperature))
+        return 'RECIPE', children
+
+    def visit_ListNode(self, node):
+        items = node.items
+        threshold = self.collapse_threshold
+        if threshold is not None and len(items) > threshold:
+            hidden = f'... {len(items) - threshold} more {node.noun}'
+            return node.label, [(None, item) for item in items[:threshold]] + [(None, hidden)]
+        return node.label, [(None, item) for item in items]
+
+    def visit_TitleNode(self, node):
+        return 'TITLE', [('value', node.title)]
+
+    def visit_YieldNode(self, node):
+        return 'YIELD', [('servings', node.servings)]
+
+    def visit_TimeNode(self, node):
+        return 'TIME', [('duration', node.duration), ('unit', node.unit)]
+
+    def visit_IngredientNode(self, node):
+        children = [('quantity', node.quantity)]
+        if node.unit:
+            children.append(('unit', node.unit))
+        children.append(('name', node.name))
+        return 'INGREDIENT', children
+
+    def visit_StepNode(self, node):
+        return 'STEP', [('instruction', node.instruction)]
+
+    def visit_TemperatureNode(self, node):
+        return 'TEMPERATURE', [('value', node.value), ('unit', node.unit)]
+
+    def visit_NumberNode(self, node):
+        return f'NUMBER: {node.value}', []
+
+    def visit_StringNode(self, node):
+        display_value = node.value
+        if len(display_value) > 20:
+            display_value = display_value[:17] + "..."
+        return f'STRING: "{display_value}"', []
+
+    def visit_UnitNode(self, node):
+        return f'UNIT: {node.value}', []
+
+    def visit_IdentifierNode(self, node):
+        return f'ID: {node.name}', []
+
+    def visit_str(self, node):
+        # A summary of collapsed list items
+        return node, []
+
+    def visit_ASTNode(self, node):
+        return type(node).__name__, []
+
+    def export(self, nodes, out):
+        # Write one recipe, or every recipe of an iterable, as a single DOT graph and return the number
+        # of nodes written
+        if isinstance(nodes, ASTNode):
+            nodes = [nodes]
+
+        self.node_count = 0
+        self.truncated = False
+        pending = ['// Recipe AST\n', 'digraph {\n']
+        handlers = self._handlers
+
+        for root in nodes:
+            stack = [(None, None, root)]
+            while stack:
+                parent_id, edge_label, node = stack.pop()
+                if node is None:
+                    continue
+
+                if self.max_nodes is not None and self.node_count >= self.max_nodes:
+                    self.truncated = True
+                    pending.append('\ttruncated [label="... truncated" shape=plaintext]\n')
+                    if parent_id is not None:
+                        pending.append(f'\t{parent_id} -> truncated [style=dashed]\n')
+                    break
+
+                self.node_count += 1
+                node_id = f'node{self.node_count}'
+                label, children = (handlers.get(node.__class__) or self.handler(node.__class__))(self, node)
+                pending.append(f'\t{node_id} [label="{escape(label)}"]\n')
+                if parent_id is not None:
+                    if edge_label is None:
+                        pending.append(f'\t{parent_id} -> {node_id}\n')
+                    else:
+                        pending.append(f'\t{parent_id} -> {node_id} [label="{edge_label}"]\n')
+
+                stack.extend((node_id, child_label, child) for child_label, child in reversed(children))
+
+                if len(pending) >= BUFFER_LINES:
+                    out.write(''.join(pending))
+                    pending.clear()
+
+            if self.truncated:
+                break
+
+        pending.append('}\n')
+        out.write(''.join(pending))
+        return self.node_count
+
+    def write(self, nodes, path):
+        # Parent directories are created as needed, as Digraph.render does
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            return self.export(nodes, file)
+
+    def render(self, nodes, path, format='png', cleanup=False):
+        # Like graphviz.Digraph.render: write the DOT text to path and render it to path.format with the
+        # Graphviz binaries. Only this needs the graphviz package. Returns the rendered file's path
+        import graphviz
+
+        self.write(nodes, path)
+        rendered = graphviz.render('dot', format, path)
+        if cleanup:
+            os.remove(path)
+        return rendered
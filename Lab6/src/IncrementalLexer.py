@@ -0,0 +1,81 @@
+from bisect import bisect_right
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Token import Token
+from Lab6.src.TokenType import TokenType
+
+
+class IncrementalLexer:
+    # Keeps a document together with its tokens and their (start, end) offsets. After an edit only the
+    # tokens around it are lexed again, until the new tokens line up with the old ones
+    def __init__(self, text=''):
+        self.lexer = Lexer()
+        self.text = ''
+        self.tokens = [Token(TokenType.EOF, '')]
+        self.starts = [0]
+        self.ends = [0]
+        # Indexes of the tokens replaced by the last call to tokenize or edit
+        self.changed = range(0)
+        self.tokenize(text)
+
+    def tokenize(self, text):
+        self.text = ''
+        self.tokens = [Token(TokenType.EOF, '')]
+        self.starts = [0]
+        self.ends = [0]
+        return self.edit(0, 0, text)
+
+    def edit(self, offset, deleted, inserted):
+        # Replace deleted characters at offset with inserted and return the updated token list
+        if not 0 <= offset <= offset + deleted <= len(self.text):
+            raise ValueError(f"Edit at {offset} deleting {deleted} characters is outside the document")
+
+        text = self.text[:offset] + inserted + self.text[offset + deleted:]
+        delta = len(inserted) - deleted
+        edit_end = offset + len(inserted)
+        eof = len(self.tokens) - 1
+
+        # A token is only safe if the lexer never looked at the edited text while matching it, and a
+        # match never looks further than LOOKAHEAD characters past its end
+        first = bisect_right(self.ends, offset - Lexer.LOOKAHEAD, 0, eof)
+        position = self.ends[first - 1] if first else 0
+
+        tokens = []
+        starts = []
+        ends = []
+        old = first
+        match = self.lexer.master_pattern.match
+        types = TokenType.__members__
+
+        while position < len(text):
+            token_match = match(text, position)
+            if token_match is None:
+                raise ValueError(f"Unrecognized token at position {position}: '{text[position:position + 10]}'")
+
+            kind = token_match.lastgroup
+            if kind != 'SKIP':
+                if position >= edit_end:
+                    # Past the edit the lexer sees the same text as before, so once a new token starts
+                    # where a shifted old token started, every following token is unchanged
+                    while old < eof and self.starts[old] + delta < position:
+                        old += 1
+                    if old < eof and self.starts[old] + delta == position:
+                        break
+
+                if kind == 'ID':
+                    tokens.append(Token(*self.lexer.classify_word(token_match.group())))
+                else:
+                    tokens.append(Token(types[kind], token_match.group()))
+                starts.append(position)
+                ends.append(token_match.end())
+
+            position = token_match.end()
+        else:
+            old = eof
+
+        self.starts[first:] = starts + [start + delta for start in self.starts[old:]]
+        self.ends[first:] = ends + [end + delta for end in self.ends[old:]]
+        self.tokens[first:old] = tokens
+        self.text = text
+        self.changed = range(first, first + len(tokens))
+        return self.tokens
@@ -1,10 +1,21 @@
+import mmap
 import re
+import sys
 
+from Lab6.src.MappedTokens import MappedTokens
 from Lab6.src.Token import Token
 from Lab6.src.TokenType import TokenType
 
 
 class Lexer:
+    # Number of characters a match must stay clear of the end of a chunk before it can be trusted;
+    # no pattern looks more than a few characters past the end of its match
+    LOOKAHEAD = 16
+    # An opening quote whose string has not been closed yet by the end of the buffer
+    OPEN_STRING = re.compile(r'"[^"]*\Z')
+    # A pattern that is only a list of alternative words, such as RECIPE or (g|ml|tsp|tbsp|cup)
+    WORD_LIST = re.compile(r'\(?([A-Za-z]+(?:\|[A-Za-z]+)*)\)?')
+
     def __init__(self):
         self.tokens = []
         self.token_patterns = [
@@ -28,30 +39,156 @@ class Lexer:
             (TokenType.RBRACE, r'}'),
             (None, r'[ \t\n]+')  # Whitespace is ignored
         ]
+        # Keywords and units are not matched by their own patterns: every word is scanned once as an ID
+        # and classified through this table, keyed by the lower-cased word like re.IGNORECASE would
+        self.word_types = {}
+        for token_type, pattern in self.token_patterns:
+            word_list = self.WORD_LIST.fullmatch(pattern)
+            if word_list:
+                for word in word_list.group(1).split('|'):
+                    self.word_types.setdefault(word.lower(), token_type)
+        # Classified keywords and units by their exact spelling, holding one interned value per spelling
+        self.words = {}
+        # Type codes of the keywords and units by their lower-cased bytes, for tokenize_file; other words
+        # are IDs and are not kept
+        self.word_codes = {word.encode('ascii'): token_type.value for word, token_type in self.word_types.items()}
+
+        self.master_pattern = self.compile_patterns([(token_type, pattern)
+                                                     for token_type, pattern in self.token_patterns
+                                                     if not self.WORD_LIST.fullmatch(pattern)])
+        # Byte-level twin of the master pattern for memory-mapped files; the trailing ERROR group makes
+        # finditer stop at unrecognized input instead of silently skipping it
+        self.byte_pattern = re.compile(self.master_pattern.pattern.encode('utf-8') + rb'|(?P<ERROR>.)',
+                                       re.IGNORECASE | re.DOTALL)
+
+    @staticmethod
+    def compile_patterns(token_patterns):
+        # Join every pattern into one alternation of named groups; the regex engine tries the
+        # alternatives left to right, so the priority order of the list is preserved
+        groups = []
+        for token_type, pattern in token_patterns:
+            name = token_type.name if token_type is not None else 'SKIP'
+            groups.append(f'(?P<{name}>{pattern})')
+        return re.compile('|'.join(groups), re.IGNORECASE)
+
+    def classify_word(self, word):
+        # Return the token type of a word scanned as an ID and the interned string to use as its value
+        entry = self.words.get(word)
+        if entry is None:
+            word = sys.intern(word)
+            entry = (self.word_types.get(word.lower(), TokenType.ID), word)
+            if entry[0] is not TokenType.ID:
+                self.words[word] = entry
+        return entry
 
     def tokenize(self, text):
-        self.tokens = []
-        position = 0
+        self.tokens = list(self._scan(text, 0, final=True))
+        self.tokens.append(Token(TokenType.EOF, ''))
+        return self.tokens
 
-        while position < len(text):
-            match_found = False
+    def tokenize_file(self, path):
+        # Lex a file through mmap into compact (type, start, end) columns without creating a Token or a
+        # substring per token; close the result (or use it as a context manager) to release the mapping
+        with open(path, 'rb') as file:
+            size = file.seek(0, 2)
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
 
-            for token_type, pattern in self.token_patterns:
-                regex = re.compile(f'^{pattern}', re.IGNORECASE)
-                match = regex.match(text[position:])
+        tokens = MappedTokens(buffer, 'I' if size < 2 ** 32 else 'Q')
+        append_type = tokens.types.append
+        append_start = tokens.starts.append
+        append_end = tokens.ends.append
 
-                if match:
-                    value = match.group(0)
+        # Token type code for every group number of the byte pattern, 0 for whitespace
+        codes = [0] * (self.byte_pattern.groups + 1)
+        for name, group in self.byte_pattern.groupindex.items():
+            codes[group] = TokenType[name].value if name in TokenType.__members__ else 0
+        error_group = self.byte_pattern.groupindex['ERROR']
+        id_group = self.byte_pattern.groupindex['ID']
+        id_code = TokenType.ID.value
+        word_codes = self.word_codes
 
-                    if token_type is not None:  # Skip whitespace
-                        self.tokens.append(Token(token_type, value))
+        error_offset = None
+        for match in self.byte_pattern.finditer(buffer):
+            group = match.lastindex
+            code = codes[group]
+            if group == id_group:
+                code = word_codes.get(match.group().lower(), id_code)
+            if code:
+                append_type(code)
+                append_start(match.start())
+                append_end(match.end())
+            elif group == error_group:
+                error_offset = match.start()
+                break
 
-                    position += len(value)
-                    match_found = True
-                    break
+        if error_offset is not None:
+            # Drop the last match first, it keeps the mapping exported and would prevent closing it
+            match = None
+            snippet = buffer[error_offset:error_offset + 10].decode('utf-8', errors='replace')
+            tokens.close()
+            raise ValueError(f"Unrecognized token at byte offset {error_offset} of {path}: '{snippet}'")
 
-            if not match_found:
-                raise ValueError(f"Unrecognized token at position {position}: '{text[position:position + 10]}'")
+        tokens.append(TokenType.EOF, size, size)
+        return tokens
 
-        self.tokens.append(Token(TokenType.EOF, ''))
-        return self.tokens
\ No newline at end of file
+    def iter_tokens(self, source, chunk_size=65536):
+        # Lazily tokenize a string, a text file object or an iterable of string chunks, keeping only
+        # the unfinished tail of the input in memory
+        buffer = ''
+        offset = 0
+
+        for chunk in self._iter_chunks(source, chunk_size):
+            buffer += chunk
+            position = yield from self._scan(buffer, offset, final=False)
+            buffer = buffer[position:]
+            offset += position
+
+        yield from self._scan(buffer, offset, final=True)
+        yield Token(TokenType.EOF, '')
+
+    @staticmethod
+    def _iter_chunks(source, chunk_size):
+        if isinstance(source, str):
+            yield source
+        elif hasattr(source, 'read'):
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            yield from source
+
+    def _scan(self, text, offset, final):
+        # Yield the tokens of text and return the position where scanning stopped. Unless this is the
+        # last piece of input, stop at a token that may still continue in the next chunk
+        position = 0
+        length = len(text)
+        limit = length if final else length - self.LOOKAHEAD
+        match = self.master_pattern.match
+        types = TokenType.__members__
+        words = self.words
+
+        while position < length:
+            token_match = match(text, position)
+
+            if token_match is None:
+                if not final and (position >= limit or self.OPEN_STRING.match(text, position)):
+                    return position
+                raise ValueError(f"Unrecognized token at position {offset + position}: "
+                                 f"'{text[position:position + 10]}'")
+
+            end = token_match.end()
+            if end > limit:
+                return position
+
+            kind = token_match.lastgroup
+            if kind == 'ID':
+                word = token_match.group()
+                yield Token(*(words.get(word) or self.classify_word(word)))
+            elif kind != 'SKIP':  # Skip whitespace
+                yield Token(types[kind], token_match.group())
+
+            position = end
+
+        return position
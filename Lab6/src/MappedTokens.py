@@ -0,0 +1,72 @@
+from array import array
+
+from Lab6.src.TokenStream import TOKEN_TYPES
+
+
+class MappedTokens:
+    # Tokens of a memory-mapped file stored as (type, start, end) columns; values are decoded from the
+    # mapped bytes only when a token is read
+    def __init__(self, buffer, offset_typecode='Q'):
+        self.buffer = buffer
+        self.types = array('B')
+        self.starts = array(offset_typecode)
+        self.ends = array(offset_typecode)
+
+    def append(self, token_type, start, end):
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def token_type(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def token_types(self):
+        # The type column as a list of TokenType, read without decoding any value
+        return [TOKEN_TYPES[code] for code in self.types]
+
+    def value(self, index):
+        return self.buffer[self.starts[index]:self.ends[index]].decode('utf-8')
+
+    def close(self):
+        if hasattr(self.buffer, 'close'):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return MappedToken(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield MappedToken(self, index)
+
+
+class MappedToken:
+    # Lightweight view of one token; the value is decoded on access and never cached
+    __slots__ = ('tokens', 'index')
+
+    def __init__(self, tokens, index):
+        self.tokens = tokens
+        self.index = index
+
+    @property
+    def token_type(self):
+        return self.tokens.token_type(self.index)
+
+    @property
+    def value(self):
+        return self.tokens.value(self.index)
+
+    def __repr__(self):
+        return f"Token({self.token_type}, '{self.value}')"
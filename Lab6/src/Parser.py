@@ -1,3 +1,6 @@
+from operator import attrgetter
+
+from Lab6.src.Diagnostic import Diagnostic
 from Lab6.src.IngredientNode import IngredientNode
 from Lab6.src.NumberNode import NumberNode
 from Lab6.src.RecipeNode import RecipeNode
@@ -6,91 +9,227 @@ from Lab6.src.StringNode import StringNode
 from Lab6.src.TemperatureNode import TemperatureNode
 from Lab6.src.TimeNode import TimeNode
 from Lab6.src.TitleNode import TitleNode
+from Lab6.src.Token import Token
 from Lab6.src.TokenType import TokenType
 from Lab6.src.UnitNode import UnitNode
 from Lab6.src.YieldNode import YieldNode
 
+TOKEN_TYPE = attrgetter('token_type')
+
 
 class Parser:
-    def __init__(self, tokens):
+    # Bump whenever the accepted grammar or the trees built for it change; caches of parsed trees are
+    # keyed on it
+    GRAMMAR_VERSION = 1
+
+    def __init__(self, tokens, recover=False):
         self.tokens = tokens
+        # Token types as a list, so that the statement handlers check types without creating a Token per
+        # lookup, and value(index) for the values, which is only called for the tokens the Parser keeps.
+        # Columnar tokens (TokenStream, MappedTokens) give both straight from their columns, so mapped
+        # values are decoded only when they are asked for
+        if hasattr(tokens, 'token_types'):
+            self.types = tokens.token_types()
+            self.value = tokens.value
+        else:
+            self.types = list(map(TOKEN_TYPE, tokens))
+            self.value = self.__token_value
         self.current = 0
+        # In recovery mode syntax errors are collected as Diagnostics instead of raised, and parsing
+        # resumes after the broken statement
+        self.recover = recover
+        self.errors = []
 
     def parse(self):
         return self.parse_recipe()
 
+    @classmethod
+    def parse_many(cls, tokens, errors=None):
+        # Parse consecutive RECIPE blocks from any iterable of tokens, yielding each RecipeNode as soon as
+        # its closing brace is read; only the tokens of the block being parsed are kept. When an errors
+        # list is given, every block is parsed in recovery mode and its diagnostics are appended to it,
+        # with positions counted from the start of the whole token sequence
+        block = []
+        depth = 0
+        block_start = 0
+
+        for index, token in enumerate(tokens):
+            token_type = token.token_type
+            if token_type == TokenType.EOF:
+                break
+
+            if not block:
+                block_start = index
+            block.append(token)
+            if token_type == TokenType.LBRACE:
+                depth += 1
+            elif token_type == TokenType.RBRACE:
+                depth -= 1
+                if depth <= 0:
+                    yield cls._parse_block(block, block_start, errors)
+                    block = []
+                    depth = 0
+
+        if block:
+            # An unfinished block; parsing it reports what is missing
+            yield cls._parse_block(block, block_start, errors)
+
+    @classmethod
+    def _parse_block(cls, block, block_start, errors):
+        block.append(Token(TokenType.EOF, ''))
+        parser = cls(block, recover=errors is not None)
+        recipe = parser.parse()
+        for diagnostic in parser.errors:
+            diagnostic.position += block_start
+            errors.append(diagnostic)
+        return recipe
+
     def parse_recipe(self):
         # Expect RECIPE token
-        self.consume(TokenType.RECIPE)
-        self.consume(TokenType.LBRACE)
+        self.expect_or_report(TokenType.RECIPE)
+        self.expect_or_report(TokenType.LBRACE)
 
         # Initialize an empty Recipe node
         recipe = RecipeNode()
 
-        # Parse recipe components until we hit the closing brace
-        while not self.check(TokenType.RBRACE) and not self.is_at_end():
-            if self.check(TokenType.TITLE):
-                self.consume(TokenType.TITLE)
-                self.consume(TokenType.COLON)
-                title_value = self.consume(TokenType.STRING).value.strip('"')
-                self.consume(TokenType.SEMICOLON)
-                recipe.title = TitleNode(StringNode(title_value))
-
-            elif self.check(TokenType.YIELD):
-                self.consume(TokenType.YIELD)
-                self.consume(TokenType.COLON)
-                yield_value = float(self.consume(TokenType.NUMBER).value)
-                self.consume(TokenType.SEMICOLON)
-                recipe.yield_node = YieldNode(NumberNode(yield_value))
-
-            elif self.check(TokenType.TIME):
-                self.consume(TokenType.TIME)
-                self.consume(TokenType.COLON)
-                time_value = float(self.consume(TokenType.NUMBER).value)
-                time_unit = self.consume(TokenType.TIME_UNIT).value
-                self.consume(TokenType.SEMICOLON)
-                recipe.time_node = TimeNode(NumberNode(time_value), UnitNode(time_unit))
-
-            elif self.check(TokenType.INGREDIENT):
-                self.consume(TokenType.INGREDIENT)
-                self.consume(TokenType.COLON)
-
-                quantity = NumberNode(float(self.consume(TokenType.NUMBER).value))
-
-                unit = None
-                if self.check(TokenType.UNIT):
-                    unit = UnitNode(self.consume(TokenType.UNIT).value)
-
-                name = StringNode(self.consume(TokenType.STRING).value.strip('"'))
-                self.consume(TokenType.SEMICOLON)
-
-                recipe.ingredients.append(IngredientNode(quantity, unit, name))
-
-            elif self.check(TokenType.STEP):
-                self.consume(TokenType.STEP)
-                self.consume(TokenType.COLON)
-                instruction = StringNode(self.consume(TokenType.STRING).value.strip('"'))
-                self.consume(TokenType.SEMICOLON)
-
-                recipe.steps.append(StepNode(instruction))
-
-            elif self.check(TokenType.TEMP):
-                self.consume(TokenType.TEMP)
-                self.consume(TokenType.COLON)
-                temp_value = NumberNode(float(self.consume(TokenType.NUMBER).value))
-                temp_unit = UnitNode(self.consume(TokenType.TEMP_UNIT).value)
-                self.consume(TokenType.SEMICOLON)
-
-                recipe.temperature = TemperatureNode(temp_value, temp_unit)
+        # Parse recipe components until we hit the closing brace, dispatching on the statement keyword
+        types = self.types
+        handlers = self.statement_handlers
+        while True:
+            token_type = types[self.current]
+            if token_type is TokenType.RBRACE or token_type is TokenType.EOF:
+                break
 
+            handler = handlers.get(token_type)
+            if handler is None:
+                if self.recover:
+                    self.report(f"Unexpected {token_type}")
+                    self.synchronize()
+                else:
+                    # Skip unknown tokens
+                    self.current += 1
+            elif self.recover:
+                try:
+                    handler(self, recipe)
+                except SyntaxError as error:
+                    self.report(error.msg)
+                    self.synchronize()
             else:
-                # Skip unknown tokens
-                self.advance()
+                handler(self, recipe)
 
-        self.consume(TokenType.RBRACE)
+        self.expect_or_report(TokenType.RBRACE)
 
         return recipe
 
+    def report(self, message):
+        self.errors.append(Diagnostic(message, self.current))
+
+    def expect_or_report(self, token_type):
+        # skip() that only records the missing token in recovery mode
+        try:
+            self.skip(token_type)
+        except SyntaxError as error:
+            if not self.recover:
+                raise
+            self.report(error.msg)
+
+    def synchronize(self):
+        # Skip the rest of a broken statement: past the next ';', or up to a '}', EOF or the keyword
+        # that starts the next statement
+        types = self.types
+        while True:
+            token_type = types[self.current]
+            if token_type is TokenType.SEMICOLON:
+                self.current += 1
+                return
+            if token_type is TokenType.RBRACE or token_type is TokenType.EOF or token_type in self.statement_handlers:
+                return
+            self.current += 1
+
+    # Statement handlers are only called with the current token being their keyword
+
+    def parse_title(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+        title_value = self.expect(TokenType.STRING).strip('"')
+        self.skip(TokenType.SEMICOLON)
+        recipe.title = TitleNode(StringNode(title_value))
+
+    def parse_yield(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+        yield_value = float(self.expect(TokenType.NUMBER))
+        self.skip(TokenType.SEMICOLON)
+        recipe.yield_node = YieldNode(NumberNode(yield_value))
+
+    def parse_time(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+        time_value = float(self.expect(TokenType.NUMBER))
+        time_unit = self.expect(TokenType.TIME_UNIT)
+        self.skip(TokenType.SEMICOLON)
+        recipe.time_node = TimeNode(NumberNode(time_value), UnitNode(time_unit))
+
+    def parse_ingredient(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+
+        quantity = NumberNode(float(self.expect(TokenType.NUMBER)))
+
+        unit = None
+        if self.types[self.current] is TokenType.UNIT:
+            unit = UnitNode(self.value(self.current))
+            self.current += 1
+
+        name = StringNode(self.expect(TokenType.STRING).strip('"'))
+        self.skip(TokenType.SEMICOLON)
+
+        recipe.ingredients.append(IngredientNode(quantity, unit, name))
+
+    def parse_step(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+        instruction = StringNode(self.expect(TokenType.STRING).strip('"'))
+        self.skip(TokenType.SEMICOLON)
+
+        recipe.steps.append(StepNode(instruction))
+
+    def parse_temp(self, recipe):
+        self.current += 1
+        self.skip(TokenType.COLON)
+        temp_value = NumberNode(float(self.expect(TokenType.NUMBER)))
+        temp_unit = UnitNode(self.expect(TokenType.TEMP_UNIT))
+        self.skip(TokenType.SEMICOLON)
+
+        recipe.temperature = TemperatureNode(temp_value, temp_unit)
+
+    statement_handlers = {
+        TokenType.TITLE: parse_title,
+        TokenType.YIELD: parse_yield,
+        TokenType.TIME: parse_time,
+        TokenType.INGREDIENT: parse_ingredient,
+        TokenType.STEP: parse_step,
+        TokenType.TEMP: parse_temp,
+    }
+
+    def skip(self, token_type):
+        # Move past a token of the given type without reading its value; EOF never matches an expected type,
+        # so the cursor cannot move past it
+        current = self.current
+        if self.types[current] is not token_type:
+            raise SyntaxError(f"Expected {token_type} but got {self.types[current]}")
+        self.current = current + 1
+
+    def expect(self, token_type):
+        # skip() that returns the value of the token, the only place where the Parser reads one besides an
+        # optional unit
+        current = self.current
+        self.skip(token_type)
+        return self.value(current)
+
+    def __token_value(self, index):
+        return self.tokens[index].value
+
     def advance(self):
         if not self.is_at_end():
             self.current += 1
@@ -0,0 +1,187 @@
+import numpy as np
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.TokenType import TokenType
+
+
+def lexer_units(*token_types):
+    # The unit words of the Lexer patterns of the given token types, in pattern order
+    lexer = Lexer()
+    units = []
+    for token_type, pattern in lexer.token_patterns:
+        if token_type in token_types:
+            units.extend(lexer.WORD_LIST.fullmatch(pattern).group(1).split('|'))
+    return tuple(units)
+
+
+# Every unit the Lexer recognizes, in the order of their codes; NO_UNIT is the code of an ingredient
+# without a unit
+UNITS = lexer_units(TokenType.UNIT, TokenType.TIME_UNIT, TokenType.TEMP_UNIT)
+NO_UNIT = len(UNITS)
+
+
+class UnitCodes(dict):
+    # Unit code by spelling; the Lexer matches units without regard to case, so any spelling is looked up
+    # by its lower-case form once and then kept
+    def __missing__(self, unit):
+        code = self[unit] = self[unit.lower()]
+        return code
+
+
+UNIT_CODES = UnitCodes((unit.lower(), code) for code, unit in enumerate(UNITS))
+
+# unit -> (base unit, factor, offset): a quantity in the unit is factor * quantity + offset in the base unit.
+# Volumes go to millilitres, times to minutes and temperatures to degrees Celsius
+CONVERSIONS = {
+    'g': ('g', 1.0, 0.0),
+    'ml': ('ml', 1.0, 0.0),
+    'tsp': ('ml', 4.92892, 0.0),
+    'tbsp': ('ml', 14.7868, 0.0),
+    'cup': ('ml', 236.588, 0.0),
+    'min': ('min', 1.0, 0.0),
+    'hr': ('min', 60.0, 0.0),
+    'C': ('C', 1.0, 0.0),
+    'F': ('C', 5 / 9, -160 / 9),
+}
+
+# The conversions as tables indexed by unit code, the last entry leaving quantities without a unit as
+# they are
+BASE_CODES = np.array([UNIT_CODES[CONVERSIONS[unit][0].lower()] for unit in UNITS] + [NO_UNIT], dtype=np.uint8)
+FACTORS = np.array([CONVERSIONS[unit][1] for unit in UNITS] + [1.0])
+OFFSETS = np.array([CONVERSIONS[unit][2] for unit in UNITS] + [0.0])
+
+
+def unit_names(codes):
+    # Unit words for an array of unit codes, with None for NO_UNIT
+    return np.array(UNITS + (None,), dtype=object)[codes]
+
+
+class RecipeColumns:
+    # Quantities of parsed recipes gathered into NumPy columns, so that scaling and unit conversion are a few
+    # array operations over the whole corpus instead of a loop over the nodes.
+    #
+    # Ingredient columns have a row per ingredient, in recipe order, with recipe_ids pointing at the
+    # position of its recipe; recipe columns have a row per recipe and hold NaN where the recipe has no
+    # YIELD, TIME or TEMP. Units are stored as codes into UNITS
+    def __init__(self, recipes):
+        self.recipes = list(recipes)
+        self.ingredients = []
+        recipe_ids = []
+        quantities = []
+        unit_codes = []
+        self.names = []
+        yields = []
+        times = []
+        time_unit_codes = []
+        temperatures = []
+        temperature_unit_codes = []
+        # One pass over the nodes with the appends bound up front; this loop is most of the cost of the columns
+        add_ingredient = self.ingredients.append
+        add_recipe_id = recipe_ids.append
+        add_quantity = quantities.append
+        add_unit_code = unit_codes.append
+        add_name = self.names.append
+        codes = UNIT_CODES
+        for recipe_id, recipe in enumerate(self.recipes):
+            for ingredient in recipe.ingredients:
+                add_ingredient(ingredient)
+                add_recipe_id(recipe_id)
+                add_quantity(ingredient.quantity.value)
+                add_unit_code(NO_UNIT if ingredient.unit is None else codes[ingredient.unit.value])
+                add_name(ingredient.name.value)
+
+            yields.append(recipe.yield_node.servings.value if recipe.yield_node else np.nan)
+            time_node = recipe.time_node
+            if time_node:
+                times.append(time_node.duration.value)
+                time_unit_codes.append(codes[time_node.unit.value])
+            else:
+                times.append(np.nan)
+                time_unit_codes.append(NO_UNIT)
+            temperature = recipe.temperature
+            if temperature:
+                temperatures.append(temperature.value.value)
+                temperature_unit_codes.append(codes[temperature.unit.value])
+            else:
+                temperatures.append(np.nan)
+                temperature_unit_codes.append(NO_UNIT)
+
+        self.recipe_ids = np.array(recipe_ids, dtype=np.uint32)
+        self.quantities = np.array(quantities, dtype=np.float64)
+        self.unit_codes = np.array(unit_codes, dtype=np.uint8)
+        self.yields = np.array(yields, dtype=np.float64)
+        self.times = np.array(times, dtype=np.float64)
+        self.time_unit_codes = np.array(time_unit_codes, dtype=np.uint8)
+        self.temperatures = np.array(temperatures, dtype=np.float64)
+        self.temperature_unit_codes = np.array(temperature_unit_codes, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def scale(self, factors):
+        # Multiply the ingredient quantities and yields of every recipe by its factor; factors is one number
+        # for all recipes or an array with one per recipe
+        factors = np.broadcast_to(np.asarray(factors, dtype=np.float64), self.yields.shape)
+        self.quantities *= factors[self.recipe_ids]
+        self.yields *= factors
+
+    def scale_to(self, servings):
+        # Scale every recipe with a YIELD to the given number of servings; the others are left as they are
+        yields = self.yields
+        known = yields > 0
+        factors = np.divide(servings, yields, out=np.ones_like(yields), where=known)
+        self.scale(factors)
+        return factors
+
+    def normalize(self):
+        # Convert volumes to ml, times to minutes and temperatures to degrees Celsius
+        self.quantities, self.unit_codes = self._convert(self.quantities, self.unit_codes)
+        self.times, self.time_unit_codes = self._convert(self.times, self.time_unit_codes)
+        self.temperatures, self.temperature_unit_codes = self._convert(self.temperatures,
+                                                                       self.temperature_unit_codes)
+
+    @staticmethod
+    def _convert(values, codes):
+        return values * FACTORS[codes] + OFFSETS[codes], BASE_CODES[codes]
+
+    def write_back(self):
+        # Store the columns in the nodes they were gathered from
+        for ingredient, quantity, code in zip(self.ingredients, self.quantities.tolist(),
+                                              self.unit_codes.tolist()):
+            ingredient.quantity.value = quantity
+            if ingredient.unit is not None:
+                ingredient.unit.value = UNITS[code]
+
+        for recipe, servings, time, time_code, temperature, temperature_code in zip(
+                self.recipes, self.yields.tolist(), self.times.tolist(), self.time_unit_codes.tolist(),
+                self.temperatures.tolist(), self.temperature_unit_codes.tolist()):
+            if recipe.yield_node:
+                recipe.yield_node.servings.value = servings
+            if recipe.time_node:
+                recipe.time_node.duration.value = time
+                recipe.time_node.unit.value = UNITS[time_code]
+            if recipe.temperature:
+                recipe.temperature.value.value = temperature
+                recipe.temperature.unit.value = UNITS[temperature_code]
+
+    def ingredient_table(self):
+        # The ingredient columns by name, with the units spelled out
+        return {
+            'recipe_id': self.recipe_ids,
+            'name': np.array(self.names, dtype=object),
+            'quantity': self.quantities,
+            'unit': unit_names(self.unit_codes),
+        }
+
+    def recipe_table(self):
+        # The recipe columns by name, with the units spelled out
+        return {
+            'recipe_id': np.arange(len(self.recipes), dtype=np.uint32),
+            'title': np.array([recipe.title.title.value if recipe.title else None for recipe in self.recipes],
+                              dtype=object),
+            'yield': self.yields,
+            'time': self.times,
+            'time_unit': unit_names(self.time_unit_codes),
+            'temperature': self.temperatures,
+            'temperature_unit': unit_names(self.temperature_unit_codes),
+        }
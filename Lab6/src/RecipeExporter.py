@@ -0,0 +1,181 @@
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+from Lab6.src.RecipeColumns import RecipeColumns
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+TABLES = ('recipes', 'ingredients', 'steps')
+FORMATS = ('npy', 'parquet')
+
+
+def string_column(values):
+    # Fixed-width unicode, so that the arrays load without pickle; missing values become empty strings
+    return np.array(['' if value is None else value for value in values], dtype=str)
+
+
+def structured(columns):
+    # A structured array with one field per column of a {name: values} dict; strings, which RecipeColumns
+    # keeps as Python objects, become fixed-width fields
+    columns = {name: string_column(values) if not isinstance(values, np.ndarray) or values.dtype == object
+               else values for name, values in columns.items()}
+    table = np.empty(len(next(iter(columns.values()))),
+                     dtype=[(name, values.dtype) for name, values in columns.items()])
+    for name, values in columns.items():
+        table[name] = values
+    return table
+
+
+class RecipeExporter:
+    # Flattens parsed recipes into three tables: recipes, ingredients and steps, the latter two pointing at
+    # their recipe through recipe_id and keeping their order in it as position. Recipes are read from any
+    # iterable, such as Parser.parse_many, and written batch_size at a time, so memory is bounded by one
+    # batch for any corpus size.
+    #
+    # The npy format writes every batch of a table as a NumPy structured array of its own, e.g.
+    # ingredients-00003.npy; parquet writes a file per table with a row group per batch and needs pyarrow.
+    # Both come with a manifest that load_tables and iter_batches read
+    def __init__(self, directory, batch_size=4096, format='npy', normalize=False):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format '{format}', expected one of {', '.join(FORMATS)}")
+        self.directory = directory
+        self.batch_size = batch_size
+        self.format = format
+        # Convert units with RecipeColumns.normalize before writing
+        self.normalize = normalize
+
+    def export(self, recipes):
+        os.makedirs(self.directory, exist_ok=True)
+        recipes = iter(recipes)
+        rows = dict.fromkeys(TABLES, 0)
+        batches = 0
+        writers = ParquetWriters(self.directory) if self.format == 'parquet' else None
+        try:
+            while True:
+                batch = list(islice(recipes, self.batch_size))
+                if not batch:
+                    break
+                for table, array in self.tables(batch, rows['recipes']).items():
+                    if writers is None:
+                        np.save(os.path.join(self.directory, f'{table}-{batches:05d}.npy'), array, allow_pickle=False)
+                    else:
+                        writers.write(table, array)
+                    rows[table] += len(array)
+                batches += 1
+        finally:
+            if writers is not None:
+                writers.close()
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'format': self.format,
+            'normalized': self.normalize,
+            'batches': batches,
+            'rows': rows,
+        }
+        with open(os.path.join(self.directory, MANIFEST), 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+        return rows
+
+    def tables(self, recipes, first_id=0):
+        # The three tables of a list of recipes as structured arrays, numbering the recipes from first_id
+        columns = RecipeColumns(recipes)
+        if self.normalize:
+            columns.normalize()
+        recipe_table = columns.recipe_table()
+        ingredient_table = columns.ingredient_table()
+        recipe_table['recipe_id'] = recipe_table['recipe_id'] + np.uint32(first_id)
+        ingredient_table['recipe_id'] = ingredient_table['recipe_id'] + np.uint32(first_id)
+        ingredient_table['position'] = self._positions(columns.recipe_ids)
+        steps = [(recipe_id, position, step.instruction.value)
+                 for recipe_id, recipe in enumerate(recipes, first_id)
+                 for position, step in enumerate(recipe.steps)]
+
+        return {
+            'recipes': structured(recipe_table),
+            'ingredients': structured({name: ingredient_table[name]
+                                       for name in ('recipe_id', 'position', 'name', 'quantity', 'unit')}),
+            'steps': structured({
+                'recipe_id': np.array([row[0] for row in steps], dtype=np.uint32),
+                'position': np.array([row[1] for row in steps], dtype=np.uint32),
+                'instruction': [row[2] for row in steps],
+            }),
+        }
+
+    @staticmethod
+    def _positions(recipe_ids):
+        # Position of every row within its recipe, for rows grouped by recipe_id
+        rows = np.arange(len(recipe_ids), dtype=np.uint32)
+        if not len(rows):
+            return rows
+        starts = np.flatnonzero(np.diff(recipe_ids, prepend=np.uint32(0)) != 0)
+        first = np.zeros(len(rows), dtype=np.uint32)
+        first[starts] = starts
+        return rows - np.maximum.accumulate(first)
+
+
+class ParquetWriters:
+    # One pyarrow ParquetWriter per table, opened on the first batch so the schema comes from the data
+    def __init__(self, directory):
+        # Imported here so that the npy format does not need pyarrow
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.directory = directory
+        self.writers = {}
+
+    def write(self, table, array):
+        batch = self.pyarrow.table({name: array[name] for name in array.dtype.names})
+        writer = self.writers.get(table)
+        if writer is None:
+            writer = self.writers[table] = self.parquet.ParquetWriter(
+                os.path.join(self.directory, f'{table}.parquet'), batch.schema)
+        writer.write_table(batch)
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+        manifest = json.load(file)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"{directory} is not a recipe export of format {FORMAT_VERSION}")
+    return manifest
+
+
+def iter_batches(directory, table):
+    # The batches of one exported table as structured arrays, one at a time
+    if table not in TABLES:
+        raise ValueError(f"Unknown table '{table}', expected one of {', '.join(TABLES)}")
+    manifest = read_manifest(directory)
+    if manifest['format'] == 'npy':
+        for batch in range(manifest['batches']):
+            yield np.load(os.path.join(directory, f'{table}-{batch:05d}.npy'), allow_pickle=False)
+        return
+
+    import pyarrow.parquet
+
+    path = os.path.join(directory, f'{table}.parquet')
+    if not os.path.exists(path):
+        return
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    for row_group in range(parquet_file.num_row_groups):
+        columns = parquet_file.read_row_group(row_group)
+        yield structured({name: column.to_pylist() if column.type == pyarrow.string() else column.to_numpy()
+                          for name, column in zip(columns.column_names, columns.columns)})
+
+
+def load_tables(directory):
+    # Every exported table as one structured array, by table name
+    tables = {}
+    for table in TABLES:
+        batches = list(iter_batches(directory, table))
+        tables[table] = np.concatenate(batches) if batches else None
+    return tables
@@ -0,0 +1,67 @@
+import random
+
+WORDS = [
+    'flour', 'sugar', 'butter', 'milk', 'eggs', 'salt', 'pepper', 'olive', 'oil', 'garlic', 'onion', 'tomato',
+    'basil', 'cream', 'cheese', 'rice', 'chicken', 'lemon', 'honey', 'vanilla', 'water', 'yeast', 'carrot',
+    'mix', 'stir', 'bake', 'whisk', 'chop', 'slice', 'simmer', 'boil', 'fold', 'season', 'serve', 'until',
+    'golden', 'smooth', 'gently', 'minutes', 'the', 'and', 'with', 'into', 'a', 'large', 'bowl', 'pan', 'heat',
+]
+UNITS = ['g', 'ml', 'tsp', 'tbsp', 'cup']
+TIME_UNITS = ['min', 'hr']
+TEMP_UNITS = ['C', 'F']
+
+
+class RecipeGenerator:
+    # Seeded generator of valid recipe programs; the same seed and settings always give the same text
+    def __init__(self, seed=0, ingredients=(3, 12), steps=(2, 10), string_words=(1, 8)):
+        self.random = random.Random(seed)
+        self.ingredients = ingredients
+        self.steps = steps
+        self.string_words = string_words
+
+    def _string(self):
+        count = self.random.randint(*self.string_words)
+        return '"' + ' '.join(self.random.choice(WORDS) for _ in range(count)) + '"'
+
+    def _number(self, low, high, decimals=False):
+        if decimals and self.random.random() < 0.3:
+            return f'{self.random.uniform(low, high):.1f}'
+        return str(self.random.randint(low, high))
+
+    def recipe(self):
+        lines = ['RECIPE {', f'  TITLE: {self._string()};']
+
+        if self.random.random() < 0.9:
+            lines.append(f'  YIELD: {self._number(1, 12)};')
+        if self.random.random() < 0.9:
+            lines.append(f'  TIME: {self._number(5, 240)} {self.random.choice(TIME_UNITS)};')
+
+        for _ in range(self.random.randint(*self.ingredients)):
+            unit = f' {self.random.choice(UNITS)}' if self.random.random() < 0.8 else ''
+            lines.append(f'  INGREDIENT: {self._number(1, 500, decimals=True)}{unit} {self._string()};')
+
+        for _ in range(self.random.randint(*self.steps)):
+            lines.append(f'  STEP: {self._string()};')
+
+        if self.random.random() < 0.7:
+            lines.append(f'  TEMP: {self._number(90, 250)} {self.random.choice(TEMP_UNITS)};')
+
+        lines.append('}\n')
+        return '\n'.join(lines)
+
+    def iter_recipes(self, size):
+        # Yield recipes until at least size characters (which are also bytes, the text is ASCII) were produced
+        produced = 0
+        while produced < size:
+            recipe = self.recipe()
+            produced += len(recipe)
+            yield recipe
+
+    def generate(self, size):
+        return ''.join(self.iter_recipes(size))
+
+    def write(self, path, size):
+        # Stream a corpus of the given size to a file without holding it in memory
+        with open(path, 'w', encoding='utf-8') as file:
+            for recipe in self.iter_recipes(size):
+                file.write(recipe)
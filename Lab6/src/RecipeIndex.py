@@ -0,0 +1,280 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Index files start with the magic, the format version and the length of a small JSON directory, which
+# gives the offset and length of every column in the data that follows it
+MAGIC = b'RIDX'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHHI')
+# Data starts at a multiple of this, so the columns can be read in place from the mapped file
+ALIGNMENT = 8
+
+# Fields are named so that each can be given to query() as a keyword argument
+NUMERIC_FIELDS = ('servings', 'time', 'temperature')
+# Times are indexed in minutes and temperatures in degrees Celsius
+MINUTES = {'min': 1.0, 'hr': 60.0}
+
+
+def normalize_name(name):
+    return ' '.join(name.lower().split())
+
+
+def celsius(value, unit):
+    return (value - 32) * 5 / 9 if unit.upper() == 'F' else value
+
+
+def intersect(*postings):
+    # Recipe ids present in every one of the sorted posting lists
+    if not postings:
+        return []
+    result = postings[0]
+    for posting in sorted(postings[1:], key=len):
+        members = set(posting)
+        result = [recipe_id for recipe_id in result if recipe_id in members]
+    return list(result)
+
+
+class MappedColumns:
+    # Typed views of the columns of a mapped index file
+    def __init__(self, buffer, base, byteorder):
+        self.view = memoryview(buffer)
+        self.base = base
+        self.byteorder = byteorder
+        self.views = []
+
+    def read(self, typecode, location):
+        offset, count = location
+        start = self.base + offset
+        end = start + count * array(typecode).itemsize
+        if self.byteorder != sys.byteorder:
+            swapped = array(typecode, self.view[start:end].tobytes())
+            swapped.byteswap()
+            return swapped
+        column = self.view[start:end].cast(typecode)
+        self.views.append(column)
+        return column
+
+    def release(self):
+        # The mapping can only be closed once no view of it is left
+        for column in self.views:
+            column.release()
+        self.views.clear()
+        self.view.release()
+
+
+class MappedPostings:
+    # Posting lists of a loaded index. Terms are kept in the file sorted by their UTF-8 bytes, so a term is
+    # found by bisection in the mapping and loading takes the same time for any vocabulary size
+    def __init__(self, columns, layout):
+        self.terms = columns.read('B', layout['terms'])
+        self.term_offsets = columns.read('Q', layout['term_offsets'])
+        self.ids = columns.read('I', layout['ids'])
+        self.starts = columns.read('Q', layout['starts'])
+
+    def _term(self, position):
+        return self.terms[self.term_offsets[position]:self.term_offsets[position + 1]].tobytes()
+
+    def _posting(self, position):
+        return array('I', self.ids[self.starts[position]:self.starts[position + 1]])
+
+    def get(self, term, default=None):
+        key = term.encode('utf-8')
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self._term(low) == key:
+            return self._posting(low)
+        return default
+
+    def items(self):
+        for position in range(len(self)):
+            yield self._term(position).decode('utf-8'), self._posting(position)
+
+    def __contains__(self, term):
+        return self.get(term) is not None
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._term(position).decode('utf-8')
+
+    def __len__(self):
+        return len(self.term_offsets) - 1
+
+
+class RecipeIndex:
+    # Inverted index over parsed recipes, which are identified by their position in the indexed sequence.
+    # Ingredient names, units and (name, unit) pairs map to sorted posting lists of recipe ids; servings,
+    # time and temperature are kept as value-sorted columns for range queries
+    def __init__(self):
+        self.recipe_count = 0
+        self.names = {}
+        self.units = {}
+        self.name_units = {}
+        # field -> (sorted values, recipe ids in the same order)
+        self.numeric = {field: (array('d'), array('I')) for field in NUMERIC_FIELDS}
+        self._buffer = None
+        self._columns = None
+
+    @classmethod
+    def build(cls, recipes):
+        index = cls()
+        numeric = {field: [] for field in NUMERIC_FIELDS}
+
+        for recipe_id, recipe in enumerate(recipes):
+            for ingredient in recipe.ingredients:
+                name = normalize_name(ingredient.name.value)
+                unit = ingredient.unit.value.lower() if ingredient.unit else None
+                index._post(index.names, name, recipe_id)
+                if unit is not None:
+                    index._post(index.units, unit, recipe_id)
+                    index._post(index.name_units, f'{name}\t{unit}', recipe_id)
+
+            if recipe.yield_node:
+                numeric['servings'].append((recipe.yield_node.servings.value, recipe_id))
+            if recipe.time_node:
+                minutes = recipe.time_node.duration.value * MINUTES[recipe.time_node.unit.value.lower()]
+                numeric['time'].append((minutes, recipe_id))
+            if recipe.temperature:
+                temperature = celsius(recipe.temperature.value.value, recipe.temperature.unit.value)
+                numeric['temperature'].append((temperature, recipe_id))
+            index.recipe_count = recipe_id + 1
+
+        for field, pairs in numeric.items():
+            pairs.sort()
+            index.numeric[field] = (array('d', [value for value, _ in pairs]),
+                                    array('I', [recipe_id for _, recipe_id in pairs]))
+        return index
+
+    @staticmethod
+    def _post(postings, term, recipe_id):
+        posting = postings.get(term)
+        if posting is None:
+            postings[term] = array('I', [recipe_id])
+        elif posting[-1] != recipe_id:
+            # Recipes are added in id order, so a repeated ingredient only needs the last id checked
+            posting.append(recipe_id)
+
+    # Queries return sorted lists of recipe ids
+
+    def ingredient(self, name, unit=None):
+        name = normalize_name(name)
+        if unit is None:
+            return list(self.names.get(name, ()))
+        return list(self.name_units.get(f'{name}\t{unit.lower()}', ()))
+
+    def unit(self, unit):
+        return list(self.units.get(unit.lower(), ()))
+
+    def between(self, field, low=None, high=None):
+        # Recipes whose field lies in [low, high]; either bound may be left open. Times are in minutes and
+        # temperatures in degrees Celsius
+        values, recipe_ids = self.numeric[field]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return sorted(recipe_ids[start:end])
+
+    def query(self, ingredient=None, unit=None, **ranges):
+        # Recipes matching every given condition, e.g. query(ingredient='olive oil', unit='tbsp') or
+        # query(servings=(4, 6), temperature=(180, None)); a unit with an ingredient must be the unit of that
+        # ingredient
+        postings = []
+        if ingredient is not None:
+            postings.append(self.ingredient(ingredient, unit))
+        elif unit is not None:
+            postings.append(self.unit(unit))
+        for field, (low, high) in ranges.items():
+            if field not in self.numeric:
+                raise ValueError(f"Unknown numeric field '{field}', expected one of {', '.join(NUMERIC_FIELDS)}")
+            postings.append(self.between(field, low, high))
+        if not postings:
+            return list(range(self.recipe_count))
+        return intersect(*postings)
+
+    def save(self, path):
+        data = []
+        size = 0
+        directory = {'recipes': self.recipe_count, 'byteorder': sys.byteorder, 'postings': {}, 'numeric': {}}
+
+        def add(column):
+            nonlocal size
+            location = [size, len(column)]
+            data.append(column.tobytes())
+            size += len(column) * column.itemsize
+            # Keep every column aligned for its item size
+            padding = -size % ALIGNMENT
+            if padding:
+                data.append(bytes(padding))
+                size += padding
+            return location
+
+        for kind in ('names', 'units', 'name_units'):
+            # Terms sorted by their bytes with their offsets in one blob, and the posting lists one after
+            # another in the same order with their start offsets
+            encoded = sorted((term.encode('utf-8'), posting) for term, posting in getattr(self, kind).items())
+            term_offsets = array('Q', [0])
+            ids = array('I')
+            starts = array('Q', [0])
+            for term, posting in encoded:
+                term_offsets.append(term_offsets[-1] + len(term))
+                ids.extend(posting)
+                starts.append(len(ids))
+            directory['postings'][kind] = {
+                'terms': add(array('B', b''.join(term for term, _ in encoded))),
+                'term_offsets': add(term_offsets),
+                'ids': add(ids),
+                'starts': add(starts),
+            }
+        for field, (values, recipe_ids) in self.numeric.items():
+            directory['numeric'][field] = [add(values), add(recipe_ids)]
+
+        header = json.dumps(directory, separators=(',', ':')).encode('utf-8')
+        header += b' ' * (-(HEADER.size + len(header)) % ALIGNMENT)
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+            file.write(header)
+            file.writelines(data)
+
+    @classmethod
+    def load(cls, path):
+        # Map an index file; posting lists and columns are read from the mapping without being copied
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, directory_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            buffer.close()
+            raise ValueError(f"{path} is not a recipe index of format {FORMAT_VERSION}")
+        directory = json.loads(bytes(buffer[HEADER.size:HEADER.size + directory_size]))
+        columns = MappedColumns(buffer, HEADER.size + directory_size, directory['byteorder'])
+
+        index = cls()
+        index.recipe_count = directory['recipes']
+        for kind, layout in directory['postings'].items():
+            setattr(index, kind, MappedPostings(columns, layout))
+        index.numeric = {field: (columns.read('d', values), columns.read('I', recipe_ids))
+                         for field, (values, recipe_ids) in directory['numeric'].items()}
+        index._buffer = buffer
+        index._columns = columns
+        return index
+
+    def close(self):
+        # Release the mapping of a loaded index; its posting lists cannot be used afterwards
+        if self._buffer is not None:
+            self._columns.release()
+            self._buffer.close()
+            self._buffer = None
+            self._columns = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
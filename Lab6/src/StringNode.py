@@ -2,4 +2,4 @@ from Lab6.src.LiteralNode import LiteralNode
 
 
 class StringNode(LiteralNode):
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
@@ -2,16 +2,9 @@ from Lab6.src.AST import ASTNode
 
 
 class TimeNode(ASTNode):
+    __slots__ = ('duration', 'unit')
+    _fields = ('duration', 'unit')
 
     def __init__(self, duration, unit):
         self.duration = duration
         self.unit = unit
-
-    def __str__(self, level=0):
-        indent = "  " * level
-        result = f"{indent}TIME\n"
-        result += f"{indent}  duration\n"
-        result += self.duration.__str__(level + 2)
-        result += f"{indent}  unit\n"
-        result += self.unit.__str__(level + 2)
-        return result
\ No newline at end of file
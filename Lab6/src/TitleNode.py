@@ -2,12 +2,8 @@ from Lab6.src.AST import ASTNode
 
 
 class TitleNode(ASTNode):
+    __slots__ = ('title',)
+    _fields = ('title',)
 
     def __init__(self, title):
         self.title = title
-
-    def __str__(self, level=0):
-        indent = "  " * level
-        result = f"{indent}TITLE\n"
-        result += self.title.__str__(level + 1)
-        return result
\ No newline at end of file
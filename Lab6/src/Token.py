@@ -1,4 +1,6 @@
 class Token:
+    __slots__ = ('token_type', 'value')
+
     def __init__(self, token_type, value):
         self.token_type = token_type
         self.value = value
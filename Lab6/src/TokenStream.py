@@ -0,0 +1,73 @@
+import sys
+from array import array
+
+from Lab6.src.Token import Token
+from Lab6.src.TokenType import TokenType
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+class TokenStream:
+    # Token list stored as parallel columns: one byte per token type and an interned string per value,
+    # so repeated lexemes such as keywords and units share a single string object. Indexing gives
+    # Token objects. The Parser reads the columns directly, so it takes a stream wherever it takes a token
+    # list
+    def __init__(self):
+        self.types = array('B')
+        self.values = []
+        # Cursor of the peek/advance helpers
+        self.position = 0
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        # Build a stream from any iterable of tokens, e.g. Lexer.iter_tokens, without an intermediate list
+        stream = cls()
+        for token in tokens:
+            stream.append(token.token_type, token.value)
+        return stream
+
+    def append(self, token_type, value):
+        self.types.append(token_type.value)
+        self.values.append(sys.intern(value))
+
+    def token_type(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def value(self, index):
+        return self.values[index]
+
+    def peek(self):
+        # The token at the cursor, like Parser.peek; peek_type and peek_value read one column without
+        # creating a Token
+        return self[self.position]
+
+    def peek_type(self):
+        return TOKEN_TYPES[self.types[self.position]]
+
+    def peek_value(self):
+        return self.values[self.position]
+
+    def is_at_end(self):
+        return self.types[self.position] == TokenType.EOF.value
+
+    def advance(self):
+        # Return the current token and move past it; the cursor never moves beyond EOF
+        token = self[self.position]
+        if not self.is_at_end():
+            self.position += 1
+        return token
+
+    def token_types(self):
+        # The type column as a list of TokenType, for readers such as the Parser that look up types by
+        # index without creating a Token each time
+        return [TOKEN_TYPES[code] for code in self.types]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        return Token(TOKEN_TYPES[self.types[index]], self.values[index])
+
+    def __iter__(self):
+        for code, value in zip(self.types, self.values):
+            yield Token(TOKEN_TYPES[code], value)
@@ -0,0 +1,139 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+
+# Strings are matched first so that braces and keywords inside them are ignored
+BLOCK_SCANNER = re.compile(r'"[^"]*"|[{}]|(?<![A-Za-z0-9_])RECIPE(?![A-Za-z0-9_])', re.IGNORECASE)
+# Blocks are shipped to the workers in batches of roughly this many characters
+BATCH_SIZE = 256 * 1024
+
+_lexer = None
+
+
+def split_blocks(text):
+    # Return (offset, block) pairs, one per top-level RECIPE block; text before the first block is
+    # kept as a block of its own when it is not blank, so that it is reported instead of dropped
+    starts = []
+    depth = 0
+    for match in BLOCK_SCANNER.finditer(text):
+        lexeme = match.group()
+        if lexeme == '{':
+            depth += 1
+        elif lexeme == '}':
+            depth = max(depth - 1, 0)
+        elif depth == 0 and lexeme[0] != '"':
+            starts.append(match.start())
+
+    if not starts or text[:starts[0]].strip():
+        starts.insert(0, 0)
+
+    ends = starts[1:] + [len(text)]
+    return [(start, text[start:end]) for start, end in zip(starts, ends) if text[start:end].strip()]
+
+
+def _error_position(block, token_index):
+    # Character offset in the block of the token at the given index, or of the text the lexer could not
+    # match when token_index is None; past the last token, the end of the last token. Tokens carry no
+    # positions, so the block is scanned again; this only runs once an error has been found
+    match = _lexer.master_pattern.match
+    position = 0
+    index = 0
+    last_end = 0
+    while position < len(block):
+        token_match = match(block, position)
+        if token_match is None:
+            return position
+        if token_match.lastgroup != 'SKIP':
+            if index == token_index:
+                return position
+            index += 1
+            last_end = token_match.end()
+        position = token_match.end()
+    return last_end
+
+
+def _syntax_error(message, path, offset, line, column, block, token_index):
+    # SyntaxError located at the failing token of a block, or at the unrecognized text
+    position = _error_position(block, token_index)
+    line_start = block.rfind('\n', 0, position) + 1
+    line_end = block.find('\n', position)
+    error_line = line + block.count('\n', 0, position)
+    # Only the first line of the block can start after the beginning of a line of the file
+    error_column = position - line_start + (column if line_start == 0 else 1)
+    text = block[line_start:line_end] if line_end >= 0 else block[line_start:]
+    if line_start == 0:
+        # Pad in place of the text before the block, so that the column points into the line
+        text = ' ' * (column - 1) + text
+    return SyntaxError(f"{message} at line {error_line}, column {error_column} (recipe block at offset {offset})",
+                       (path, error_line, error_column, text))
+
+
+def parse_block(path, offset, line, block, column=1):
+    # Parse one RECIPE block found at the given character offset, line and column of its file
+    global _lexer
+    if _lexer is None:
+        _lexer = Lexer()
+
+    try:
+        tokens = _lexer.tokenize(block)
+    except ValueError:
+        # The lexer reports the position in the block; the SyntaxError locates it in the file instead
+        raise _syntax_error("Unrecognized token", path, offset, line, column, block, None) from None
+
+    parser = Parser(tokens)
+    try:
+        recipe = parser.parse()
+        if not parser.is_at_end():
+            raise SyntaxError(f"Unexpected {parser.peek().token_type} after the end of the recipe")
+    except SyntaxError as error:
+        raise _syntax_error(error.msg, path, offset, line, column, block, parser.current) from None
+    return recipe
+
+
+def _parse_batch(batch):
+    return [parse_block(*job) for job in batch]
+
+
+def _batches(paths):
+    batch = []
+    size = 0
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            text = file.read()
+
+        line = 1
+        previous = 0
+        for offset, block in split_blocks(text):
+            line += text.count('\n', previous, offset)
+            previous = offset
+            column = offset - text.rfind('\n', 0, offset)
+            batch.append((path, offset, line, block, column))
+            size += len(block)
+            if size >= BATCH_SIZE:
+                yield batch
+                batch = []
+                size = 0
+    if batch:
+        yield batch
+
+
+def parse_corpus(paths, workers=None):
+    # Lex and parse every RECIPE block of the given files, spreading batches of blocks over a process
+    # pool, and return the RecipeNodes in input order. Errors are raised as SyntaxError carrying the
+    # file name, line and column of the failing token
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    recipes = []
+    if workers == 1:
+        for batch in _batches(paths):
+            recipes.extend(_parse_batch(batch))
+        return recipes
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_recipes in executor.map(_parse_batch, _batches(paths)):
+            recipes.extend(batch_recipes)
+    return recipes
@@ -1,14 +1,13 @@
-from Lab6.src.ASTVisualizer import ASTVisualizer
+from Lab6.src.DotExporter import DotExporter
 
 
-def visualize_ast(ast):
-    visualizer = ASTVisualizer()
-    dot = visualizer.visualize(ast)
+def visualize_ast(ast, collapse_threshold=None, max_nodes=None):
+    exporter = DotExporter(collapse_threshold, max_nodes)
 
     try:
-        dot.render('../files/recipe_ast', format='png', cleanup=True)
+        exporter.render(ast, '../files/recipe_ast', format='png', cleanup=True)
         print("AST visualization saved as 'files/recipe_ast.png'")
     except Exception as e:
         print(f"Could not render graph: {e}")
         print("To use visualization, install graphviz: pip install graphviz")
-        print("And ensure the Graphviz binaries are in your PATH")
\ No newline at end of file
+        print("And ensure the Graphviz binaries are in your PATH")
@@ -0,0 +1,144 @@
+import io
+
+from Lab6.src.ASTVisitor import Dispatcher
+
+# Lines are collected and written in one call once about this many are pending
+BUFFER_LINES = 4096
+
+
+class TreeWriter(Dispatcher):
+    # Each visit_ method writes the node's own line to lines and returns what goes below it, in output
+    # order: label lines, already indented, and (child node, child indent) pairs. Leaves return nothing
+
+    def visit_RecipeNode(self, node, indent, lines):
+        lines.append(f"{indent}RECIPE\n")
+        inner = indent + '  '
+        items = []
+        if node.title:
+            items.append((node.title, inner))
+        if node.yield_node:
+            items.append((node.yield_node, inner))
+        if node.time_node:
+            items.append((node.time_node, inner))
+        if node.ingredients:
+            items.append(f"{inner}INGREDIENTS_LIST\n")
+            items.extend([(ingredient, inner + '  ') for ingredient in node.ingredients])
+        if node.steps:
+            items.append(f"{inner}STEPS_LIST\n")
+            items.extend([(step, inner + '  ') for step in node.steps])
+        if node.temperature:
+            items.append((node.temperature, inner))
+        return items
+
+    def visit_TitleNode(self, node, indent, lines):
+        lines.append(f"{indent}TITLE\n")
+        return [(node.title, indent + '  ')]
+
+    def visit_YieldNode(self, node, indent, lines):
+        lines.append(f"{indent}YIELD\n{indent}  servings\n")
+        return [(node.servings, indent + '    ')]
+
+    def visit_TimeNode(self, node, indent, lines):
+        lines.append(f"{indent}TIME\n{indent}  duration\n")
+        return [(node.duration, indent + '    '), f"{indent}  unit\n", (node.unit, indent + '    ')]
+
+    def visit_IngredientNode(self, node, indent, lines):
+        quantity, unit, name = node.quantity, node.unit, node.name
+        leaf = indent + '    '
+        handlers = self._handlers
+        if (handlers.get(quantity.__class__) is _literal and handlers.get(name.__class__) is _literal
+                and (not unit or handlers.get(unit.__class__) is _literal)):
+            # Ingredients and steps make up most of a recipe; with literal children they are written at once
+            text = f"{indent}INGREDIENT\n{indent}  quantity\n{leaf}{type(quantity).__name__}: {quantity.value}\n"
+            if unit:
+                text += f"{indent}  unit\n{leaf}{type(unit).__name__}: {unit.value}\n"
+            lines.append(f"{text}{indent}  name\n{leaf}{type(name).__name__}: {name.value}\n")
+            return None
+
+        lines.append(f"{indent}INGREDIENT\n{indent}  quantity\n")
+        if unit:
+            return [(quantity, leaf), f"{indent}  unit\n", (unit, leaf), f"{indent}  name\n", (name, leaf)]
+        return [(quantity, leaf), f"{indent}  name\n", (name, leaf)]
+
+    def visit_StepNode(self, node, indent, lines):
+        instruction = node.instruction
+        if self._handlers.get(instruction.__class__) is _literal:
+            lines.append(f"{indent}STEP\n{indent}  instruction\n{indent}    {type(instruction).__name__}: "
+                         f"{instruction.value}\n")
+            return None
+
+        lines.append(f"{indent}STEP\n{indent}  instruction\n")
+        return [(instruction, indent + '    ')]
+
+    def visit_TemperatureNode(self, node, indent, lines):
+        lines.append(f"{indent}TEMPERATURE\n{indent}  value\n")
+        return [(node.value, indent + '    '), f"{indent}  unit\n", (node.unit, indent + '    ')]
+
+    def visit_BinaryNode(self, node, indent, lines):
+        lines.append(f"{indent}{type(node).__name__}\n")
+        return [(node.left, indent + '  '), (node.right, indent + '  ')]
+
+    def visit_LiteralNode(self, node, indent, lines):
+        lines.append(f"{indent}{type(node).__name__}: {node.value}\n")
+
+    def visit_IdentifierNode(self, node, indent, lines):
+        lines.append(f"{indent}{type(node).__name__}: {node.name}\n")
+
+    def visit_ASTNode(self, node, indent, lines):
+        lines.append(f"{indent}{type(node).__name__}\n")
+
+    def write(self, node, out, level=0):
+        # The tree is walked without recursion: the items of a node are handled in order, and only when one
+        # of them has items of its own is the iterator over the rest put on a stack to be resumed afterwards
+        pending = []
+        stack = []
+        handlers = self._handlers
+        items = iter([(node, '  ' * level)])
+
+        while True:
+            for item in items:
+                if item.__class__ is str:
+                    pending.append(item)
+                    continue
+
+                child, indent = item
+                child_class = child.__class__
+                handler = handlers.get(child_class) or self.handler(child_class)
+                if handler is _literal:
+                    # Most nodes are literals; their line is written here without a call
+                    pending.append(f"{indent}{child_class.__name__}: {child.value}\n")
+                    continue
+
+                child_items = handler(self, child, indent, pending)
+                if child_items:
+                    stack.append(items)
+                    items = iter(child_items)
+                    break
+            else:
+                if not stack:
+                    break
+                items = stack.pop()
+
+            if len(pending) >= BUFFER_LINES:
+                out.write(''.join(pending))
+                pending.clear()
+
+        out.write(''.join(pending))
+
+
+# Children are recognized as literals by their cached handler, so a class takes the general path until
+# the walk has resolved it once
+_literal = TreeWriter.visit_LiteralNode
+_writer = TreeWriter()
+
+
+def write_tree(node, out, level=0):
+    # Write the indented text of the tree to a file-like object in batches of lines; the text is the
+    # same as str(node)
+    _writer.write(node, out, level)
+
+
+def tree_text(node, level=0):
+    out = io.StringIO()
+    _writer.write(node, out, level)
+    return out.getvalue()
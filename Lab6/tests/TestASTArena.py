@@ -0,0 +1,77 @@
+import unittest
+
+from Lab6.src.ASTArena import ASTArena
+from Lab6.src.BinaryNode import BinaryNode
+from Lab6.src.IdentifierNode import IdentifierNode
+from Lab6.src.IngredientNode import IngredientNode
+from Lab6.src.Lexer import Lexer
+from Lab6.src.NumberNode import NumberNode
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.RecipeNode import RecipeNode
+from Lab6.src.StringNode import StringNode
+
+
+class TestASTArena(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = RecipeGenerator(3).generate(20000)
+        self.recipes = list(Parser.parse_many(Lexer().iter_tokens(self.corpus)))
+        self.arena = ASTArena.from_recipes(Parser.parse_many(Lexer().iter_tokens(self.corpus)))
+
+    def test_nodes_have_no_dict(self):
+        recipe = self.recipes[0]
+
+        for node in (recipe, recipe.title, recipe.ingredients[0], recipe.ingredients[0].quantity):
+            self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_views_print_like_the_nodes(self):
+        self.assertEqual(len(self.arena), len(self.recipes))
+        self.assertEqual([str(view) for view in self.arena], [str(recipe) for recipe in self.recipes])
+
+    def test_views_behave_like_node_classes(self):
+        view = self.arena[0]
+        recipe = self.recipes[0]
+
+        self.assertIsInstance(view, RecipeNode)
+        self.assertIsInstance(view.ingredients[0], IngredientNode)
+        self.assertIsInstance(view.title.title, StringNode)
+        self.assertEqual(view.title.title.value, recipe.title.title.value)
+        self.assertEqual([ingredient.unit and ingredient.unit.value for ingredient in view.ingredients],
+                         [ingredient.unit and ingredient.unit.value for ingredient in recipe.ingredients])
+        self.assertEqual(len(view.steps), len(recipe.steps))
+
+    def test_build_materializes_node_objects(self):
+        built = [self.arena.build(row) for row in self.arena.roots]
+
+        self.assertEqual([type(recipe) for recipe in built], [RecipeNode] * len(self.recipes))
+        self.assertEqual([str(recipe) for recipe in built], [str(recipe) for recipe in self.recipes])
+        self.assertEqual([str(recipe) for recipe in self.arena.build_all()], [str(recipe) for recipe in built])
+
+    def test_deep_trees(self):
+        # Deeper than the recursion limit; adding and building walk the tree with explicit stacks
+        node = NumberNode(0.0)
+        for depth in range(5000):
+            node = BinaryNode(node, IdentifierNode(f'x{depth}'))
+        arena = ASTArena()
+        row = arena.append(node)
+
+        for built in (arena.build(row), arena.build_all()[0]):
+            for depth in range(4999, -1, -1):
+                self.assertIsInstance(built, BinaryNode)
+                self.assertEqual(built.right.name, f'x{depth}')
+                built = built.left
+            self.assertEqual(built.value, 0.0)
+        self.assertEqual(ASTArena.from_bytes(arena.to_bytes()).kinds, arena.kinds)
+
+    def test_repeated_values_are_stored_once(self):
+        self.assertEqual(len(self.arena.strings), len(set(self.arena.strings)))
+        self.assertEqual(len(self.arena.numbers), len(set(self.arena.numbers)))
+
+        self.arena.append(self.recipes[0])
+        self.assertEqual(len(self.arena.strings), len(set(self.arena.strings)))
+        self.assertEqual(str(self.arena[-1]), str(self.recipes[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
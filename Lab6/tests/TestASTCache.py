@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from Lab6.src.ASTArena import ASTArena
+from Lab6.src.ASTCache import ASTCache
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+
+class TestASTCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache_directory = os.path.join(self.directory.name, 'cache')
+        self.generator = RecipeGenerator(11)
+
+    def write_corpus(self, name, size):
+        path = os.path.join(self.directory.name, name)
+        self.generator.write(path, size)
+        return path
+
+    def test_arena_bytes_round_trip(self):
+        arena = ASTArena.from_recipes(Parser.parse_many(Lexer().iter_tokens(self.generator.generate(5000))))
+
+        loaded = ASTArena.from_bytes(arena.to_bytes())
+
+        self.assertEqual([str(recipe) for recipe in loaded], [str(recipe) for recipe in arena])
+        with self.assertRaises(ValueError):
+            ASTArena.from_bytes(arena.to_bytes()[:-1])
+        with self.assertRaises(ValueError):
+            ASTArena.from_bytes(b'XXXX' + arena.to_bytes()[4:])
+
+    def test_warm_run_skips_lexing_and_parsing(self):
+        path = self.write_corpus('corpus.recipe', 20000)
+        expected = [str(recipe) for recipe in ASTCache(self.cache_directory).parse_file(path)]
+
+        cache = ASTCache(self.cache_directory)
+        # Any lexing would fail now
+        cache.lexer = None
+        recipes = cache.parse_file(path)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual([str(recipe) for recipe in recipes], expected)
+
+    def test_parse_matches_parser(self):
+        recipe = self.generator.recipe()
+        cache = ASTCache(self.cache_directory)
+
+        self.assertEqual(str(cache.parse(recipe)), str(Parser(Lexer().tokenize(recipe)).parse()))
+        self.assertEqual(str(cache.parse(recipe)), str(Parser(Lexer().tokenize(recipe)).parse()))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_changed_source_is_parsed_again(self):
+        path = self.write_corpus('corpus.recipe', 2000)
+        cache = ASTCache(self.cache_directory)
+        cache.parse_file(path)
+
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(self.generator.recipe())
+        cache.parse_file(path)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        paths = [self.write_corpus(f'corpus{index}.recipe', 20000) for index in range(3)]
+        cache = ASTCache(self.cache_directory)
+        cache.parse_file(paths[0])
+        cache.parse_file(paths[1])
+        entry_size = max(size for _, size in cache._entries.values())
+
+        cache.max_bytes = 2 * entry_size + entry_size // 2
+        # Use the first corpus again, so that the second is the least recently used one
+        cache.parse_file(paths[0])
+        cache.parse_file(paths[2])
+
+        self.assertEqual(len(os.listdir(self.cache_directory)), 2)
+        cache.parse_file(paths[0])
+        cache.parse_file(paths[1])
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_damaged_entry_is_replaced(self):
+        recipe = self.generator.recipe()
+        cache = ASTCache(self.cache_directory)
+        cache.parse(recipe)
+        entry = os.path.join(self.cache_directory, os.listdir(self.cache_directory)[0])
+        with open(entry, 'r+b') as file:
+            file.truncate(10)
+
+        self.assertEqual(str(cache.parse(recipe)), str(Parser(Lexer().tokenize(recipe)).parse()))
+        self.assertEqual(str(cache.parse(recipe)), str(Parser(Lexer().tokenize(recipe)).parse()))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
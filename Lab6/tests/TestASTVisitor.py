@@ -0,0 +1,132 @@
+import unittest
+
+from Lab6.src.ASTArena import ASTArena
+from Lab6.src.ASTVisitor import ASTVisitor, Dispatcher, iter_child_nodes
+from Lab6.src.BinaryNode import BinaryNode
+from Lab6.src.DotExporter import DotExporter
+from Lab6.src.IdentifierNode import IdentifierNode
+from Lab6.src.Lexer import Lexer
+from Lab6.src.LiteralNode import LiteralNode
+from Lab6.src.NumberNode import NumberNode
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.write_tree import TreeWriter
+
+
+class NodeNames(ASTVisitor):
+    # Collects class names in visiting order, through generic_visit for all but literals
+    def __init__(self):
+        self.names = []
+
+    def generic_visit(self, node):
+        self.names.append(type(node).__name__)
+        super().generic_visit(node)
+
+    def visit_LiteralNode(self, node):
+        self.names.append(f'{type(node).__name__}={node.value}')
+
+
+class WalkedNames(ASTVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_ASTNode(self, node):
+        self.names.append(type(node).__name__)
+        return iter_child_nodes(node)
+
+    def visit_LiteralNode(self, node):
+        self.names.append(f'{type(node).__name__}={node.value}')
+
+
+class WithoutIngredients(WalkedNames):
+    def visit_IngredientNode(self, node):
+        self.names.append('IngredientNode')
+        return None
+
+
+class TestASTVisitor(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe = Parser(Lexer().tokenize('''
+RECIPE {
+  TITLE: "Pancakes";
+  YIELD: 4;
+  INGREDIENT: 200 g "flour";
+  INGREDIENT: 2 "eggs";
+  STEP: "Mix";
+  TEMP: 180 C;
+}
+''')).parse()
+
+    def test_handlers_are_found_through_base_classes(self):
+        visitor = NodeNames()
+        visitor.visit(self.recipe)
+
+        self.assertEqual(visitor.names, [
+            'RecipeNode', 'TitleNode', 'StringNode=Pancakes', 'YieldNode', 'NumberNode=4.0',
+            'IngredientNode', 'NumberNode=200.0', 'UnitNode=g', 'StringNode=flour',
+            'IngredientNode', 'NumberNode=2.0', 'StringNode=eggs',
+            'StepNode', 'StringNode=Mix', 'TemperatureNode', 'NumberNode=180.0', 'UnitNode=C'])
+        self.assertIs(NodeNames.handler(NumberNode), NodeNames.visit_LiteralNode)
+        self.assertIsNone(NodeNames.handler(BinaryNode))
+
+    def test_each_visitor_class_has_its_own_cache(self):
+        WalkedNames().walk(self.recipe)
+        WithoutIngredients().walk(self.recipe)
+
+        self.assertIs(WalkedNames._handlers[type(self.recipe.ingredients[0])], WalkedNames.visit_ASTNode)
+        self.assertIs(WithoutIngredients._handlers[type(self.recipe.ingredients[0])],
+                      WithoutIngredients.visit_IngredientNode)
+        self.assertNotIn(LiteralNode, ASTVisitor._handlers)
+
+    def test_passes_with_their_own_handler_signature_are_not_visitors(self):
+        # The tree writer and the DOT exporter share the handler cache but not visit() and walk(), which
+        # would call their handlers with the wrong arguments
+        for cls in (TreeWriter, DotExporter):
+            self.assertTrue(issubclass(cls, Dispatcher))
+            self.assertFalse(issubclass(cls, ASTVisitor))
+            self.assertFalse(hasattr(cls, 'visit') or hasattr(cls, 'walk'))
+        self.assertIs(TreeWriter.handler(NumberNode), TreeWriter.visit_LiteralNode)
+        self.assertNotIn(NumberNode, Dispatcher._handlers)
+
+    def test_walk_visits_in_the_order_of_visit(self):
+        visited = NodeNames()
+        visited.visit(self.recipe)
+        walked = WalkedNames()
+        walked.walk(self.recipe)
+
+        self.assertEqual(walked.names, visited.names)
+
+    def test_walk_prunes_when_a_handler_returns_none(self):
+        walked = WithoutIngredients()
+        walked.walk(self.recipe)
+
+        self.assertEqual(walked.names.count('IngredientNode'), 2)
+        self.assertNotIn('StringNode=flour', walked.names)
+        self.assertIn('StringNode=Mix', walked.names)
+
+    def test_walk_handles_deep_trees(self):
+        node = NumberNode(0.0)
+        for depth in range(5000):
+            node = BinaryNode(node, IdentifierNode(f'x{depth}'))
+
+        walked = WalkedNames()
+        walked.walk(node)
+
+        self.assertEqual(len(walked.names), 10001)
+        self.assertEqual(walked.names[5000], 'NumberNode=0.0')
+
+    def test_arena_views_are_visited_like_nodes(self):
+        corpus = RecipeGenerator(12).generate(10000)
+        arena = ASTArena.from_recipes(Parser.parse_many(Lexer().iter_tokens(corpus)))
+
+        for recipe, view in zip(Parser.parse_many(Lexer().iter_tokens(corpus)), arena):
+            expected = NodeNames()
+            expected.visit(recipe)
+            walked = WalkedNames()
+            walked.walk(view)
+            self.assertEqual(walked.names, expected.names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from Lab6.src.DotExporter import DotExporter
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+try:
+    import graphviz
+except ImportError:
+    graphviz = None
+
+NODE_LINE = re.compile(r'\t(\w+) \[label=(.*?)\]$')
+EDGE_LINE = re.compile(r'\t(\w+) -> (\w+)(?: \[label=(.*?)\])?$')
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def graph(lines):
+    # Nodes and edges of DOT text as sets, with the quoting of the labels removed
+    def unquote(label):
+        return label[1:-1].replace('\\"', '"') if label and label[0] == '"' else label
+
+    nodes = set()
+    edges = set()
+    for line in lines:
+        if match := NODE_LINE.match(line):
+            nodes.add((match.group(1), unquote(match.group(2))))
+        elif match := EDGE_LINE.match(line):
+            edges.add((match.group(1), match.group(2), unquote(match.group(3))))
+    return nodes, edges
+
+
+class TestDotExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe = Parser(Lexer().tokenize('''
+RECIPE {
+  TITLE: "Basic Tomato Sauce with a very long name";
+  YIELD: 6;
+  TIME: 45 min;
+  INGREDIENT: 800 g "canned tomatoes";
+  INGREDIENT: 1 "onion";
+  INGREDIENT: 2 tbsp "olive oil";
+  STEP: "Chop";
+  STEP: "Simmer";
+  TEMP: 120 C;
+}
+''')).parse()
+
+    def export(self, nodes, **options):
+        out = io.StringIO()
+        exporter = DotExporter(**options)
+        exporter.export(nodes, out)
+        return exporter, out.getvalue()
+
+    @unittest.skipIf(graphviz is None, "graphviz is not installed")
+    def test_graph_matches_ast_visualizer(self):
+        from Lab6.src.ASTVisualizer import ASTVisualizer
+
+        _, text = self.export(self.recipe)
+        expected = ASTVisualizer().visualize(self.recipe).source
+
+        self.assertEqual(graph(text.splitlines()), graph(expected.splitlines()))
+
+    def test_long_lists_are_collapsed(self):
+        exporter, text = self.export(self.recipe, collapse_threshold=1)
+        labels = [label for _, label in graph(text.splitlines())[0]]
+
+        self.assertEqual(labels.count('INGREDIENT'), 1)
+        self.assertEqual(labels.count('STEP'), 1)
+        self.assertIn('... 2 more ingredients', labels)
+        self.assertIn('... 1 more steps', labels)
+
+    def test_node_budget_truncates_the_graph(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(6).generate(20000))))
+
+        exporter, text = self.export(recipes, max_nodes=100)
+        nodes, edges = graph(text.splitlines())
+
+        self.assertTrue(exporter.truncated)
+        self.assertEqual(exporter.node_count, 100)
+        self.assertEqual(len(nodes), 101)
+        node_ids = {node_id for node_id, _ in nodes}
+        self.assertTrue(all(source in node_ids and target in node_ids for source, target, _ in edges))
+        self.assertTrue(text.endswith('}\n'))
+
+    def test_labels_are_escaped(self):
+        recipe = Parser(Lexer().tokenize('RECIPE { STEP: "say \\ hi"; }')).parse()
+
+        _, text = self.export(recipe)
+
+        self.assertIn('[label="STRING: \\"say \\\\ hi\\""]', text)
+
+    @unittest.skipIf(graphviz is None, "graphviz is not installed")
+    def test_render_creates_missing_directories(self):
+        recipe = Parser(Lexer().tokenize('RECIPE { STEP: "Mix"; }')).parse()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'files', 'nested', 'recipe_ast')
+            # The Graphviz binaries may be missing; only the DOT file written before them matters here
+            with mock.patch('graphviz.render', return_value=path + '.png') as render:
+                self.assertEqual(DotExporter().render(recipe, path), path + '.png')
+
+            render.assert_called_once_with('dot', 'png', path)
+            with open(path, encoding='utf-8') as file:
+                self.assertIn('digraph {', file.read())
+
+    def test_exporting_does_not_import_graphviz(self):
+        script = ('import sys, io\n'
+                  'from Lab6.src.DotExporter import DotExporter\n'
+                  'from Lab6.src.ASTVisualizer import ASTVisualizer\n'
+                  'from Lab6.src.RecipeGenerator import RecipeGenerator\n'
+                  'from Lab6.src.Lexer import Lexer\n'
+                  'from Lab6.src.Parser import Parser\n'
+                  'recipes = Parser.parse_many(Lexer().iter_tokens(RecipeGenerator().generate(5000)))\n'
+                  'DotExporter().export(recipes, io.StringIO())\n'
+                  'print("graphviz" in sys.modules)\n')
+        result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True,
+                                check=True)
+
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from Lab6.src.IncrementalLexer import IncrementalLexer
+from Lab6.src.Lexer import Lexer
+
+
+class TestIncrementalLexer(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe = '''
+RECIPE {
+  TITLE: "Pancakes";
+  YIELD: 4;
+  INGREDIENT: 200 g "flour";
+  INGREDIENT: 1 cup "milk";
+  STEP: "Mix";
+  TEMP: 180 C;
+}
+''' * 20
+        self.lexer = IncrementalLexer(self.recipe)
+
+    def assert_matches_full_lexing(self):
+        expected = [(token.token_type, token.value) for token in Lexer().tokenize(self.lexer.text)]
+        self.assertEqual([(token.token_type, token.value) for token in self.lexer.tokens], expected)
+        for token, start, end in zip(self.lexer.tokens, self.lexer.starts, self.lexer.ends):
+            self.assertEqual(self.lexer.text[start:end], token.value)
+        self.assertEqual(self.lexer.starts[-1], len(self.lexer.text))
+
+    def test_edits_match_full_lexing(self):
+        # Each edit is (marker, distance from the marker, deleted length, inserted text)
+        edits = [
+            ('200', 0, 0, '1'),  # extend a number
+            ('1200', 4, 0, '.5'),  # add a fraction after the number
+            ('cup', 2, 1, ''),  # shorten the unit cup into the ID cu
+            ('cu ', 2, 0, 'p'),  # and turn it back into a unit
+            ('"flour"', 0, 7, '"whole wheat flour"'),
+            ('RECIPE', 0, 0, 'RECIPE { }\n'),
+            ('180 C;\n}\n', 5, 4, ''),
+        ]
+
+        for marker, distance, deleted, inserted in edits:
+            self.lexer.edit(self.lexer.text.index(marker) + distance, deleted, inserted)
+            self.assert_matches_full_lexing()
+
+    def test_only_the_edited_window_is_relexed(self):
+        offset = self.recipe.index('"milk"', len(self.recipe) // 2)
+        self.lexer.edit(offset + 1, 0, 'oat ')
+
+        self.assertLess(len(self.lexer.changed), 10)
+        self.assert_matches_full_lexing()
+
+    def test_invalid_edit_leaves_tokens_unchanged(self):
+        tokens = list(self.lexer.tokens)
+
+        with self.assertRaises(ValueError):
+            self.lexer.edit(5, 0, '@')
+        self.assertEqual(self.lexer.tokens, tokens)
+        self.assertEqual(self.lexer.text, self.recipe)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import os
+import tempfile
+import unittest
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.TokenType import TokenType
+
+
+class TestLexer(unittest.TestCase):
+
+    def setUp(self):
+        self.lexer = Lexer()
+        self.recipe = '''
+RECIPE {
+  TITLE: "Basic Tomato Sauce";
+  YIELD: 6;
+  TIME: 45 min;
+  INGREDIENT: 800 g "canned tomatoes";
+  INGREDIENT: 0.5 tsp "black pepper";
+  STEP: "Sauté onion until translucent";
+  TEMP: 120 C;
+}
+'''
+
+    def token_pairs(self, text):
+        return [(token.token_type, token.value) for token in self.lexer.tokenize(text)]
+
+    def test_tokenize_recipe(self):
+        pairs = self.token_pairs(self.recipe)
+
+        self.assertEqual(pairs[:3], [(TokenType.RECIPE, 'RECIPE'), (TokenType.LBRACE, '{'),
+                                     (TokenType.TITLE, 'TITLE')])
+        self.assertIn((TokenType.STRING, '"Sauté onion until translucent"'), pairs)
+        self.assertIn((TokenType.NUMBER, '0.5'), pairs)
+        self.assertIn((TokenType.TIME_UNIT, 'min'), pairs)
+        self.assertIn((TokenType.TEMP_UNIT, 'C'), pairs)
+        self.assertEqual(pairs[-1], (TokenType.EOF, ''))
+
+    def test_words_are_classified_as_a_whole(self):
+        # Keywords and units are only recognized as complete words, in any letter case
+        self.assertEqual(self.token_pairs('recipes Recipe g2 TSP gram'), [
+            (TokenType.ID, 'recipes'), (TokenType.RECIPE, 'Recipe'), (TokenType.ID, 'g2'),
+            (TokenType.UNIT, 'TSP'), (TokenType.ID, 'gram'), (TokenType.EOF, '')])
+
+    def test_repeated_words_share_one_string(self):
+        tokens = self.lexer.tokenize('tsp tsp INGREDIENT INGREDIENT')
+
+        self.assertIs(tokens[0].value, tokens[1].value)
+        self.assertIs(tokens[2].value, tokens[3].value)
+
+    def test_iter_tokens_matches_tokenize_across_chunk_boundaries(self):
+        expected = self.token_pairs(self.recipe + 'cup 1.5 hr')
+        text = self.recipe + 'cup 1.5 hr'
+
+        for chunk_size in (1, 2, 3, 5, 17, 64):
+            chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+            streamed = [(token.token_type, token.value) for token in self.lexer.iter_tokens(chunks)]
+            self.assertEqual(streamed, expected, f"chunk size {chunk_size}")
+
+    def test_iter_tokens_reads_file_objects_lazily(self):
+        source = io.StringIO(self.recipe * 50)
+        tokens = self.lexer.iter_tokens(source, chunk_size=64)
+
+        self.assertEqual(next(tokens).token_type, TokenType.RECIPE)
+        self.assertLess(source.tell(), len(self.recipe))
+
+    def test_iter_tokens_reports_absolute_position(self):
+        chunks = ['RECIPE { TITLE', ': "x"; @ }']
+        with self.assertRaisesRegex(ValueError, 'position 21'):
+            list(self.lexer.iter_tokens(chunks))
+
+    def write_temp_file(self, text):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False) as file:
+            file.write(text)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_tokenize_file_matches_tokenize(self):
+        path = self.write_temp_file(self.recipe)
+
+        with self.lexer.tokenize_file(path) as tokens:
+            mapped = [(token.token_type, token.value) for token in tokens]
+            self.assertEqual(tokens[-1].token_type, TokenType.EOF)
+            self.assertEqual(tokens.starts.typecode, 'I')
+
+        self.assertEqual(mapped, self.token_pairs(self.recipe))
+
+    def test_tokenize_file_keeps_no_identifiers(self):
+        words = 'recipes Recipe g2 TSP gram Min c ' + ' '.join(f'name{i}' for i in range(1000))
+        path = self.write_temp_file(words)
+        word_codes = dict(self.lexer.word_codes)
+
+        with self.lexer.tokenize_file(path) as tokens:
+            mapped = [(token.token_type, token.value) for token in tokens]
+
+        # Only the fixed table of keywords and units is consulted, so memory does not grow with the vocabulary
+        self.assertEqual(self.lexer.word_codes, word_codes)
+        self.assertEqual(self.lexer.words, {})
+        self.assertEqual(mapped, self.token_pairs(words))
+
+    def test_tokenize_file_reports_byte_offset(self):
+        path = self.write_temp_file('RECIPE { "é" @ }')
+
+        with self.assertRaisesRegex(ValueError, 'byte offset 14'):
+            self.lexer.tokenize_file(path)
+
+    def test_unrecognized_token(self):
+        with self.assertRaises(ValueError):
+            self.lexer.tokenize('RECIPE { @ }')
+
+
+if __name__ == '__main__':
+    unittest.main()
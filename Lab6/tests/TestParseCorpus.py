@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from Lab6.src.parse_corpus import parse_corpus, split_blocks
+
+
+class TestParseCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_corpus(self, name, titles):
+        recipes = [f'RECIPE {{\n  TITLE: "{title}";\n  STEP: "Mix {{ RECIPE }} well";\n}}\n' for title in titles]
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(recipes))
+        return path
+
+    def test_split_blocks_ignores_braces_and_keywords_in_strings(self):
+        text = 'RECIPE { STEP: "RECIPE { }"; }\nRECIPE { }'
+        self.assertEqual(split_blocks(text), [(0, 'RECIPE { STEP: "RECIPE { }"; }\n'), (31, 'RECIPE { }')])
+
+    def test_recipes_are_returned_in_input_order(self):
+        first = self.write_corpus('first.recipe', [f'A{index}' for index in range(50)])
+        second = self.write_corpus('second.recipe', [f'B{index}' for index in range(50)])
+
+        for workers in (1, 2):
+            recipes = parse_corpus([first, second], workers=workers)
+            self.assertEqual([recipe.title.title.value for recipe in recipes],
+                             [f'A{index}' for index in range(50)] + [f'B{index}' for index in range(50)])
+
+    def test_errors_carry_file_and_offset(self):
+        path = self.write_corpus('broken.recipe', ['Fine', 'Broken'])
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write('\nRECIPE { TITLE "Missing colon"; }\n')
+
+        with self.assertRaisesRegex(SyntaxError, 'offset 122') as context:
+            parse_corpus([path], workers=1)
+        self.assertEqual(context.exception.filename, path)
+        # The string where the colon is missing, not the start of the block
+        self.assertEqual((context.exception.lineno, context.exception.offset), (11, 16))
+        self.assertEqual(context.exception.text, 'RECIPE { TITLE "Missing colon"; }')
+
+    def test_errors_point_at_the_failing_token(self):
+        path = os.path.join(self.directory.name, 'deep.recipe')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('RECIPE { TITLE: "Fine"; }\n\n'
+                       'RECIPE {\n  TITLE: "Deep";\n  STEP: "Mix";\n  INGREDIENT: 2 "eggs";\n  TEMP: 180 g;\n}\n'
+                       'RECIPE { TITLE: "A"; } RECIPE { STEP: "B" }\n'
+                       'RECIPE {\n  STEP: "C";\n  TIME: 5 @;\n}\n')
+
+        # Line, column, message and the character at that column of the reported text
+        expected = [(7, 13, 'Expected TokenType.TEMP_UNIT but got TokenType.UNIT', 'g'),
+                    (9, 43, 'Expected TokenType.SEMICOLON but got TokenType.RBRACE', '}'),
+                    (12, 11, 'Unrecognized token', '@')]
+        for line, column, message, character in expected:
+            with self.assertRaisesRegex(SyntaxError, f'{message}.* at line {line}, column {column} ') as context:
+                parse_corpus([path], workers=1)
+            self.assertEqual((context.exception.lineno, context.exception.offset), (line, column))
+            self.assertEqual(context.exception.text[column - 1], character)
+            # Fix the error so that the next one is reached
+            with open(path, encoding='utf-8') as file:
+                lines = file.read().split('\n')
+            fixed = lines[line - 1].replace('180 g', '180 C').replace('"B" }', '"B"; }')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('\n'.join(lines[:line - 1] + [fixed] + lines[line:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.MappedTokens import MappedTokens
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+
+class TestParser(unittest.TestCase):
+
+    def setUp(self):
+        self.lexer = Lexer()
+        self.recipe = '''
+RECIPE {
+  TITLE: "Basic Tomato Sauce";
+  YIELD: 6;
+  TIME: 45 min;
+  INGREDIENT: 800 g "canned tomatoes";
+  INGREDIENT: 1 "onion";
+  STEP: "Simmer on low heat for 30 minutes";
+  TEMP: 120 C;
+}
+'''
+
+    def test_mapped_values_are_decoded_only_when_kept(self):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False) as file:
+            file.write(self.recipe)
+        self.addCleanup(os.remove, file.name)
+
+        with self.lexer.tokenize_file(file.name) as tokens:
+            with mock.patch.object(MappedTokens, 'value', autospec=True, side_effect=MappedTokens.value) as value:
+                parser = Parser(tokens)
+                self.assertEqual(value.call_count, 0)
+                recipe = parser.parse()
+
+            # Title 1, yield 1, time 2, ingredients 3 + 2, step 1 and temperature 2; no keyword or punctuation
+            self.assertEqual(value.call_count, 12)
+            self.assertLess(value.call_count, len(tokens))
+        self.assertEqual(str(recipe), str(Parser(self.lexer.tokenize(self.recipe)).parse()))
+
+    def test_parse_recipe(self):
+        recipe = Parser(self.lexer.tokenize(self.recipe)).parse()
+
+        self.assertEqual(recipe.title.title.value, 'Basic Tomato Sauce')
+        self.assertEqual(recipe.yield_node.servings.value, 6.0)
+        self.assertEqual((recipe.time_node.duration.value, recipe.time_node.unit.value), (45.0, 'min'))
+        self.assertEqual([(ingredient.quantity.value, ingredient.unit and ingredient.unit.value,
+                           ingredient.name.value) for ingredient in recipe.ingredients],
+                         [(800.0, 'g', 'canned tomatoes'), (1.0, None, 'onion')])
+        self.assertEqual(recipe.steps[0].instruction.value, 'Simmer on low heat for 30 minutes')
+        self.assertEqual((recipe.temperature.value.value, recipe.temperature.unit.value), (120.0, 'C'))
+
+    def test_missing_token_raises(self):
+        with self.assertRaises(SyntaxError):
+            Parser(self.lexer.tokenize('RECIPE { TITLE "No colon"; }')).parse()
+
+    def test_parse_many_yields_each_recipe_lazily(self):
+        corpus = RecipeGenerator(5).generate(20000)
+        expected = [str(Parser(self.lexer.tokenize(recipe)).parse())
+                    for recipe in RecipeGenerator(5).iter_recipes(20000)]
+
+        consumed = []
+
+        def tokens():
+            for token in self.lexer.iter_tokens(io.StringIO(corpus), chunk_size=256):
+                consumed.append(token)
+                yield token
+
+        recipes = Parser.parse_many(tokens())
+        first = next(recipes)
+        self.assertEqual(str(first), expected[0])
+        self.assertLess(len(consumed), len(self.lexer.tokenize(corpus)) // 2)
+        self.assertEqual([str(recipe) for recipe in recipes], expected[1:])
+
+    def test_parse_many_reports_unfinished_recipe(self):
+        with self.assertRaises(SyntaxError):
+            list(Parser.parse_many(self.lexer.iter_tokens(self.recipe + 'RECIPE { TITLE: "Cut off";')))
+
+    def test_recovery_collects_every_error_and_keeps_valid_statements(self):
+        tokens = self.lexer.tokenize('''
+RECIPE {
+  TITLE "No colon";
+  YIELD: 4;
+  stray words;
+  INGREDIENT: 2 tsp ;
+  STEP: "Missing semicolon"
+  TEMP: 180 C;
+''')
+        parser = Parser(tokens, recover=True)
+        recipe = parser.parse()
+
+        self.assertEqual([(error.position, error.message) for error in parser.errors], [
+            (3, 'Expected TokenType.COLON but got TokenType.STRING'),
+            (9, 'Unexpected TokenType.ID'),
+            (16, 'Expected TokenType.STRING but got TokenType.SEMICOLON'),
+            (20, 'Expected TokenType.SEMICOLON but got TokenType.TEMP'),
+            (25, 'Expected TokenType.RBRACE but got TokenType.EOF'),
+        ])
+        self.assertIsNone(recipe.title)
+        self.assertEqual(recipe.yield_node.servings.value, 4.0)
+        self.assertEqual(recipe.temperature.value.value, 180.0)
+
+    def test_parse_many_collects_errors_of_all_recipes(self):
+        corpus = self.recipe + 'RECIPE { YIELD: many; }' + self.recipe + 'RECIPE { STEP: ; }'
+        errors = []
+
+        recipes = list(Parser.parse_many(self.lexer.iter_tokens(corpus), errors=errors))
+
+        self.assertEqual(len(recipes), 4)
+        self.assertEqual([error.message for error in errors], [
+            'Expected TokenType.NUMBER but got TokenType.ID',
+            'Expected TokenType.STRING but got TokenType.SEMICOLON'])
+        tokens = self.lexer.tokenize(corpus)
+        self.assertEqual([tokens[error.position].value for error in errors], ['many', ';'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+try:
+    import numpy as np
+    from Lab6.src.RecipeColumns import CONVERSIONS, UNITS, RecipeColumns
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestRecipeColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.recipes = list(Parser.parse_many(Lexer().iter_tokens('''
+RECIPE {
+  TITLE: "Bread";
+  YIELD: 2;
+  TIME: 2 HR;
+  INGREDIENT: 500 g "flour";
+  INGREDIENT: 2 tbsp "oil";
+  INGREDIENT: 1 "egg";
+  TEMP: 428 F;
+}
+RECIPE {
+  TITLE: "Salad";
+  INGREDIENT: 1 cup "lettuce";
+  INGREDIENT: 3 tsp "salt";
+  TEMP: 20 C;
+}
+''')))
+        self.columns = RecipeColumns(self.recipes)
+
+    def test_units_are_the_lexer_units(self):
+        self.assertEqual(UNITS, ('g', 'ml', 'tsp', 'tbsp', 'cup', 'min', 'hr', 'C', 'F'))
+        self.assertEqual(set(CONVERSIONS), set(UNITS))
+
+    def test_gathered_columns(self):
+        columns = self.columns
+
+        self.assertEqual(columns.recipe_ids.tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(columns.quantities.tolist(), [500, 2, 1, 1, 3])
+        self.assertEqual(columns.ingredient_table()['unit'].tolist(), ['g', 'tbsp', None, 'cup', 'tsp'])
+        self.assertEqual(columns.names, ['flour', 'oil', 'egg', 'lettuce', 'salt'])
+        self.assertEqual(columns.yields[0], 2)
+        self.assertTrue(np.isnan(columns.yields[1]))
+        self.assertEqual(columns.recipe_table()['time_unit'].tolist(), ['hr', None])
+
+    def test_scale_to_servings(self):
+        factors = self.columns.scale_to(6)
+
+        self.assertEqual(factors.tolist(), [3, 1])
+        self.assertEqual(self.columns.quantities.tolist(), [1500, 6, 3, 1, 3])
+        self.assertEqual(self.columns.yields[0], 6)
+
+    def test_normalize(self):
+        self.columns.normalize()
+
+        np.testing.assert_allclose(self.columns.quantities, [500, 2 * 14.7868, 1, 236.588, 3 * 4.92892])
+        self.assertEqual(self.columns.ingredient_table()['unit'].tolist(), ['g', 'ml', None, 'ml', 'ml'])
+        self.assertEqual(self.columns.times[0], 120)
+        np.testing.assert_allclose(self.columns.temperatures, [220, 20])
+        self.assertEqual(self.columns.recipe_table()['temperature_unit'].tolist(), ['C', 'C'])
+
+    def test_write_back(self):
+        self.columns.scale_to(4)
+        self.columns.normalize()
+        self.columns.write_back()
+        bread = self.recipes[0]
+
+        self.assertEqual(bread.yield_node.servings.value, 4)
+        self.assertEqual((bread.ingredients[0].quantity.value, bread.ingredients[0].unit.value), (1000, 'g'))
+        self.assertAlmostEqual(bread.ingredients[1].quantity.value, 4 * 14.7868)
+        self.assertEqual(bread.ingredients[1].unit.value, 'ml')
+        self.assertIsNone(bread.ingredients[2].unit)
+        self.assertEqual((bread.time_node.duration.value, bread.time_node.unit.value), (120, 'min'))
+        self.assertAlmostEqual(bread.temperature.value.value, 220)
+        self.assertEqual(bread.temperature.unit.value, 'C')
+
+    def test_matches_scaling_node_by_node(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(4).generate(30000))))
+        expected = []
+        for recipe in recipes:
+            factor = 3 / recipe.yield_node.servings.value if recipe.yield_node else 1
+            for ingredient in recipe.ingredients:
+                unit = ingredient.unit.value if ingredient.unit else None
+                base, scale, offset = CONVERSIONS.get(unit, (None, 1, 0))
+                expected.append(ingredient.quantity.value * factor * scale + offset)
+
+        columns = RecipeColumns(recipes)
+        columns.scale_to(3)
+        columns.normalize()
+
+        np.testing.assert_allclose(columns.quantities, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
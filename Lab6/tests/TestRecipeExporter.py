@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+try:
+    import numpy as np
+    from Lab6.src.RecipeExporter import RecipeExporter, iter_batches, load_tables
+except ImportError:
+    np = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestRecipeExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.source = RecipeGenerator(9).generate(40000)
+
+    def export(self, **options):
+        directory = os.path.join(self.directory.name, 'export')
+        rows = RecipeExporter(directory, **options).export(Parser.parse_many(Lexer().iter_tokens(self.source)))
+        return directory, rows
+
+    def assert_tables_match(self, tables, recipes):
+        self.assertEqual(tables['recipes']['recipe_id'].tolist(), list(range(len(recipes))))
+        self.assertEqual(tables['recipes']['title'].tolist(), [recipe.title.title.value for recipe in recipes])
+
+        ingredients = [(recipe_id, position, ingredient.name.value, ingredient.quantity.value,
+                        ingredient.unit.value if ingredient.unit else '')
+                       for recipe_id, recipe in enumerate(recipes)
+                       for position, ingredient in enumerate(recipe.ingredients)]
+        self.assertEqual(tables['ingredients'].tolist(), ingredients)
+
+        steps = [(recipe_id, position, step.instruction.value)
+                 for recipe_id, recipe in enumerate(recipes)
+                 for position, step in enumerate(recipe.steps)]
+        self.assertEqual(tables['steps'].tolist(), steps)
+
+    def test_npy_round_trip_in_batches(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(self.source)))
+        directory, rows = self.export(batch_size=7)
+
+        self.assertEqual(rows['recipes'], len(recipes))
+        self.assertEqual(len([name for name in os.listdir(directory) if name.startswith('recipes-')]),
+                         -(-len(recipes) // 7))
+        self.assertTrue(all(len(batch) <= 7 for batch in iter_batches(directory, 'recipes')))
+        tables = load_tables(directory)
+        self.assert_tables_match(tables, recipes)
+        for table in tables.values():
+            self.assertFalse(any(table.dtype[name].hasobject for name in table.dtype.names))
+
+    def test_recipe_columns(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens('''
+RECIPE {
+  TITLE: "Bread";
+  TIME: 2 hr;
+  INGREDIENT: 2 tbsp "oil";
+  TEMP: 428 F;
+}
+RECIPE {
+  TITLE: "Salad";
+  YIELD: 2;
+}
+''')))
+        tables = RecipeExporter(self.directory.name, normalize=True).tables(recipes, first_id=10)
+
+        self.assertEqual(tables['recipes'][['recipe_id', 'time_unit', 'temperature_unit']].tolist(),
+                         [(10, 'min', 'C'), (11, '', '')])
+        self.assertEqual(tables['recipes']['time'][0], 120)
+        self.assertTrue(np.isnan(tables['recipes']['time'][1]))
+        self.assertTrue(np.isnan(tables['recipes']['yield'][0]))
+        self.assertEqual(tables['recipes']['yield'][1], 2)
+        self.assertAlmostEqual(tables['recipes']['temperature'][0], 220)
+        self.assertEqual(tables['ingredients'][['recipe_id', 'unit']].tolist(), [(10, 'ml')])
+        self.assertEqual(len(tables['steps']), 0)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(self.source)))
+        directory, _ = self.export(batch_size=50, format='parquet')
+
+        self.assert_tables_match(load_tables(directory), recipes)
+
+    def test_rejects_unknown_formats_and_tables(self):
+        with self.assertRaises(ValueError):
+            RecipeExporter(self.directory.name, format='csv')
+        directory, _ = self.export()
+        with self.assertRaises(ValueError):
+            list(iter_batches(directory, 'units'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+
+class TestRecipeGenerator(unittest.TestCase):
+
+    def test_same_seed_gives_same_corpus(self):
+        self.assertEqual(RecipeGenerator(7).generate(4096), RecipeGenerator(7).generate(4096))
+        self.assertNotEqual(RecipeGenerator(7).generate(4096), RecipeGenerator(8).generate(4096))
+
+    def test_corpus_reaches_requested_size(self):
+        corpus = RecipeGenerator(1).generate(10000)
+        self.assertGreaterEqual(len(corpus.encode('utf-8')), 10000)
+
+    def test_recipes_are_valid_programs(self):
+        lexer = Lexer()
+        generator = RecipeGenerator(3, ingredients=(1, 4), steps=(1, 3))
+
+        for recipe in generator.iter_recipes(20000):
+            ast = Parser(lexer.tokenize(recipe)).parse()
+            self.assertTrue(1 <= len(ast.ingredients) <= 4)
+            self.assertTrue(1 <= len(ast.steps) <= 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
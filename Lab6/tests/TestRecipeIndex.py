@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.RecipeIndex import RecipeIndex, celsius, normalize_name
+
+
+class TestRecipeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.recipes = list(Parser.parse_many(Lexer().iter_tokens('''
+RECIPE {
+  TITLE: "Bread";
+  YIELD: 2;
+  TIME: 2 hr;
+  INGREDIENT: 500 g "flour";
+  INGREDIENT: 2 tbsp "Olive  Oil";
+  TEMP: 428 F;
+}
+RECIPE {
+  TITLE: "Salad";
+  YIELD: 4;
+  TIME: 15 min;
+  INGREDIENT: 1 tbsp "olive oil";
+  INGREDIENT: 1 tsp "salt";
+}
+RECIPE {
+  TITLE: "Pancakes";
+  YIELD: 4;
+  INGREDIENT: 200 g "flour";
+  INGREDIENT: 1 cup "olive oil";
+  INGREDIENT: 2 "eggs";
+  TEMP: 180 C;
+}
+''')))
+        self.index = RecipeIndex.build(self.recipes)
+
+    def test_postings(self):
+        self.assertEqual(self.index.ingredient('olive oil'), [0, 1, 2])
+        self.assertEqual(self.index.ingredient('OLIVE OIL', 'TBSP'), [0, 1])
+        self.assertEqual(self.index.ingredient('eggs'), [2])
+        self.assertEqual(self.index.ingredient('butter'), [])
+        self.assertEqual(self.index.unit('g'), [0, 2])
+
+    def test_ranges_use_minutes_and_celsius(self):
+        self.assertEqual(self.index.between('time', 60), [0])
+        self.assertEqual(self.index.between('time', high=15), [1])
+        self.assertEqual(self.index.between('temperature', 200), [0])
+        self.assertEqual(self.index.between('temperature', 180, 180), [2])
+        self.assertEqual(self.index.between('servings', 4), [1, 2])
+
+    def test_query_intersects_conditions(self):
+        self.assertEqual(self.index.query(ingredient='olive oil', unit='tbsp'), [0, 1])
+        self.assertEqual(self.index.query(ingredient='flour', temperature=(180, None)), [0, 2])
+        self.assertEqual(self.index.query(unit='tsp'), [1])
+        self.assertEqual(self.index.query(ingredient='olive oil', servings=(4, None)), [1, 2])
+        self.assertEqual(self.index.query(), [0, 1, 2])
+        with self.assertRaises(ValueError):
+            self.index.query(calories=(0, 100))
+
+    def test_query_matches_a_scan(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(5).generate(100000))))
+        index = RecipeIndex.build(recipes)
+
+        def scan(name, low):
+            return [recipe_id for recipe_id, recipe in enumerate(recipes)
+                    if any(normalize_name(ingredient.name.value) == name for ingredient in recipe.ingredients)
+                    and recipe.temperature is not None
+                    and celsius(recipe.temperature.value.value, recipe.temperature.unit.value) >= low]
+
+        names = sorted(index.names)[:20]
+        self.assertTrue(names)
+        for name in names:
+            self.assertEqual(index.query(ingredient=name, temperature=(150, None)), scan(name, 150))
+
+    def test_saved_index_answers_the_same(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(6).generate(50000))))
+        index = RecipeIndex.build(recipes)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'recipes.idx')
+            index.save(path)
+
+            with RecipeIndex.load(path) as loaded:
+                self.assertEqual(loaded.recipe_count, index.recipe_count)
+                self.assertEqual(sorted(loaded.names), sorted(index.names))
+                for name in index.names:
+                    self.assertEqual(loaded.ingredient(name), index.ingredient(name))
+                for unit in index.units:
+                    self.assertEqual(loaded.unit(unit), index.unit(unit))
+                self.assertEqual(loaded.ingredient('no such ingredient'), [])
+                for field in ('servings', 'time', 'temperature'):
+                    self.assertEqual(loaded.between(field, 10, 200), index.between(field, 10, 200))
+
+                # A loaded index saves to the same bytes
+                copy = os.path.join(directory, 'copy.idx')
+                loaded.save(copy)
+                with open(path, 'rb') as original, open(copy, 'rb') as saved:
+                    self.assertEqual(saved.read(), original.read())
+            self.assertIsNone(loaded._buffer)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'other.idx')
+            with open(path, 'wb') as file:
+                file.write(b'XXXX' + bytes(64))
+            with self.assertRaises(ValueError):
+                RecipeIndex.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.TokenStream import TokenStream
+from Lab6.src.TokenType import TokenType
+
+
+class TestTokenStream(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe = '''
+RECIPE {
+  TITLE: "Pancakes";
+  INGREDIENT: 200 g "flour";
+  INGREDIENT: 25 g "butter";
+  STEP: "Mix";
+}
+'''
+        self.stream = TokenStream.from_tokens(Lexer().iter_tokens(self.recipe))
+
+    def test_columns_match_lexer_output(self):
+        tokens = Lexer().tokenize(self.recipe)
+
+        self.assertEqual(len(self.stream), len(tokens))
+        self.assertEqual([(token.token_type, token.value) for token in self.stream],
+                         [(token.token_type, token.value) for token in tokens])
+
+    def test_repeated_values_are_interned(self):
+        units = [index for index in range(len(self.stream)) if self.stream.token_type(index) == TokenType.UNIT]
+
+        self.assertEqual(len(units), 2)
+        self.assertIs(self.stream.value(units[0]), self.stream.value(units[1]))
+
+    def test_cursor_stops_at_eof(self):
+        self.assertEqual(self.stream.peek_type(), TokenType.RECIPE)
+        self.assertEqual(self.stream.peek().value, 'RECIPE')
+        self.assertEqual(self.stream.advance().value, 'RECIPE')
+        self.assertEqual(self.stream.peek_value(), '{')
+
+        for _ in range(len(self.stream) + 1):
+            self.stream.advance()
+        self.assertTrue(self.stream.is_at_end())
+        self.assertEqual(self.stream.peek_type(), TokenType.EOF)
+
+    def test_token_types(self):
+        self.assertEqual(self.stream.token_types(), [token.token_type for token in self.stream])
+
+    def test_parser_accepts_stream(self):
+        # The parser reads the columns and never builds a Token from the stream
+        with mock.patch.object(TokenStream, '__getitem__', side_effect=AssertionError):
+            recipe = Parser(self.stream).parse()
+
+        self.assertEqual(recipe.title.title.value, 'Pancakes')
+        self.assertEqual([ingredient.name.value for ingredient in recipe.ingredients], ['flour', 'butter'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import unittest
+
+from Lab6.src import write_tree as write_tree_module
+from Lab6.src.ASTArena import ASTArena
+from Lab6.src.BinaryNode import BinaryNode
+from Lab6.src.IdentifierNode import IdentifierNode
+from Lab6.src.Lexer import Lexer
+from Lab6.src.NumberNode import NumberNode
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.write_tree import write_tree
+
+
+class CountingWriter(io.StringIO):
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestWriteTree(unittest.TestCase):
+
+    def setUp(self):
+        self.recipe = Parser(Lexer().tokenize('''
+RECIPE {
+  TITLE: "Basic Tomato Sauce";
+  YIELD: 6;
+  TIME: 45 min;
+  INGREDIENT: 800 g "canned tomatoes";
+  INGREDIENT: 1 "onion";
+  STEP: "Simmer on low heat for 30 minutes";
+  TEMP: 120 C;
+}
+''')).parse()
+
+    def test_output_matches_print(self):
+        printed = io.StringIO()
+        with contextlib.redirect_stdout(printed):
+            print(self.recipe)
+        written = io.StringIO()
+        write_tree(self.recipe, written)
+
+        self.assertEqual(written.getvalue() + '\n', printed.getvalue())
+        self.assertEqual(written.getvalue(), '''RECIPE
+  TITLE
+    StringNode: Basic Tomato Sauce
+  YIELD
+    servings
+      NumberNode: 6.0
+  TIME
+    duration
+      NumberNode: 45.0
+    unit
+      UnitNode: min
+  INGREDIENTS_LIST
+    INGREDIENT
+      quantity
+        NumberNode: 800.0
+      unit
+        UnitNode: g
+      name
+        StringNode: canned tomatoes
+    INGREDIENT
+      quantity
+        NumberNode: 1.0
+      name
+        StringNode: onion
+  STEPS_LIST
+    STEP
+      instruction
+        StringNode: Simmer on low heat for 30 minutes
+  TEMPERATURE
+    value
+      NumberNode: 120.0
+    unit
+      UnitNode: C
+''')
+
+    def test_level_indents_the_whole_tree(self):
+        self.assertEqual(self.recipe.__str__(2),
+                         ''.join('    ' + line + '\n' for line in str(self.recipe).splitlines()))
+
+    def test_arena_views_are_written_like_nodes(self):
+        corpus = RecipeGenerator(8).generate(20000)
+        recipes = Parser.parse_many(Lexer().iter_tokens(corpus))
+        arena = ASTArena.from_recipes(Parser.parse_many(Lexer().iter_tokens(corpus)))
+
+        for recipe, view in zip(recipes, arena):
+            written = io.StringIO()
+            write_tree(view, written)
+            self.assertEqual(written.getvalue(), str(recipe))
+
+    def test_large_trees_are_written_in_batches(self):
+        recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(2).generate(50000))))
+        out = CountingWriter()
+        for recipe in recipes:
+            write_tree(recipe, out)
+
+        self.assertEqual(out.getvalue(), ''.join(map(str, recipes)))
+        self.assertLess(out.writes, len(out.getvalue().splitlines()) // write_tree_module.BUFFER_LINES
+                        + len(recipes) + 1)
+
+    def test_deep_trees_do_not_recurse(self):
+        node = NumberNode(0.0)
+        for depth in range(5000):
+            node = BinaryNode(node, IdentifierNode(f'x{depth}'))
+
+        lines = str(node).splitlines()
+
+        self.assertEqual(len(lines), 10001)
+        self.assertEqual(lines[5000], '  ' * 5000 + 'NumberNode: 0.0')
+        self.assertEqual(lines[-1], '  IdentifierNode: x4999')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import argparse
+import os
+import tempfile
+import time
+
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.parse_corpus import parse_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of parse_corpus for a growing number of workers")
+    parser.add_argument('--size', type=int, default=8192, help="size of each corpus file in KB")
+    parser.add_argument('--files', type=int, default=4, help="number of corpus files")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(args.files):
+            path = os.path.join(directory, f'corpus{index}.recipe')
+            RecipeGenerator(args.seed + index).write(path, args.size * 1024)
+            paths.append(path)
+
+        print(f"{os.cpu_count()} CPUs, {args.files} files of {args.size} KB")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            recipes = parse_corpus(paths, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>3} workers {elapsed:>8.2f} s {len(recipes) / elapsed:>10,.0f} recipes/s "
+                  f"speedup {baseline / elapsed:>5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import random
+import time
+
+from Lab2.src.FiniteAutomaton import FiniteAutomaton
+
+
+def nth_from_end(n):
+    # An NFA for (a|b)*a(a|b){n-1}; compile() turns it into a DFA of 2^n states
+    transitions = [
+        {"state": "p0", "symbol": "a", "to": "p0"},
+        {"state": "p0", "symbol": "b", "to": "p0"},
+        {"state": "p0", "symbol": "a", "to": "p1"},
+    ]
+    for i in range(1, n):
+        transitions += [{"state": f"p{i}", "symbol": symbol, "to": f"p{i + 1}"} for symbol in "ab"]
+    return FiniteAutomaton([f"p{i}" for i in range(n + 1)], ["a", "b"], "p0", {f"p{n}"}, transitions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch matching of strings against a compiled Lab2 DFA")
+    parser.add_argument('--count', type=int, default=1000000, help="number of strings")
+    parser.add_argument('--max-length', type=int, default=16)
+    parser.add_argument('--n', type=int, default=8, help="match (a|b)*a(a|b){n-1}")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    strings = ["".join(rng.choice("ab") for _ in range(rng.randint(0, args.max_length))) for _ in range(args.count)]
+
+    start = time.perf_counter()
+    compiled = nth_from_end(args.n).compile()
+    print(f"compiled {compiled.dead} states in {time.perf_counter() - start:.4f} s")
+
+    start = time.perf_counter()
+    single = [compiled.accepts(string) for string in strings]
+    elapsed = time.perf_counter() - start
+    print(f"{'accepts, one by one':<22} {elapsed:8.4f} s {args.count / elapsed / 1e6:8.2f} M strings/s")
+
+    start = time.perf_counter()
+    batch = compiled.match_many(strings)
+    elapsed = time.perf_counter() - start
+    print(f"{'match_many':<22} {elapsed:8.4f} s {args.count / elapsed / 1e6:8.2f} M strings/s")
+
+    assert batch.tolist() == single
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import random
+import time
+
+from Lab2.src.FiniteAutomaton import FiniteAutomaton
+
+
+def random_dfa(rng, size, symbols):
+    # A complete DFA with random transitions and about half of its states final
+    states = [f"s{i}" for i in range(size)]
+    transitions = [{"state": state, "symbol": symbol, "to": rng.choice(states)}
+                   for state in states for symbol in symbols]
+    return FiniteAutomaton(states, list(symbols), "s0", [state for state in states if rng.random() < 0.5],
+                           transitions)
+
+
+def chain_dfa(size, symbols):
+    # s0 -> s1 -> ... -> s(n-1) on every symbol with only the last state final: already minimal, but Moore's
+    # refinement separates one more state per round, so it needs n rounds
+    states = [f"s{i}" for i in range(size)]
+    transitions = [{"state": states[i], "symbol": symbol, "to": states[i + 1]}
+                   for i in range(size - 1) for symbol in symbols]
+    return FiniteAutomaton(states, list(symbols), "s0", [states[-1]], transitions)
+
+
+def moore_classes(table, states):
+    # Naive Moore refinement: split states by (class, classes of their targets) until nothing changes, with
+    # missing transitions going to a dead class -1. Each round costs O(n * k) and there can be up to n rounds
+    states = sorted(states)
+    symbols = range(len(table.symbol_names))
+    targets = []
+    for state in states:
+        row = []
+        for symbol in symbols:
+            target_set = table.targets[state].get(symbol)
+            row.append(next(iter(target_set)) if target_set else None)
+        targets.append(row)
+
+    class_of = {state: int(state in table.finals) for state in states}
+    count = len(set(class_of.values()))
+    while True:
+        signatures = {}
+        refined = {}
+        for state, row in zip(states, targets):
+            signature = (class_of[state], tuple(class_of.get(target, -1) for target in row))
+            refined[state] = signatures.setdefault(signature, len(signatures))
+        class_of = refined
+        if len(signatures) == count:
+            break
+        count = len(signatures)
+    return count
+
+
+def measure(name, dfa):
+    table = dfa.transition_table()
+    live = table.live_states()
+
+    start = time.perf_counter()
+    hopcroft = len(table.equivalence_classes(live))
+    hopcroft_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    moore = moore_classes(table, live)
+    moore_seconds = time.perf_counter() - start
+
+    assert hopcroft == moore, (hopcroft, moore)
+    print(f"{name:<8} {len(dfa.states):>8} {hopcroft:>8} {hopcroft_seconds:>12.4f} {moore_seconds:>12.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hopcroft's DFA minimization against naive Moore refinement")
+    parser.add_argument('--sizes', default='1000,4000,16000,64000', help="comma-separated random DFA sizes")
+    parser.add_argument('--chain-sizes', default='250,500,1000,2000', help="comma-separated chain DFA sizes")
+    parser.add_argument('--symbols', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    symbols = [chr(ord('a') + i) for i in range(args.symbols)]
+    print(f"{'dfa':<8} {'states':>8} {'minimal':>8} {'hopcroft s':>12} {'moore s':>12}")
+    for size in map(int, args.sizes.split(',')):
+        measure('random', random_dfa(rng, size, symbols))
+    for size in map(int, args.chain_sizes.split(',')):
+        measure('chain', chain_dfa(size, symbols))
+
+
+if __name__ == '__main__':
+    main()
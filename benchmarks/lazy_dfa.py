@@ -0,0 +1,59 @@
+import argparse
+import random
+import time
+
+from Lab2.src.FiniteAutomaton import FiniteAutomaton
+
+
+def nth_from_end(n):
+    # An NFA for (a|b)*a(a|b){n-1}; its DFA has 2^n states, of which the input reaches only a few
+    transitions = [
+        {"state": "p0", "symbol": "a", "to": "p0"},
+        {"state": "p0", "symbol": "b", "to": "p0"},
+        {"state": "p0", "symbol": "a", "to": "p1"},
+    ]
+    for i in range(1, n):
+        transitions += [{"state": f"p{i}", "symbol": symbol, "to": f"p{i + 1}"} for symbol in "ab"]
+    return FiniteAutomaton([f"p{i}" for i in range(n + 1)], ["a", "b"], "p0", {f"p{n}"}, transitions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lazy determinization of a Lab2 NFA under different cache caps")
+    parser.add_argument('--n', type=int, default=20, help="match (a|b)*a(a|b){n-1}")
+    parser.add_argument('--count', type=int, default=2000, help="number of strings")
+    parser.add_argument('--length', type=int, default=100)
+    parser.add_argument('--alphabet', default='ab', help="characters of the strings; 'b' alone stays in few subsets")
+    parser.add_argument('--caps', default='4096,65536,1048576,16777216', help="comma-separated cache caps in bytes")
+    parser.add_argument('--eager', action='store_true', help="also time convert_to_dfa and compile")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fa = nth_from_end(args.n)
+    strings = ["".join(rng.choice(args.alphabet) for _ in range(args.length)) for _ in range(args.count)]
+    expected = None
+
+    if args.eager:
+        start = time.perf_counter()
+        compiled = fa.compile()
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = compiled.match_many(strings).tolist()
+        print(f"eager: {compiled.dead} states built in {build:.3f} s, matched in {time.perf_counter() - start:.3f} s")
+
+    print(f"{'max bytes':>10} {'seconds':>9} {'hit ratio':>10} {'entries':>8} {'evictions':>10} {'fallbacks':>10}")
+    for cap in map(int, args.caps.split(',')):
+        lazy = fa.lazy_dfa(max_bytes=cap)
+        start = time.perf_counter()
+        result = lazy.match_many(strings)
+        elapsed = time.perf_counter() - start
+        stats = lazy.stats
+        print(f"{cap:>10} {elapsed:>9.3f} {stats['hit_ratio']:>10.3f} {stats['entries']:>8} {stats['evictions']:>10} "
+              f"{stats['fallbacks']:>10}")
+        if expected is None:
+            expected = result
+        assert result == expected
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import re
+import tempfile
+import time
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.Token import Token
+from Lab6.src.TokenType import TokenType
+
+
+def legacy_tokenize(lexer, text):
+    # The original per-position implementation, kept as the baseline for the comparison
+    tokens = []
+    position = 0
+
+    while position < len(text):
+        match_found = False
+
+        for token_type, pattern in lexer.token_patterns:
+            regex = re.compile(f'^{pattern}', re.IGNORECASE)
+            match = regex.match(text[position:])
+
+            if match:
+                value = match.group(0)
+
+                if token_type is not None:
+                    tokens.append(Token(token_type, value))
+
+                position += len(value)
+                match_found = True
+                break
+
+        if not match_found:
+            raise ValueError(f"Unrecognized token at position {position}: '{text[position:position + 10]}'")
+
+    tokens.append(Token(TokenType.EOF, ''))
+    return tokens
+
+
+def measure(name, tokenize, text):
+    start = time.perf_counter()
+    tokens = tokenize(text)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} {len(text) / 1024:>10.0f} KB {len(tokens):>10} tokens "
+          f"{elapsed:>9.3f} s {len(tokens) / elapsed:>14,.0f} tokens/s")
+    pairs = [(token.token_type, token.value) for token in tokens]
+    if hasattr(tokens, 'close'):
+        # Mapped tokens hold the file open until closed
+        tokens.close()
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the Lab6 lexer backends against the legacy per-position scanner")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 64, 256],
+                        help="input sizes in KB")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help="do not run the quadratic legacy scanner (useful for multi-MB inputs)")
+    args = parser.parse_args()
+
+    lexer = Lexer()
+    for size in args.sizes:
+        text = RecipeGenerator(args.seed).generate(size * 1024)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.recipe', delete=False) as file:
+            file.write(text)
+
+        expected = measure('master', lexer.tokenize, text)
+        backends = [('mmap', lambda source: lexer.tokenize_file(file.name))]
+        if not args.skip_legacy:
+            backends.append(('legacy', lambda source: legacy_tokenize(lexer, source)))
+
+        for name, tokenize in backends:
+            assert measure(name, tokenize, text) == expected
+
+        os.remove(file.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import time
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeColumns import CONVERSIONS, UNIT_CODES, UNITS, RecipeColumns
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+
+def convert(value, unit_node):
+    base, factor, offset = CONVERSIONS[UNITS[UNIT_CODES[unit_node.value]]]
+    unit_node.value = base
+    return value * factor + offset
+
+
+def scale_nodes(recipes, servings):
+    # Scaling and normalization one node at a time, as it would be written without the columns
+    for recipe in recipes:
+        factor = servings / recipe.yield_node.servings.value if recipe.yield_node else 1.0
+        for ingredient in recipe.ingredients:
+            quantity = ingredient.quantity.value * factor
+            if ingredient.unit is not None:
+                quantity = convert(quantity, ingredient.unit)
+            ingredient.quantity.value = quantity
+        if recipe.yield_node:
+            recipe.yield_node.servings.value = servings
+        if recipe.time_node:
+            recipe.time_node.duration.value = convert(recipe.time_node.duration.value, recipe.time_node.unit)
+        if recipe.temperature:
+            recipe.temperature.value.value = convert(recipe.temperature.value.value, recipe.temperature.unit)
+
+
+def scale_columns(recipes, targets, write_back):
+    columns = RecipeColumns(recipes)
+    columns.normalize()
+    for servings in targets:
+        columns.scale_to(servings)
+        columns.ingredient_table()
+    if write_back:
+        columns.write_back()
+    return columns
+
+
+def timed(function, parse, repeat):
+    # Best of repeat runs, each over freshly parsed recipes since both ways change the nodes
+    best = None
+    for _ in range(repeat):
+        recipes = parse()
+        start = time.perf_counter()
+        function(recipes)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recipe scaling and unit normalization, per node and over columns")
+    parser.add_argument('--size', type=int, default=4096, help="corpus size in KB")
+    parser.add_argument('--servings', default='2,4,6,8,12', help="comma-separated yields to scale to in turn")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = RecipeGenerator(args.seed).generate(args.size * 1024)
+    targets = [float(servings) for servings in args.servings.split(',')]
+
+    def parse():
+        return list(Parser.parse_many(Lexer().iter_tokens(source)))
+
+    recipes = parse()
+    columns = RecipeColumns(recipes)
+    print(f"{len(columns.quantities)} ingredients in {len(recipes)} recipes, scaled to {len(targets)} yields")
+
+    start = time.perf_counter()
+    columns.normalize()
+    for servings in targets:
+        columns.scale_to(servings)
+    print(f"{'array operations only':<28} {time.perf_counter() - start:8.4f} s")
+
+    def per_node(recipes):
+        for servings in targets:
+            scale_nodes(recipes, servings)
+
+    results = [
+        ('per node', per_node),
+        ('columns, exported', lambda recipes: scale_columns(recipes, targets, False)),
+        ('columns, written back', lambda recipes: scale_columns(recipes, targets, True)),
+    ]
+    for name, function in results:
+        print(f"{name:<28} {timed(function, parse, args.repeat):8.4f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from Lab3.src.Lexer import Lexer as Lab3Lexer
+from Lab6.src.Lexer import Lexer
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+
+SIZE_SUFFIXES = {'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+
+
+def parse_size(text):
+    text = text.upper().rstrip('B')
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lex_file(lexer, path):
+    # Stream the corpus through iter_tokens so memory stays bounded for any corpus size
+    count = 0
+    with open(path, encoding='utf-8') as file:
+        for _ in lexer.iter_tokens(file):
+            count += 1
+    return {'tokens': count}
+
+
+def parse_recipes(generator, size):
+    # Lex and parse the corpus one recipe at a time; only the lexer and parser calls are timed, not
+    # the generation of the recipe text
+    lexer = Lexer()
+    tokens = 0
+    recipes = 0
+    lex_seconds = 0.0
+    parse_seconds = 0.0
+
+    for recipe in generator.iter_recipes(size):
+        start = time.perf_counter()
+        recipe_tokens = lexer.tokenize(recipe)
+        lexed = time.perf_counter()
+        Parser(recipe_tokens).parse()
+        parsed = time.perf_counter()
+
+        lex_seconds += lexed - start
+        parse_seconds += parsed - lexed
+        tokens += len(recipe_tokens)
+        recipes += 1
+
+    return {'tokens': tokens, 'recipes': recipes, 'seconds': parse_seconds, 'lex_seconds': lex_seconds}
+
+
+def run(name, size, function, memory):
+    start = time.perf_counter()
+    result = function()
+    result.setdefault('seconds', time.perf_counter() - start)
+    seconds = result['seconds']
+
+    entry = {'benchmark': name, 'size_bytes': size, **result,
+             'tokens_per_sec': result['tokens'] / seconds if seconds else None}
+    if 'recipes' in result:
+        entry['recipes_per_sec'] = result['recipes'] / seconds if seconds else None
+
+    if memory:
+        # A second, traced run: tracemalloc slows allocation down, so it is kept out of the timings
+        tracemalloc.start()
+        function()
+        entry['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f"{name:<12} {size / 2 ** 20:>10.2f} MB {entry['tokens_per_sec']:>14,.0f} tokens/s"
+          + (f" {entry['recipes_per_sec']:>10,.0f} recipes/s" if 'recipes_per_sec' in entry else '')
+          + (f" {entry['peak_memory_bytes'] / 2 ** 20:>8.1f} MB peak" if memory else ''))
+    return entry
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    previous = {(entry['benchmark'], entry['size_bytes']): entry for entry in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} ({baseline.get('commit')}):")
+    for entry in results:
+        old = previous.get((entry['benchmark'], entry['size_bytes']))
+        if old and old.get('tokens_per_sec') and entry.get('tokens_per_sec'):
+            change = entry['tokens_per_sec'] / old['tokens_per_sec'] - 1
+            print(f"{entry['benchmark']:<12} {entry['size_bytes'] / 2 ** 20:>10.2f} MB {change:>+8.1%} tokens/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lexer and parser benchmarks over a synthetic recipe corpus")
+    parser.add_argument('--sizes', nargs='+', default=['1K', '1M', '16M'],
+                        help="corpus sizes, e.g. 1K 10M 1G")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ingredients', type=int, nargs=2, default=(3, 12), metavar=('MIN', 'MAX'))
+    parser.add_argument('--steps', type=int, nargs=2, default=(2, 10), metavar=('MIN', 'MAX'))
+    parser.add_argument('--string-words', type=int, nargs=2, default=(1, 8), metavar=('MIN', 'MAX'))
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak memory runs")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in map(parse_size, args.sizes):
+            path = os.path.join(directory, f'corpus-{size}.recipe')
+            make_generator = lambda: RecipeGenerator(args.seed, tuple(args.ingredients), tuple(args.steps),
+                                                     tuple(args.string_words))
+            make_generator().write(path, size)
+
+            memory = not args.no_memory
+            results.append(run('lab3_lexer', size, lambda: lex_file(Lab3Lexer(), path), memory))
+            results.append(run('lab6_lexer', size, lambda: lex_file(Lexer(), path), memory))
+            results.append(run('lab6_parser', size, lambda: parse_recipes(make_generator(), size), memory))
+            os.remove(path)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': args.seed,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
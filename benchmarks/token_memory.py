@@ -0,0 +1,53 @@
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from Lab6.src.Lexer import Lexer
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.TokenStream import TokenStream
+
+
+class DictToken:
+    # The previous Token layout: a plain class with a per-instance __dict__
+    def __init__(self, token_type, value):
+        self.token_type = token_type
+        self.value = value
+
+
+def measure(name, build, count):
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<14} {current / 2 ** 20:>9.1f} MB retained {peak / 2 ** 20:>9.1f} MB peak "
+          f"{current / count:>8.1f} B/token")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory footprint of the Lab6 token representations")
+    parser.add_argument('--size', type=int, default=4096, help="input size in KB")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    lexer = Lexer()
+    text = RecipeGenerator(args.seed).generate(args.size * 1024)
+    count = sum(1 for _ in lexer.iter_tokens(text))
+    print(f"{count} tokens from {len(text) / 1024:.0f} KB")
+
+    # Every layout is built straight from the lexer, so the retained substrings are counted as well
+    measure('dict Token', lambda: [DictToken(token.token_type, token.value)
+                                   for token in lexer.iter_tokens(text)], count)
+    measure('slots Token', lambda: list(lexer.iter_tokens(text)), count)
+    measure('TokenStream', lambda: TokenStream.from_tokens(lexer.iter_tokens(text)), count)
+
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False) as file:
+        file.write(text)
+    mapped = measure('mmap columns', lambda: lexer.tokenize_file(file.name), count)
+    mapped.close()
+    os.remove(file.name)
+
+
+if __name__ == '__main__':
+    main()
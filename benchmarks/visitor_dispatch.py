@@ -0,0 +1,172 @@
+import argparse
+import time
+
+from Lab6.src.ASTVisitor import ASTVisitor, iter_child_nodes
+from Lab6.src.IdentifierNode import IdentifierNode
+from Lab6.src.IngredientNode import IngredientNode
+from Lab6.src.Lexer import Lexer
+from Lab6.src.NumberNode import NumberNode
+from Lab6.src.Parser import Parser
+from Lab6.src.RecipeGenerator import RecipeGenerator
+from Lab6.src.RecipeNode import RecipeNode
+from Lab6.src.StepNode import StepNode
+from Lab6.src.StringNode import StringNode
+from Lab6.src.TemperatureNode import TemperatureNode
+from Lab6.src.TimeNode import TimeNode
+from Lab6.src.TitleNode import TitleNode
+from Lab6.src.UnitNode import UnitNode
+from Lab6.src.YieldNode import YieldNode
+
+
+def isinstance_chain(node):
+    # The dispatch ASTVisualizer used before: one isinstance test after another, in its order
+    if isinstance(node, RecipeNode):
+        return 0
+    elif isinstance(node, TitleNode):
+        return 1
+    elif isinstance(node, YieldNode):
+        return 2
+    elif isinstance(node, TimeNode):
+        return 3
+    elif isinstance(node, IngredientNode):
+        return 4
+    elif isinstance(node, StepNode):
+        return 5
+    elif isinstance(node, TemperatureNode):
+        return 6
+    elif isinstance(node, NumberNode):
+        return 7
+    elif isinstance(node, StringNode):
+        return 8
+    elif isinstance(node, UnitNode):
+        return 9
+    elif isinstance(node, IdentifierNode):
+        return 10
+    return None
+
+
+class Kinds(ASTVisitor):
+    # Same result as isinstance_chain through cached visit_ methods
+
+    def visit_RecipeNode(self, node):
+        return 0
+
+    def visit_TitleNode(self, node):
+        return 1
+
+    def visit_YieldNode(self, node):
+        return 2
+
+    def visit_TimeNode(self, node):
+        return 3
+
+    def visit_IngredientNode(self, node):
+        return 4
+
+    def visit_StepNode(self, node):
+        return 5
+
+    def visit_TemperatureNode(self, node):
+        return 6
+
+    def visit_NumberNode(self, node):
+        return 7
+
+    def visit_StringNode(self, node):
+        return 8
+
+    def visit_UnitNode(self, node):
+        return 9
+
+    def visit_IdentifierNode(self, node):
+        return 10
+
+    def generic_visit(self, node):
+        return None
+
+
+class UncachedKinds(Kinds):
+    # The lookup of ast.NodeVisitor: the method name is built and looked up for every node
+    def visit(self, node):
+        return getattr(self, 'visit_' + node.__class__.__name__, self.generic_visit)(node)
+
+
+class Counter(ASTVisitor):
+    # Counts nodes with the recursive traversal
+    def __init__(self):
+        self.count = 0
+
+    def generic_visit(self, node):
+        self.count += 1
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+
+class WalkCounter(ASTVisitor):
+    # Counts nodes with the explicit stack traversal
+    def __init__(self):
+        self.count = 0
+
+    def visit_ASTNode(self, node):
+        self.count += 1
+        return iter_child_nodes(node)
+
+
+def measure(name, function, count, repeat):
+    best = min(timed(function) for _ in range(repeat))
+    print(f"{name:<28} {best * 1e9 / count:>8.1f} ns/node")
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-node dispatch cost of the Lab6 AST visitors")
+    parser.add_argument('--size', type=int, default=1024, help="corpus size in KB")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    recipes = list(Parser.parse_many(Lexer().iter_tokens(RecipeGenerator(args.seed).generate(args.size * 1024))))
+    nodes = []
+    for recipe in recipes:
+        stack = [recipe]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(iter_child_nodes(node))
+    print(f"{len(nodes)} nodes in {len(recipes)} recipes")
+
+    kinds = Kinds()
+    uncached = UncachedKinds()
+    assert [kinds.visit(node) for node in nodes] == [isinstance_chain(node) for node in nodes]
+
+    # Dispatch alone, over a flat list of every node
+    measure('isinstance chain', lambda: [isinstance_chain(node) for node in nodes], len(nodes), args.repeat)
+    measure('getattr per node', lambda: [uncached.visit(node) for node in nodes], len(nodes), args.repeat)
+    measure('cached visit', lambda: [kinds.visit(node) for node in nodes], len(nodes), args.repeat)
+    # What the tree writer and the DOT exporter do inside their own loops
+    handlers = Kinds._handlers
+    measure('cached handler table', lambda: [handlers[node.__class__](kinds, node) for node in nodes], len(nodes),
+            args.repeat)
+
+    # Whole traversals
+    def recursive():
+        counter = Counter()
+        for recipe in recipes:
+            counter.visit(recipe)
+
+    def walk():
+        counter = WalkCounter()
+        for recipe in recipes:
+            counter.walk(recipe)
+
+    measure('recursive visit traversal', recursive, len(nodes), args.repeat)
+    measure('walk traversal', walk, len(nodes), args.repeat)
+
+
+if __name__ == '__main__':
+    main()